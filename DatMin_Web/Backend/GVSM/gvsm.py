@@ -1,24 +1,221 @@
+import copy
+import json
+import os
+import shutil
+import uuid
+
 import numpy as np
 import scipy.sparse as sp
-from scipy.sparse import csr_matrix, diags
+from scipy.sparse import csc_matrix, csr_matrix, diags
+
+# Skor di bawah ambang ini dianggap tidak relevan
+MIN_SCORE = 0.0001
+
+# Mode scoring GVSMModel:
+# - "materialized": S (V x V) dan transformed_docs (N x V) disimpan (cepat, boros memori);
+#                    transformed_docs dibuang (None) setelah update incremental
+# - "factored"    : hanya B (biner N x V) + skala diagonal D^-1, S.q dihitung saat query
+SCORING_MODES = ("materialized", "factored")
+
+# Batas entri matriks sementara (dokumen x dokumen) saat menghitung norma
+# dokumen pada mode "factored"
+NORM_CHUNK_ENTRIES = 4_000_000
+
+# Layout index di disk (GVSMModel.save / load). Naikkan jika layout berubah.
+INDEX_FORMAT = "gvsm-index"
+INDEX_FORMAT_VERSION = 1
+
+
+def rank_top_k(scores, top_n=5, min_score=MIN_SCORE):
+    """
+    Pilih top-k skor sepenuhnya dengan operasi NumPy.
+
+    Skor di-clip ke maksimal 1.0, skor <= min_score dibuang, lalu k skor
+    terbesar dipilih dengan partial selection (np.partition) dan hanya k
+    skor itu yang diurutkan. Urutan hasil sama persis dengan sort stabil
+    berdasarkan skor menurun: skor sama diurutkan dari posisi terkecil.
+
+    Args:
+        scores (numpy.ndarray): Skor per posisi
+        top_n (int): Jumlah hasil; None / 0 = semua skor yang lolos ambang
+        min_score (float): Ambang skor minimum (eksklusif)
+
+    Returns:
+        tuple: (posisi terurut, skor terurut) sebagai numpy array
+    """
+    scores = np.minimum(np.asarray(scores, dtype=np.float64), 1.0)
+    positions = np.flatnonzero(scores > min_score)
+    values = scores[positions]
+
+    if top_n and len(positions) > top_n:
+        # Nilai ke-k terbesar; semua yang lebih besar pasti masuk,
+        # sisa slot diisi skor seri dengan posisi terkecil
+        kth = np.partition(values, len(values) - top_n)[len(values) - top_n]
+        above = np.flatnonzero(values > kth)
+        ties = np.flatnonzero(values == kth)[:top_n - len(above)]
+        selected = np.concatenate([above, ties])
+        positions = positions[selected]
+        values = values[selected]
+
+    # Urut skor menurun, lalu posisi menaik
+    order = np.lexsort((positions, -values))
+    return positions[order], values[order]
+
+
+# =============================
+# HELPER BERSAMA (juga dipakai lsi_model.py)
+# =============================
+def corpus_tf_matrix(corpus):
+    """
+    Vocab + matriks TF langsung dari array id TokenCorpus.
+
+    Term id mengikuti urutan kemunculan pertama (sama dengan jalur list
+    token GVSMModel), dan hanya term yang benar-benar dipakai dokumen.
+
+    Args:
+        corpus (TokenCorpus): Token dokumen dalam bentuk array id
+
+    Returns:
+        tuple: (vocab dict, matriks TF CSR N x V)
+    """
+    ids = corpus.ids
+    used, first_pos = np.unique(ids, return_index=True)
+    order = used[np.argsort(first_pos, kind='stable')]
+
+    remap = np.full(len(corpus.vocabulary), -1, dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    terms = corpus.vocabulary.terms
+    vocab = {terms[t]: i for i, t in enumerate(order.tolist())}
+
+    rows = np.repeat(np.arange(len(corpus), dtype=np.int64), np.diff(corpus.offsets))
+    tf = csr_matrix(
+        (np.ones(len(ids)), (rows, remap[ids])), shape=(len(corpus), len(order))
+    )
+    tf.sum_duplicates()
+    return vocab, tf
+
+
+def write_index_dir(path, vocab, manifest, write_arrays):
+    """
+    Tulis direktori index secara atomik: semua file ditulis ke direktori
+    sementara lalu di-rename, sehingga pembaca tidak pernah melihat index
+    setengah jadi. Proses yang masih me-mmap file index lama tetap aman.
+
+    Args:
+        path (str): Direktori tujuan (ditimpa jika sudah ada)
+        vocab (dict): term -> term id (0..V-1), ditulis ke vocab.txt
+        manifest (dict): Isi manifest.json
+        write_arrays (callable): write_arrays(tmp_path) menulis file .npy
+    """
+    id_to_term = [None] * len(vocab)
+    for term, tid in vocab.items():
+        if "\n" in term:
+            raise ValueError("Terms must not contain newlines")
+        id_to_term[tid] = term
+
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    os.makedirs(tmp_path)
+
+    try:
+        write_arrays(tmp_path)
+
+        with open(os.path.join(tmp_path, "vocab.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(id_to_term))
+        with open(os.path.join(tmp_path, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        old_path = None
+        if os.path.exists(path):
+            old_path = f"{path}.old-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+            os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        if old_path:
+            shutil.rmtree(old_path, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+
+def read_index_manifest(path, index_format, format_version, name):
+    """
+    Baca dan validasi manifest.json direktori index
+
+    Args:
+        path (str): Direktori index
+        index_format (str): Nilai "format" yang diharapkan
+        format_version (int): Nilai "format_version" yang diharapkan
+        name (str): Nama index untuk pesan error (mis. "GVSM")
+
+    Raises:
+        OSError: Index tidak ada
+        ValueError: Manifest rusak, format lain, atau versi format tidak didukung
+    """
+    with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as f:
+        try:
+            manifest = json.load(f)
+        except json.JSONDecodeError:
+            raise ValueError("Corrupt index manifest")
+
+    if manifest.get("format") != index_format:
+        raise ValueError(f"Not a {name} index")
+    if manifest.get("format_version") != format_version:
+        raise ValueError(
+            f"Unsupported index format version {manifest.get('format_version')}, "
+            f"expected {format_version}"
+        )
+    return manifest
+
+
+def read_index_vocab(path, V):
+    """
+    Vocab dari vocab.txt direktori index
+
+    Returns:
+        dict: term -> term id
+
+    Raises:
+        ValueError: Jumlah term tidak sama dengan V
+    """
+    with open(os.path.join(path, "vocab.txt"), "r", encoding="utf-8") as f:
+        terms = f.read().split("\n") if V else []
+    if len(terms) != V:
+        raise ValueError("Corrupt index vocabulary")
+    return dict(zip(terms, range(V)))
+
 
 class GVSMModel:
-    def __init__(self, documents):
+    def __init__(self, documents, scoring="materialized"):
         """
         Versi Optimized menggunakan Sparse Matrix untuk kecepatan tinggi.
+
+        Args:
+            documents (list): List token list dokumen, atau TokenCorpus
+                (token ter-encode int32, dibangun tanpa membuat string per token)
+            scoring (str): "materialized" (default) menyimpan S dan transformed_docs;
+                "factored" hanya menyimpan faktor S = D^-1 B^T B D^-1 dan
+                menghitung S.q serta norma dokumen lewat perkalian sparse berantai
         """
         # 1. Validation
-        if not isinstance(documents, list) or len(documents) == 0:
+        is_corpus = self._is_token_corpus(documents)
+        if not (is_corpus or isinstance(documents, list)) or len(documents) == 0:
             raise ValueError("Documents must be a non-empty list of token lists")
-        
+        if scoring not in SCORING_MODES:
+            raise ValueError(f"scoring must be one of {SCORING_MODES}")
+
         self.documents = documents
+        self.scoring = scoring
 
         # 2. Build Vocabulary
-        self.vocab = {}
-        for doc in documents:
-            for term in doc:
-                if term not in self.vocab:
-                    self.vocab[term] = len(self.vocab)
+        if is_corpus:
+            self.vocab, corpus_tf = corpus_tf_matrix(documents)
+        else:
+            self.vocab = {}
+            for doc in documents:
+                for term in doc:
+                    if term not in self.vocab:
+                        self.vocab[term] = len(self.vocab)
         
         self.V = len(self.vocab)
         self.doc_count = len(documents)
@@ -26,30 +223,29 @@ class GVSMModel:
         # -----------------------------
         # 3. Build Document TF Matrix (Sparse)
         # -----------------------------
-        # Kita gunakan lil_matrix untuk construct, lalu convert ke csr_matrix untuk math cepat
         print(f"Building TF Matrix for {self.doc_count} docs and {self.V} terms...")
         
-        # Cara cepat buat sparse matrix: kumpulkan row, col, data
-        rows, cols, data = [], [], []
-        for doc_idx, doc in enumerate(documents):
-            # Hitung frekuensi lokal dulu agar hemat loop
-            term_counts = {}
-            for term in doc:
-                if term in self.vocab:
-                    tid = self.vocab[term]
-                    term_counts[tid] = term_counts.get(tid, 0) + 1
-            
-            for tid, count in term_counts.items():
-                rows.append(doc_idx)
-                cols.append(tid)
-                data.append(float(count))
-
         # Matriks TF (N x V) dalam format Sparse CSR
-        self.doc_vectors = csr_matrix((data, (rows, cols)), shape=(self.doc_count, self.V))
+        self.doc_vectors = corpus_tf if is_corpus else self._build_tf_matrix(documents)
+
+        # Penanda dokumen aktif (False = sudah dihapus / tombstone)
+        self.alive = np.ones(self.doc_count, dtype=bool)
 
         # -----------------------------
         # 4. Term-Term Similarity Matrix (Sparse / Optimized)
         # -----------------------------
+        if self.scoring == "factored":
+            # S tidak pernah dibentuk: cukup df untuk skala diagonal D^-1
+            print("Building Factored Similarity (B, D^-1)...")
+            self.df = np.asarray(self._binary(self.doc_vectors).sum(axis=0)).ravel()
+            self.S = None
+            self.transformed_docs = None
+            self._postings = None
+            self.doc_norms = self._factored_doc_norms(self.doc_vectors)
+            self._postings = self.postings
+            print("Initialization Complete.")
+            return
+
         print("Building Similarity Matrix...")
         self.S = self._build_similarity_matrix_optimized()
 
@@ -90,8 +286,106 @@ class GVSMModel:
         
         self.doc_norms = np.sqrt(np.maximum(doc_dot_transformed, 0.0))
 
+        # -----------------------------
+        # 7. Inverted Index (term -> dokumen)
+        # -----------------------------
+        # CSC dari doc_vectors: kolom term t berisi daftar dokumen yang memuat t
+        self._postings = None
+        self._postings = self.postings
+
         print("Initialization Complete.")
 
+    @property
+    def postings(self):
+        """
+        Inverted index dalam bentuk CSC (N x V): postings.indices[indptr[t]:indptr[t+1]]
+        adalah doc_id yang memuat term t. Diperbarui per entri oleh update
+        incremental, dibangun ulang dari doc_vectors setelah compact().
+        """
+        if self._postings is None:
+            self._postings = self.doc_vectors.tocsc()
+        return self._postings
+
+    # =============================
+    # S DALAM BENTUK FAKTOR
+    # =============================
+    # S = D^-1 B^T B D^-1, dengan B biner (N x V) dan D = diag(sqrt(df)).
+    # Struktur B dan B^T dipinjam dari doc_vectors / postings (hanya data
+    # 1.0 yang baru), jadi tidak ada matriks V x V maupun N x V tambahan.
+    def _bin_factors(self):
+        """(B sebagai CSR N x V, B^T sebagai CSR V x N, diagonal D^-1)"""
+        tf = self.doc_vectors
+        post = self.postings
+        ones = np.ones(tf.nnz)
+        B = csr_matrix((ones, tf.indices, tf.indptr), shape=tf.shape)
+        # Array CSC (N x V) dibaca sebagai CSR (V x N) = transpose tanpa salin
+        B_T = csr_matrix((ones, post.indices, post.indptr), shape=(self.V, self.doc_count))
+        return B, B_T, diags(self._inv_sqrt(self.df))
+
+    def similarity_rows(self, X):
+        """
+        X @ S untuk sparse matrix X (k x V), pada mode scoring apapun.
+
+        Mode "factored": ((X D^-1) B^T) B D^-1, urutan perkalian dipilih agar
+        hasil antara hanya berukuran k x N dan k x V.
+        """
+        if self.scoring == "materialized":
+            return X @ self.S
+        B, B_T, D_inv = self._bin_factors()
+        return csr_matrix((((X @ D_inv) @ B_T) @ B) @ D_inv)
+
+    def _factored_doc_norms(self, rows):
+        """
+        sqrt(d S d^T) untuk setiap baris TF pada rows, tanpa membentuk S.
+
+        d S d^T = ||B D^-1 d^T||^2, dihitung per blok dokumen agar matriks
+        sementara (blok x N) tidak melebihi NORM_CHUNK_ENTRIES entri.
+        """
+        _, B_T, D_inv = self._bin_factors()
+        chunk = max(1, NORM_CHUNK_ENTRIES // max(self.doc_count, 1))
+        norms = np.zeros(rows.shape[0])
+        for start in range(0, rows.shape[0], chunk):
+            projected = (rows[start:start + chunk] @ D_inv) @ B_T
+            norms[start:start + chunk] = np.asarray(projected.multiply(projected).sum(axis=1)).ravel()
+        return np.sqrt(np.maximum(norms, 0.0))
+
+    def _cooccurring_terms(self, term_ids):
+        """
+        Term yang muncul bersama minimal satu term di term_ids, yaitu kolom
+        non-zero baris S[term_ids], dihitung lewat postings tanpa S.
+        """
+        docs = np.unique(self.postings[:, term_ids].indices)
+        return self.doc_vectors[docs].indices
+
+    def candidate_documents(self, query_tokens):
+        """
+        Dokumen yang mungkin mendapat skor > 0 untuk query ini.
+
+        Numerator GVSM = sum_t d_t * (S q)_t, dan semua entri bernilai >= 0,
+        sehingga skor dokumen > 0 jika dan hanya jika dokumen memuat minimal
+        satu term t dengan (S q)_t != 0, yaitu term yang terhubung ke term
+        query lewat entri non-zero S. Himpunan ini eksak: ranking tetap sama.
+
+        Args:
+            query_tokens (list): Token query hasil preprocessing
+
+        Returns:
+            numpy.ndarray: doc_id kandidat, terurut naik
+        """
+        query_ids = sorted({self.vocab[t] for t in query_tokens if t in self.vocab})
+        if not query_ids:
+            return np.array([], dtype=np.int64)
+
+        # Ekspansi term query lewat baris S (S simetris)
+        if self.scoring == "materialized":
+            expanded_terms = np.unique(self.S[query_ids].indices)
+        else:
+            expanded_terms = np.unique(self._cooccurring_terms(query_ids))
+        if len(expanded_terms) == 0:
+            return np.array([], dtype=np.int64)
+
+        return np.unique(self.postings[:, expanded_terms].indices).astype(np.int64)
+
     def _build_similarity_matrix_optimized(self):
         """
         Versi Super Cepat menggunakan Aljabar Linear Sparse
@@ -106,6 +400,9 @@ class GVSMModel:
         # Hasilnya C adalah matriks (V x V) yang mungkin agak dense tapi tetap sparse
         C = bin_matrix.T @ bin_matrix
 
+        # Diagonal C = document frequency tiap term, disimpan untuk update incremental
+        self.df = np.asarray(bin_matrix.sum(axis=0)).ravel()
+
         # 3. Normalization (Cosine Similarity)
         # S_ij = C_ij / (sqrt(C_ii) * sqrt(C_jj))
         # Kita gunakan teknik Matriks Diagonal untuk menghindar loop dan outer product raksasa
@@ -115,9 +412,7 @@ class GVSMModel:
         
         # Hitung faktor pengali invers: 1 / sqrt(C_ii)
         # Hati-hati pembagian nol
-        with np.errstate(divide='ignore'):
-            inv_sqrt_diag = 1.0 / np.sqrt(diag_val)
-        inv_sqrt_diag[np.isinf(inv_sqrt_diag)] = 0.0
+        inv_sqrt_diag = self._inv_sqrt(diag_val)
         
         # Buat matriks diagonal sparse dari faktor tersebut
         # D_inv = diag(1/sqrt(C_ii))
@@ -136,6 +431,497 @@ class GVSMModel:
         
         return S # Ini sekarang Sparse CSR Matrix
 
+    def _build_tf_matrix(self, documents):
+        """
+        Matriks TF (len(documents) x V) berdasarkan vocab saat ini
+        """
+        # Cara cepat buat sparse matrix: kumpulkan row, col, data
+        rows, cols, data = [], [], []
+        for doc_idx, doc in enumerate(documents):
+            # Hitung frekuensi lokal dulu agar hemat loop
+            term_counts = {}
+            for term in doc:
+                if term in self.vocab:
+                    tid = self.vocab[term]
+                    term_counts[tid] = term_counts.get(tid, 0) + 1
+
+            for tid, count in term_counts.items():
+                rows.append(doc_idx)
+                cols.append(tid)
+                data.append(float(count))
+
+        return csr_matrix((data, (rows, cols)), shape=(len(documents), self.V))
+
+    @staticmethod
+    def _is_token_corpus(documents):
+        # Duck typing TokenCorpus (token_corpus.py) agar modul ini tetap
+        # bisa dijalankan sendiri dari folder GVSM
+        return hasattr(documents, "vocabulary") and hasattr(documents, "offsets")
+
+    @staticmethod
+    def _inv_sqrt(values):
+        """1 / sqrt(x) per elemen, dengan 0 untuk x == 0"""
+        with np.errstate(divide='ignore'):
+            inv = 1.0 / np.sqrt(np.asarray(values, dtype=np.float64))
+        inv[np.isinf(inv)] = 0.0
+        return inv
+
+    @staticmethod
+    def _binary(matrix):
+        """Salin struktur sparse matrix dengan semua data = 1.0"""
+        bin_matrix = matrix.copy()
+        bin_matrix.data[:] = 1.0
+        return bin_matrix
+
+    @staticmethod
+    def _entry_rows(matrix):
+        """Nomor baris setiap entri non-zero matriks CSR"""
+        return np.repeat(np.arange(matrix.shape[0], dtype=np.int64), np.diff(matrix.indptr))
+
+    @classmethod
+    def _splice(cls, matrix, shape, drop_rows=None, drop_cols=None, rows=None, cols=None, data=None):
+        """
+        CSR baru berukuran `shape`: entri matrix kecuali baris / kolom yang
+        di-drop, ditambah entri baru (rows, cols, data).
+
+        Entri baru disisipkan di posisinya (searchsorted pada kunci
+        baris * kolom + kolom) tanpa mengurutkan ulang seluruh matriks, dan
+        indptr dihitung dengan bincount. Biaya O(nnz), tanpa perkalian
+        matriks. Array matrix tidak diubah.
+
+        Args:
+            matrix: CSR tanpa entri duplikat, shape <= `shape`
+            shape (tuple): Ukuran hasil
+            drop_rows / drop_cols (numpy.ndarray): Mask bool baris / kolom yang
+                entrinya dibuang (ukuran sesuai `shape`)
+            rows, cols, data: Entri baru; tidak boleh menimpa entri yang tersisa
+        """
+        if not matrix.has_sorted_indices:
+            matrix = matrix.sorted_indices()
+        entry_rows = cls._entry_rows(matrix)
+        indices, values = matrix.indices, matrix.data
+        if drop_rows is not None or drop_cols is not None:
+            drop = np.zeros(len(indices), dtype=bool)
+            if drop_rows is not None:
+                drop |= drop_rows[entry_rows]
+            if drop_cols is not None:
+                drop |= drop_cols[indices]
+            keep = ~drop
+            entry_rows, indices, values = entry_rows[keep], indices[keep], values[keep]
+
+        if rows is not None and len(rows):
+            rows = np.asarray(rows, dtype=np.int64)
+            cols = np.asarray(cols, dtype=np.int64)
+            new_keys = rows * shape[1] + cols
+            order = np.argsort(new_keys, kind='stable')
+            positions = np.searchsorted(entry_rows * shape[1] + indices, new_keys[order])
+            entry_rows = np.insert(entry_rows, positions, rows[order])
+            indices = np.insert(indices, positions, cols[order].astype(indices.dtype))
+            values = np.insert(values, positions, np.asarray(data, dtype=values.dtype)[order])
+
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(entry_rows, minlength=shape[0]), out=indptr[1:])
+        return csr_matrix((values, indices, indptr), shape=shape)
+
+    @staticmethod
+    def _resize(matrix, shape):
+        """
+        Perbesar CSR (atau CSC, dimensi pertama = kolom) dengan baris/kolom
+        nol tanpa menyalin data: hanya indptr yang diperpanjang
+        """
+        major = 0 if matrix.format == "csr" else 1
+        indptr = matrix.indptr
+        extra = shape[major] - matrix.shape[major]
+        if extra > 0:
+            indptr = np.concatenate([indptr, np.full(extra, indptr[-1], dtype=indptr.dtype)])
+        return type(matrix)((matrix.data, matrix.indices, indptr), shape=shape)
+
+    def _postings_by_term(self):
+        """Array postings (CSC N x V) dibaca sebagai CSR V x N, tanpa salin"""
+        post = self.postings
+        return csr_matrix((post.data, post.indices, post.indptr), shape=(self.V, self.doc_count))
+
+    def _set_postings_by_term(self, by_term):
+        self._postings = csc_matrix(
+            (by_term.data, by_term.indices, by_term.indptr), shape=(self.doc_count, self.V)
+        )
+
+    def _similarity_rows_of(self, terms):
+        """
+        Baris S untuk term id `terms` (terurut) dari postings dan df saat ini:
+        S[A] = D_A^-1 B[:, A]^T B D^-1, tanpa membentuk S penuh (semua mode).
+
+        Returns:
+            scipy.sparse.csr_matrix: |terms| x V
+        """
+        cols = self.postings[:, terms]
+        B_A_T = csr_matrix(
+            (np.ones(cols.nnz), cols.indices, cols.indptr), shape=(len(terms), self.doc_count)
+        )
+        tf = self.doc_vectors
+        B = csr_matrix((np.ones(tf.nnz), tf.indices, tf.indptr), shape=tf.shape)
+        rows = csr_matrix(B_A_T @ B)
+
+        # Urutan perkalian sama dengan D_inv @ C @ D_inv saat build
+        inv_sqrt_df = self._inv_sqrt(self.df)
+        rows.data = (inv_sqrt_df[terms][self._entry_rows(rows)] * rows.data) * inv_sqrt_df[rows.indices]
+        rows.eliminate_zeros()
+        return rows
+
+    def _similarity_rows_before_update(self, terms):
+        # Baris S lama untuk term yang akan berubah (term baru: baris kosong)
+        if self.scoring == "materialized":
+            return self.S[terms]
+        return self._similarity_rows_of(terms)
+
+    # =============================
+    # UPDATE INCREMENTAL
+    # =============================
+    # Menambah / menghapus dokumen hanya mengubah df term A (term dokumen
+    # itu), sehingga S hanya berubah pada baris dan kolom A. Baris S[A]
+    # dihitung ulang dari postings lalu disisipkan (beserta cerminannya
+    # sebagai kolom) ke S lama; postings diperbarui per entri. Norma
+    # dokumen hanya berubah untuk dokumen yang memuat term A, dan dihitung
+    # dengan delta d (S_baru - S_lama) d^T.
+    #
+    # transformed_docs (d S) justru berubah hampir seluruhnya karena term
+    # A yang umum muncul di hampir semua dokumen, sehingga tidak diperbarui
+    # melainkan dibuang (None): numerator dihitung doc_vectors @ S q,
+    # hasilnya sama (dan S q memang sudah dihitung untuk penyebut query).
+    def copy(self):
+        """
+        Salinan model yang bisa di-update tanpa mengubah model ini.
+
+        Array tidak disalin: add/remove/compact selalu mengganti array
+        dengan array baru, hanya vocab (dict) yang diubah di tempat.
+        """
+        model = copy.copy(self)
+        model.vocab = dict(self.vocab)
+        return model
+
+    def add_documents(self, documents):
+        """
+        Tambah dokumen baru tanpa membangun ulang seluruh model.
+
+        Vocabulary hanya bertambah (term id lama tidak berubah). Baris/kolom S
+        milik term dokumen baru dihitung ulang dan disisipkan, postings
+        ditambah entri dokumen baru, dan hanya norma dokumen yang menyentuh
+        term tersebut yang diperbarui.
+
+        Args:
+            documents (list): List token list dokumen baru
+
+        Returns:
+            list: doc_id untuk setiap dokumen baru
+        """
+        if not isinstance(documents, list) or len(documents) == 0:
+            raise ValueError("Documents must be a non-empty list of token lists")
+
+        # 1. Perluas vocabulary dengan id stabil; matriks hanya diperbesar
+        for doc in documents:
+            for term in doc:
+                if term not in self.vocab:
+                    self.vocab[term] = len(self.vocab)
+
+        old_V = self.V
+        by_term = self._postings_by_term()
+        self.V = len(self.vocab)
+        if self.V != old_V:
+            self.doc_vectors = self._resize(self.doc_vectors, (self.doc_count, self.V))
+            by_term = self._resize(by_term, (self.V, self.doc_count))
+            self._set_postings_by_term(by_term)
+            if self.scoring == "materialized":
+                self.S = self._resize(self.S, (self.V, self.V))
+            self.df = np.concatenate([self.df, np.zeros(self.V - old_V, dtype=self.df.dtype)])
+
+        new_rows = self._build_tf_matrix(documents)
+        affected_terms = np.unique(new_rows.indices).astype(np.int64)
+        old_similarity = self._similarity_rows_before_update(affected_terms)
+
+        # 2. Tambah baris TF dan entri postings dokumen baru (doc_id terbesar,
+        # jadi entri baru masuk di akhir daftar postings tiap term)
+        start = self.doc_count
+        new_ids = np.arange(start, start + len(documents))
+        self.doc_vectors = sp.vstack([self.doc_vectors, new_rows], format='csr')
+        self.doc_count = self.doc_vectors.shape[0]
+
+        new_entries = new_rows.tocoo()
+        by_term = self._splice(
+            self._resize(by_term, (self.V, start)), (self.V, self.doc_count),
+            rows=new_entries.col, cols=new_entries.row + start, data=new_entries.data,
+        )
+        self._set_postings_by_term(by_term)
+
+        self.doc_norms = np.concatenate([self.doc_norms, np.zeros(len(documents))])
+        self.alive = np.concatenate([self.alive, np.ones(len(documents), dtype=bool)])
+        if self._is_token_corpus(self.documents):
+            self.documents = self.documents.concat(documents)
+        else:
+            self.documents = self.documents + list(documents)
+
+        # 3. df bertambah sesuai term unik dokumen baru
+        self.df = self.df + np.asarray(self._binary(new_rows).sum(axis=0)).ravel()
+
+        self._refresh(affected_terms, new_ids, old_similarity)
+        return new_ids.tolist()
+
+    def remove_documents(self, doc_ids):
+        """
+        Hapus dokumen dengan tombstone.
+
+        Baris dokumen dikosongkan dan tidak akan muncul lagi pada hasil match,
+        tetapi doc_id dokumen lain tetap sama. Panggil compact() secara berkala
+        untuk benar-benar membuang baris tombstone.
+
+        Args:
+            doc_ids (list): doc_id yang akan dihapus
+        """
+        ids = np.unique(np.asarray(list(doc_ids), dtype=np.int64))
+        if len(ids) == 0:
+            return
+        if ids[0] < 0 or ids[-1] >= self.doc_count:
+            raise ValueError("doc_id out of range")
+        if not self.alive[ids].all():
+            raise ValueError("Some documents have already been removed")
+
+        removed_rows = self.doc_vectors[ids]
+        affected_terms = np.unique(removed_rows.indices).astype(np.int64)
+        old_similarity = self._similarity_rows_before_update(affected_terms)
+
+        # df berkurang sesuai term unik dokumen yang dihapus
+        self.df = self.df - np.asarray(self._binary(removed_rows).sum(axis=0)).ravel()
+
+        removed = np.zeros(self.doc_count, dtype=bool)
+        removed[ids] = True
+        by_term = self._postings_by_term()
+        self.doc_vectors = self._splice(self.doc_vectors, self.doc_vectors.shape, drop_rows=removed)
+        self._set_postings_by_term(self._splice(by_term, by_term.shape, drop_cols=removed))
+
+        self.alive = self.alive.copy()
+        self.alive[ids] = False
+        if self._is_token_corpus(self.documents):
+            self.documents = self.documents.clear(ids)
+        else:
+            self.documents = list(self.documents)
+            for i in ids:
+                self.documents[i] = []
+
+        self._refresh(affected_terms, ids, old_similarity)
+
+    def _refresh(self, affected_terms, changed_docs, old_similarity):
+        """
+        Perbarui S (mode "materialized") dan doc_norms setelah df / postings
+        untuk affected_terms berubah.
+
+        Args:
+            affected_terms (numpy.ndarray): Term id A yang df-nya berubah (terurut)
+            changed_docs (numpy.ndarray): Dokumen yang ditambah / dihapus
+            old_similarity: Baris S[A] sebelum update (|A| x V)
+        """
+        new_similarity = self._similarity_rows_of(affected_terms)
+
+        if self.scoring == "materialized":
+            # Baris A diganti baris baru, kolom A diganti cerminannya (S simetris)
+            in_affected = np.zeros(self.V, dtype=bool)
+            in_affected[affected_terms] = True
+            rows = affected_terms[self._entry_rows(new_similarity)]
+            cols = new_similarity.indices.astype(np.int64)
+            mirrored = ~in_affected[cols]
+            self.S = self._splice(
+                self.S, (self.V, self.V), drop_rows=in_affected, drop_cols=in_affected,
+                rows=np.concatenate([rows, cols[mirrored]]),
+                cols=np.concatenate([cols, rows[mirrored]]),
+                data=np.concatenate([new_similarity.data, new_similarity.data[mirrored]]),
+            )
+            self.transformed_docs = None
+
+        # Norma dokumen yang ditambah / dihapus dihitung langsung (baris kosong -> 0)
+        changed_docs = np.asarray(changed_docs, dtype=np.int64)
+        doc_norms = self.doc_norms.copy()
+        changed_rows = self.doc_vectors[changed_docs]
+        if self.scoring == "materialized":
+            dots = np.asarray(changed_rows.multiply(changed_rows @ self.S).sum(axis=1)).ravel()
+            doc_norms[changed_docs] = np.sqrt(np.maximum(dots, 0.0))
+        else:
+            doc_norms[changed_docs] = self._factored_doc_norms(changed_rows)
+
+        # Dokumen lain yang memuat term A: ||d||^2 += d dS d^T dengan dS
+        # hanya non-zero di baris dan kolom A:
+        #   d dS d^T = 2 * sum_a d_a (dS[a] . d) - d_A dS[A, A] d_A^T
+        docs = np.setdiff1d(np.unique(self.postings[:, affected_terms].indices), changed_docs)
+        if len(docs):
+            delta = csr_matrix(new_similarity - old_similarity)
+            rows = self.doc_vectors[docs]
+            rows_A = rows[:, affected_terms]
+            full = np.asarray(rows_A.multiply(rows @ delta.T).sum(axis=1)).ravel()
+            block = np.asarray(rows_A.multiply(rows_A @ delta[:, affected_terms].T).sum(axis=1)).ravel()
+            squared = doc_norms[docs] ** 2 + 2 * full - block
+            doc_norms[docs] = np.sqrt(np.maximum(squared, 0.0))
+        self.doc_norms = doc_norms
+
+    @property
+    def tombstone_ratio(self):
+        """Proporsi dokumen yang sudah dihapus tapi belum di-compact"""
+        return 1.0 - (np.count_nonzero(self.alive) / self.doc_count) if self.doc_count else 0.0
+
+    def compact(self):
+        """
+        Buang baris tombstone dan term yang sudah tidak dipakai dokumen manapun.
+
+        doc_id dan term id akan dinomori ulang.
+
+        Returns:
+            numpy.ndarray: Pemetaan doc_id lama -> doc_id baru (-1 untuk dokumen terhapus)
+        """
+        keep_docs = np.flatnonzero(self.alive)
+        if len(keep_docs) == 0:
+            raise ValueError("Cannot compact a model without live documents")
+        keep_terms = np.flatnonzero(self.df > 0)
+
+        id_to_term = {tid: term for term, tid in self.vocab.items()}
+        self.vocab = {id_to_term[tid]: new_id for new_id, tid in enumerate(keep_terms)}
+        self.V = len(self.vocab)
+
+        self.doc_vectors = self.doc_vectors[keep_docs][:, keep_terms]
+        if self.scoring == "materialized":
+            if self.transformed_docs is not None:
+                self.transformed_docs = self.transformed_docs[keep_docs][:, keep_terms]
+            self.S = self.S[keep_terms][:, keep_terms]
+        self.df = self.df[keep_terms]
+        self.doc_norms = self.doc_norms[keep_docs]
+        if self._is_token_corpus(self.documents):
+            self.documents = self.documents.select(keep_docs)
+        else:
+            self.documents = [self.documents[i] for i in keep_docs]
+        self.alive = np.ones(len(keep_docs), dtype=bool)
+
+        mapping = np.full(self.doc_count, -1, dtype=np.int64)
+        mapping[keep_docs] = np.arange(len(keep_docs))
+        self.doc_count = len(keep_docs)
+        self._postings = None
+        return mapping
+
+    # =============================
+    # SIMPAN / MUAT INDEX
+    # =============================
+    # Layout direktori (INDEX_FORMAT_VERSION = 1):
+    #   manifest.json              -> versi format, mode scoring, ukuran, versi korpus
+    #   vocab.txt                  -> term per baris, urut term id
+    #   <nama>.data/.indices/.indptr.npy -> array CSR/CSC
+    #   <nama>.npy                 -> array dense (doc_norms, df, alive)
+    # Semua array berupa .npy biasa sehingga bisa di-memory-map (np.load
+    # mmap_mode='r'): tidak ada deserialisasi, dan beberapa proses worker
+    # berbagi page cache yang sama.
+    def _persisted_matrices(self):
+        matrices = {"doc_vectors": self.doc_vectors, "postings": self.postings}
+        if self.scoring == "materialized":
+            matrices["S"] = self.S
+            if self.transformed_docs is not None:
+                matrices["transformed_docs"] = self.transformed_docs
+        return matrices
+
+    def save(self, path, version=None):
+        """
+        Simpan index ke direktori `path` (ditulis ke direktori sementara lalu
+        di-rename, sehingga pembaca tidak pernah melihat index setengah jadi).
+
+        Token dokumen (self.documents) tidak ikut disimpan.
+
+        Args:
+            path (str): Direktori tujuan (ditimpa jika sudah ada)
+            version: Penanda versi korpus, dicek ulang saat load
+        """
+        persisted = self._persisted_matrices()
+        arrays = {"doc_norms": self.doc_norms, "df": self.df, "alive": self.alive}
+
+        def write_arrays(tmp_path):
+            for name, matrix in persisted.items():
+                for part in ("data", "indices", "indptr"):
+                    np.save(os.path.join(tmp_path, f"{name}.{part}.npy"), getattr(matrix, part))
+            for name, array in arrays.items():
+                np.save(os.path.join(tmp_path, f"{name}.npy"), np.asarray(array))
+
+        manifest = {
+            "format": INDEX_FORMAT,
+            "format_version": INDEX_FORMAT_VERSION,
+            "scoring": self.scoring,
+            "V": self.V,
+            "doc_count": self.doc_count,
+            "version": None if version is None else str(version),
+            "matrices": {
+                name: {"format": matrix.format, "shape": list(matrix.shape)}
+                for name, matrix in persisted.items()
+            },
+            "arrays": sorted(arrays),
+        }
+        write_index_dir(path, self.vocab, manifest, write_arrays)
+
+    @staticmethod
+    def read_manifest(path):
+        """
+        Baca dan validasi manifest index
+
+        Raises:
+            OSError: Index tidak ada
+            ValueError: Bukan index GVSM atau versi format tidak didukung
+        """
+        return read_index_manifest(path, INDEX_FORMAT, INDEX_FORMAT_VERSION, "GVSM")
+
+    @classmethod
+    def load(cls, path, documents=None, mmap=True, version=None):
+        """
+        Muat index hasil save() tanpa membangun ulang model.
+
+        Args:
+            path (str): Direktori index
+            documents (list): Token list dokumen (untuk field "document" pada
+                hasil match); None = tidak tersedia
+            mmap (bool): Memory-map array (read-only, dibagi antar proses)
+                alih-alih membaca seluruhnya ke memori
+            version: Jika diberikan, harus sama dengan versi saat save()
+
+        Returns:
+            GVSMModel: Model siap pakai (match, match_batch, update incremental)
+
+        Raises:
+            OSError: File index tidak ada / tidak terbaca
+            ValueError: Format tidak cocok atau versi korpus berbeda
+        """
+        manifest = cls.read_manifest(path)
+        if version is not None and manifest["version"] != str(version):
+            raise ValueError("Index was built for a different corpus version")
+
+        doc_count = manifest["doc_count"]
+        if documents is None:
+            documents = [None] * doc_count
+        elif len(documents) != doc_count:
+            raise ValueError("documents length does not match the index")
+
+        mmap_mode = 'r' if mmap else None
+        load_array = lambda name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+
+        model = cls.__new__(cls)
+        model.documents = documents
+        model.scoring = manifest["scoring"]
+        model.V = manifest["V"]
+        model.doc_count = doc_count
+
+        model.vocab = read_index_vocab(path, model.V)
+
+        model.S = None
+        model.transformed_docs = None
+        model._postings = None
+        for name, meta in manifest["matrices"].items():
+            matrix_cls = csr_matrix if meta["format"] == "csr" else csc_matrix
+            parts = tuple(load_array(f"{name}.{part}") for part in ("data", "indices", "indptr"))
+            matrix = matrix_cls(parts, shape=tuple(meta["shape"]), copy=False)
+            setattr(model, "_postings" if name == "postings" else name, matrix)
+
+        for name in manifest["arrays"]:
+            setattr(model, name, load_array(name))
+
+        return model
+
     def match(self, query_tokens, top_n=5, candidate_ids=None):
         # 1. Vectorize Query (V,) -> Sparse
         q_vec = np.zeros(self.V, dtype=np.float32)
@@ -153,8 +939,8 @@ class GVSMModel:
 
         # 2. Calculate Transformed Query: Sq = q @ S
         # Karena S simetris, q @ S == S @ q.T
-        # Sparse @ Sparse -> Sparse
-        Sq = q_vec_sparse @ self.S 
+        # Sparse @ Sparse -> Sparse (mode "factored": lewat faktor B dan D^-1)
+        Sq = self.similarity_rows(q_vec_sparse)
         
         # Convert Sq ke Dense array (1D) untuk perhitungan dot product mudah
         Sq_dense = Sq.toarray().flatten()
@@ -175,20 +961,31 @@ class GVSMModel:
         # GVSM standard: Sim(d, q) = (d^T S q) / (norm...)
         # Kita sudah punya `transformed_docs` = d^T S.
         # Jadi Numerator = transformed_docs @ q
-        
+        # Mode "factored" (atau transformed_docs dibuang setelah update
+        # incremental): Numerator = doc_vectors @ Sq
+        if self.transformed_docs is not None:
+            docs, q_side = self.transformed_docs, q_vec_dense
+        else:
+            docs, q_side = self.doc_vectors, Sq_dense
+
         if candidate_ids is not None:
-            indices = list(candidate_ids)
-            # Slicing numpy array
-            target_docs = self.transformed_docs[indices] 
+            indices = np.asarray(list(candidate_ids), dtype=np.int64)
+            if len(indices) == 0:
+                return []
             target_norms = self.doc_norms[indices]
             mapping_back = indices
+            if len(indices) * 2 > self.doc_count:
+                # Kandidat hampir semua dokumen: lebih murah hitung penuh lalu ambil
+                numerators = (docs @ q_side)[indices]
+            else:
+                # Slicing hanya baris kandidat
+                numerators = docs[indices] @ q_side
         else:
-            target_docs = self.transformed_docs
             target_norms = self.doc_norms
-            mapping_back = range(self.doc_count)
+            mapping_back = None
 
-        # Hitung Numerator: (N x V) @ (V,)
-        numerators = target_docs @ q_vec_dense
+            # Hitung Numerator: (N x V) @ (V,)
+            numerators = docs @ q_side
 
         # 6. Final Scores
         denominators = target_norms * denom_q
@@ -197,22 +994,80 @@ class GVSMModel:
             scores = numerators / denominators
             scores = np.nan_to_num(scores)
 
-        # 7. Formatting
-        results = []
-        for i, score in enumerate(scores):
-            final_score = min(float(score), 1.0)
-            if final_score > 0.0001: # Filter skor 0 atau sangat kecil
-                results.append((mapping_back[i], final_score))
+        # 7. Top-k (vectorized) + Formatting hanya untuk k hasil
+        positions, top_scores = rank_top_k(scores, top_n)
+        doc_ids = positions if mapping_back is None else mapping_back[positions]
 
-        results.sort(key=lambda x: -x[1])
-        if top_n:
-            results = results[:top_n]
+        return self._format_results(doc_ids, top_scores)
 
+    def _format_results(self, doc_ids, scores):
         return [
-            {"doc_id": idx, "score": sc, "document": self.documents[idx]}
-            for idx, sc in results
+            {"doc_id": int(idx), "score": float(sc), "document": self.documents[idx]}
+            for idx, sc in zip(doc_ids.tolist(), np.asarray(scores).tolist())
         ]
 
+    def _query_matrix(self, queries):
+        """
+        Susun banyak query menjadi satu sparse matrix TF (Q x V)
+        """
+        rows, cols, data = [], [], []
+        for row, query_tokens in enumerate(queries):
+            term_counts = {}
+            for term in query_tokens:
+                tid = self.vocab.get(term)
+                if tid is not None:
+                    term_counts[tid] = term_counts.get(tid, 0) + 1
+            for tid, count in term_counts.items():
+                rows.append(row)
+                cols.append(tid)
+                data.append(float(count))
+        return csr_matrix((data, (rows, cols)), shape=(len(queries), self.V))
+
+    def match_batch(self, queries, top_n=5, batch_size=256):
+        """
+        Matching banyak query sekaligus.
+
+        Query ditumpuk menjadi matriks sparse Q (Q x V), lalu Q @ S dan
+        numerator (transformed_docs @ Q.T) dihitung dengan satu perkalian
+        sparse matrix-matrix per batch, diikuti top-k per baris.
+
+        Args:
+            queries (list): List token list query (hasil preprocessing)
+            top_n (int): Jumlah hasil per query
+            batch_size (int): Jumlah query per perkalian matriks, membatasi
+                memori skor dense (batch_size x N)
+
+        Returns:
+            list: Satu list hasil (format sama dengan match) per query
+        """
+        results = []
+        for start in range(0, len(queries), batch_size):
+            Q = self._query_matrix(queries[start:start + batch_size])
+
+            # Penyebut query: sqrt(q . Sq) untuk setiap baris
+            SQ = self.similarity_rows(Q)
+            q_dot_Sq = np.asarray(Q.multiply(SQ).sum(axis=1)).ravel()
+
+            # Numerator semua dokumen x semua query: (N x V) @ (V x Q)
+            if self.transformed_docs is not None:
+                numerators = (self.transformed_docs @ Q.T).toarray()
+            else:
+                numerators = (self.doc_vectors @ SQ.T).toarray()
+
+            for i, q_dot in enumerate(q_dot_Sq):
+                if q_dot <= 0:
+                    results.append([])
+                    continue
+
+                denominators = self.doc_norms * np.sqrt(q_dot)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    scores = np.nan_to_num(numerators[:, i] / denominators)
+
+                positions, top_scores = rank_top_k(scores, top_n)
+                results.append(self._format_results(positions, top_scores))
+
+        return results
+
 # --- TEST ---
 if __name__ == "__main__":
     # Buat dummy data agak banyak untuk tes performa
@@ -0,0 +1,41 @@
+"""
+Pengecekan GVSMModel.match_batch terhadap match() per query
+===========================================================
+Kedua mode scoring, sebelum dan sesudah update incremental
+(transformed_docs dibuang), dengan beberapa batch per panggilan.
+
+Cara menjalankan (dari root repo):
+    python -m pytest -q DatMin_Web/Backend/GVSM/test_gvsm_batch.py
+"""
+
+import pytest
+
+from gvsm import GVSMModel, SCORING_MODES
+from test_gvsm_incremental import QUERIES, random_documents
+
+BATCH_QUERIES = QUERIES + [[], ["t1"], ["t7", "t1"], ["t2", "baru"], ["t30"] * 3]
+
+
+def assert_batch_equals_match(model, top_n, batch_size):
+    batch = model.match_batch(BATCH_QUERIES, top_n=top_n, batch_size=batch_size)
+    assert len(batch) == len(BATCH_QUERIES)
+    for query, got in zip(BATCH_QUERIES, batch):
+        expected = model.match(query, top_n=top_n)
+        assert [r["doc_id"] for r in got] == [r["doc_id"] for r in expected]
+        assert [r["score"] for r in got] == pytest.approx([r["score"] for r in expected], rel=1e-6)
+
+
+@pytest.mark.parametrize("scoring", SCORING_MODES)
+@pytest.mark.parametrize("top_n", [1, 5, 50])
+def test_match_batch_equals_match(scoring, top_n):
+    model = GVSMModel(random_documents(50, seed=2), scoring=scoring)
+    assert_batch_equals_match(model, top_n, batch_size=256)
+    assert_batch_equals_match(model, top_n, batch_size=3)
+
+
+@pytest.mark.parametrize("scoring", SCORING_MODES)
+def test_match_batch_after_update(scoring):
+    model = GVSMModel(random_documents(50, seed=2), scoring=scoring)
+    model.add_documents([["t2", "baru", "t7"]])
+    model.remove_documents([4])
+    assert_batch_equals_match(model, top_n=10, batch_size=4)
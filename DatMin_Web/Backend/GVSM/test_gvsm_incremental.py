@@ -0,0 +1,149 @@
+"""
+Pengecekan GVSMModel terhadap perhitungan langsung
+===================================================
+- skor match() = d S q / (sqrt(d S d) sqrt(q S q)) dengan S dense
+- add_documents / remove_documents / compact() sama dengan build ulang
+- candidate_documents() tidak membuang dokumen yang mendapat skor
+
+Cara menjalankan (dari root repo):
+    python -m pytest -q DatMin_Web/Backend/GVSM/test_gvsm_incremental.py
+"""
+
+import numpy as np
+import pytest
+
+from gvsm import GVSMModel, SCORING_MODES
+
+TOLERANCE = 1e-9
+
+
+def random_documents(n_docs, n_terms=40, max_length=12, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        [f"t{i}" for i in rng.integers(0, n_terms, rng.integers(1, max_length + 1))]
+        for _ in range(n_docs)
+    ]
+
+
+QUERIES = [["t0"], ["t1", "t7"], ["t3", "t3", "t25"], ["t39", "t12", "t5"], ["tidak-ada"]]
+
+
+def dense_scores(documents, query):
+    """Skor GVSM semua dokumen dari matriks dense (tanpa ambang / clip)"""
+    vocab = {}
+    for doc in documents:
+        for term in doc:
+            vocab.setdefault(term, len(vocab))
+    tf = np.zeros((len(documents), len(vocab)))
+    for i, doc in enumerate(documents):
+        for term in doc:
+            tf[i, vocab[term]] += 1
+    q = np.zeros(len(vocab))
+    for term in query:
+        if term in vocab:
+            q[vocab[term]] += 1
+
+    B = (tf > 0).astype(float)
+    df = B.sum(axis=0)
+    inv_sqrt_df = np.divide(1.0, np.sqrt(df), out=np.zeros_like(df), where=df > 0)
+    S = inv_sqrt_df[:, None] * (B.T @ B) * inv_sqrt_df[None, :]
+
+    norms = np.sqrt(np.einsum('ij,jk,ik->i', tf, S, tf))
+    q_norm = np.sqrt(q @ S @ q)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.nan_to_num((tf @ S @ q) / (norms * q_norm)), norms
+
+
+def scores_of(model, query, **kwargs):
+    return {r["doc_id"]: r["score"] for r in model.match(query, top_n=None, **kwargs)}
+
+
+def assert_same_ranking(model, reference):
+    assert np.allclose(model.doc_norms, reference.doc_norms, rtol=TOLERANCE, atol=TOLERANCE)
+    for query in QUERIES:
+        got, expected = scores_of(model, query), scores_of(reference, query)
+        assert got.keys() == expected.keys()
+        for doc_id, score in expected.items():
+            assert got[doc_id] == pytest.approx(score, rel=TOLERANCE, abs=TOLERANCE)
+
+
+@pytest.mark.parametrize("scoring", SCORING_MODES)
+def test_match_equals_dense_gvsm(scoring):
+    documents = random_documents(30)
+    model = GVSMModel(documents, scoring=scoring)
+
+    for query in QUERIES:
+        expected, norms = dense_scores(documents, query)
+        assert np.allclose(model.doc_norms, norms, rtol=TOLERANCE)
+        got = scores_of(model, query)
+        for doc_id, score in enumerate(expected):
+            if score > 1e-4:
+                assert got[doc_id] == pytest.approx(min(score, 1.0), rel=1e-6)
+            else:
+                assert doc_id not in got
+
+
+@pytest.mark.parametrize("scoring", SCORING_MODES)
+def test_add_documents_equals_rebuild(scoring):
+    documents = random_documents(40)
+    # Dokumen baru memuat term lama dan term yang belum ada di vocabulary
+    new_documents = [["t0", "t3", "baru1"], ["baru1", "baru2", "t7", "t7"]]
+
+    model = GVSMModel(documents, scoring=scoring)
+    updated = model.copy()
+    assert updated.add_documents(new_documents) == [40, 41]
+
+    assert_same_ranking(updated, GVSMModel(documents + new_documents, scoring=scoring))
+    # Model asal tidak ikut berubah
+    assert_same_ranking(model, GVSMModel(documents, scoring=scoring))
+
+
+@pytest.mark.parametrize("scoring", SCORING_MODES)
+def test_remove_and_compact_equal_rebuild(scoring):
+    documents = random_documents(40)
+    removed = [0, 7, 39]
+
+    model = GVSMModel(documents, scoring=scoring)
+    model.remove_documents(removed)
+    emptied = [[] if i in removed else doc for i, doc in enumerate(documents)]
+    assert_same_ranking(model, GVSMModel(emptied, scoring=scoring))
+
+    with pytest.raises(ValueError):
+        model.remove_documents([7])
+
+    mapping = model.compact()
+    kept = [doc for i, doc in enumerate(documents) if i not in removed]
+    assert list(mapping[removed]) == [-1] * len(removed)
+    assert_same_ranking(model, GVSMModel(kept, scoring=scoring))
+
+
+@pytest.mark.parametrize("scoring", SCORING_MODES)
+def test_save_load_after_update(scoring, tmp_path):
+    documents = random_documents(30)
+    model = GVSMModel(documents, scoring=scoring)
+    model.add_documents([["t1", "t2", "baru"]])
+    model.remove_documents([3])
+
+    model.save(str(tmp_path / "index"))
+    assert_same_ranking(GVSMModel.load(str(tmp_path / "index")), model)
+
+
+@pytest.mark.parametrize("scoring", SCORING_MODES)
+def test_candidate_documents_keep_every_match(scoring):
+    documents = random_documents(60, n_terms=200, max_length=4, seed=1)
+    model = GVSMModel(documents, scoring=scoring)
+    model.add_documents([["t0", "t150"]])
+    model.remove_documents([5])
+
+    for query in QUERIES + [["t150"], ["t199", "t0"]]:
+        candidates = model.candidate_documents(query)
+        assert set(scores_of(model, query)) <= set(candidates.tolist())
+        assert scores_of(model, query, candidate_ids=candidates) == scores_of(model, query)
+
+
+def test_match_results_carry_document_tokens():
+    documents = random_documents(20)
+    model = GVSMModel(documents)
+    for result in model.match(["t1", "t7"], top_n=None) + model.match_batch([["t1", "t7"]])[0]:
+        assert result.keys() == {"doc_id", "score", "document"}
+        assert list(result["document"]) == documents[result["doc_id"]]
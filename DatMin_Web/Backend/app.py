@@ -1,22 +1,88 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
+from werkzeug.utils import secure_filename
 import os
+import tempfile
+import threading
 
 
 from tokenizing import Tokenizer
 from filtering import StopwordFilter
 from indonesian_porter_stemmer import IndonesianPorterStemmer
 from preprocessing_pipeline import PreprocessingPipeline
-from vector_space_model import VectorSpaceModel  # TIDAK DIUBAH
-from GVSM.gvsm import GVSMModel
-from cache_utils import save_cache, load_cache
+from bm25 import BM25Model
+from lsi_model import DEFAULT_K as DEFAULT_LSI_K, LSIModel
+from cache_utils import (
+    DocumentStore, DocumentTexts, RawTextCache, encode_entry, file_sha256, corpus_fingerprint
+)
+from search_index import IndexSnapshot, SearchIndex, SnapshotBuilder
+from corpus_watcher import CorpusWatcher
+from query_cache import QueryCache
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry, StageTimer
+from token_corpus import TokenCorpus, Vocabulary
+from response_utils import (
+    StaleCursorError, compress_response, decode_cursor, encode_cursor, make_snippet
+)
+from ingestion import (
+    SUPPORTED_EXTENSIONS, ingest_files, default_workers, process_file, save_stream
+)
 
 app = Flask(__name__)
 CORS(app)
 
+# Batas jumlah hasil per halaman untuk response compact
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+# Batas jumlah query untuk satu request /search/batch
+MAX_BATCH_QUERIES = 1000
+
+# Jumlah dimensi laten model LSI (parameter "model": "lsi")
+LSI_K = int(os.environ.get('LSI_K', str(DEFAULT_LSI_K)))
+
+
+# ======================
+# METRIK (Prometheus, GET /metrics)
+# ======================
+metrics = MetricsRegistry()
+stage_seconds = metrics.histogram(
+    'datmin_stage_duration_seconds',
+    'Latency per tahap request / build index',
+    ['endpoint', 'stage'],
+)
+http_requests = metrics.counter(
+    'datmin_http_requests_total', 'Jumlah request HTTP', ['endpoint', 'status']
+)
+
+
+@app.after_request
+def count_request(response):
+    http_requests.inc(endpoint=request.endpoint or 'unknown', status=response.status_code)
+    return response
+
+
+@app.after_request
+def compress(response):
+    # gzip / brotli sesuai Accept-Encoding dari client
+    return compress_response(response, request.accept_encodings)
+
 # UPLOAD_FOLDER = os.path.join(os.getcwd(), 'Projek/DatMin_Web/Backend/uploads')
 UPLOAD_FOLDER = os.path.join('DatMin_Web/Backend/uploads')
 
+# Upload POST /documents ditulis dulu ke folder sementara (bukan uploads,
+# agar tidak terbaca sebagai dokumen sebelum selesai), lalu dipindah
+UPLOAD_TMP_FOLDER = os.path.join('DatMin_Web/Backend', 'upload_tmp')
+MAX_UPLOAD_MB = int(os.environ.get('MAX_UPLOAD_MB', '50'))
+# Body request yang lebih besar ditolak (413) sebelum form multipart
+# di-parse; tambahan 64 KB untuk header dan boundary multipart. Batas isi
+# file yang tepat tetap dicek save_stream.
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_MB * 1024 * 1024 + 64 * 1024
+
+
+@app.errorhandler(413)
+def request_too_large(error):
+    return jsonify({"error": f"File melebihi batas {MAX_UPLOAD_MB} MB"}), 413
+
 # ======================
 # INISIALISASI PIPELINE
 # ======================
@@ -25,54 +91,41 @@ filtering = StopwordFilter()
 stemmer = IndonesianPorterStemmer()
 
 
-DOCUMENT_CACHE = None
-TOKEN_CACHE = None
-FILENAME_CACHE = None
-CACHE_PATH = os.path.join('DatMin_Web/Backend', 'preprocessing_cache.pkl')
-def get_uploads_state():
-    """Return a tuple of (filenames, mtimes) for all .txt, .docx, .pdf in uploads."""
-    state = []
-    for file in sorted(os.listdir(UPLOAD_FOLDER)):
-        ext = os.path.splitext(file)[1].lower()
-        if ext in {'.txt', '.docx', '.pdf'}:
-            path = os.path.join(UPLOAD_FOLDER, file)
-            try:
-                mtime = os.path.getmtime(path)
-                state.append((file, mtime))
-            except Exception:
-                continue
-    return state
-
-
-def load_documents_cached():
-    global DOCUMENT_CACHE, TOKEN_CACHE, FILENAME_CACHE
-
-    uploads_state = get_uploads_state()
-    cache = load_cache(CACHE_PATH)
-    if cache:
-        cached_state = cache.get('uploads_state')
-        if cached_state == uploads_state:
-            DOCUMENT_CACHE = cache['documents_raw']
-            TOKEN_CACHE = cache['doc_tokens']
-            FILENAME_CACHE = cache['file_names']
-            return DOCUMENT_CACHE, TOKEN_CACHE, FILENAME_CACHE
-
-    # If cache is missing or outdated, reload and reprocess
-    documents_raw, file_names = load_documents()
-    doc_tokens = pipeline.process_documents(documents_raw)
-
-    DOCUMENT_CACHE = documents_raw
-    TOKEN_CACHE = doc_tokens
-    FILENAME_CACHE = file_names
+# Cache hasil ekstraksi + preprocessing per dokumen (SQLite). Cache pickle
+# lama (preprocessing_cache.pkl) diimpor sekali lalu di-rename *.migrated
+STORE_PATH = os.path.join('DatMin_Web/Backend', 'document_store.sqlite3')
+LEGACY_CACHE_PATH = os.path.join('DatMin_Web/Backend', 'preprocessing_cache.pkl')
+document_store = DocumentStore(STORE_PATH)
+document_store.migrate_pickle(LEGACY_CACHE_PATH)
+
+# Teks mentah hanya dibaca untuk dokumen hasil search (snippet / detail
+# preprocessing), dengan cache LRU terbatas byte (env RAW_TEXT_CACHE_MB)
+RAW_TEXT_CACHE_MB = int(os.environ.get('RAW_TEXT_CACHE_MB', '64'))
+raw_text_cache = RawTextCache(max_bytes=RAW_TEXT_CACHE_MB * 1024 * 1024)
+
+# Cache LRU hasil stemming, dimuat ulang saat startup
+STEM_CACHE_PATH = os.path.join('DatMin_Web/Backend', 'stem_cache.json')
+stemmer.load_cache(STEM_CACHE_PATH)
+
+# Jumlah proses untuk ekstraksi + preprocessing paralel (env INGEST_WORKERS)
+INGEST_WORKERS = default_workers()
+
+# Status folder uploads disimpan di memori; folder hanya di-scan ulang
+# paling sering sekali per CORPUS_SCAN_TTL detik (atau oleh thread
+# latar belakang saat dijalankan lewat `python app.py`)
+CORPUS_SCAN_TTL = float(os.environ.get('CORPUS_SCAN_TTL', '2'))
+corpus_watcher = CorpusWatcher(
+    UPLOAD_FOLDER, ttl=CORPUS_SCAN_TTL,
+    on_change=lambda version: _on_corpus_change(version)
+)
 
-    save_cache({
-        'uploads_state': uploads_state,
-        'documents_raw': documents_raw,
-        'doc_tokens': doc_tokens,
-        'file_names': file_names
-    }, CACHE_PATH)
 
-    return DOCUMENT_CACHE, TOKEN_CACHE, FILENAME_CACHE
+def get_uploads_state(folder_files=None):
+    """Return a list of (filename, mtime) for all .txt, .docx, .pdf in uploads."""
+    if folder_files is None:
+        folder_files = corpus_watcher.snapshot()[1]
+    return [(file, mtime) for file, mtime in folder_files
+            if os.path.splitext(file)[1].lower() in SUPPORTED_EXTENSIONS]
 
 
 pipeline = PreprocessingPipeline(
@@ -81,56 +134,533 @@ pipeline = PreprocessingPipeline(
     stemmer=stemmer
 )
 
-# ======================    
-# LOAD DOKUMEN .TXT
-# ======================
-def load_documents():
-    documents_raw = []
-    file_names = []
-
-    for file in sorted(os.listdir(UPLOAD_FOLDER)):
-        path = os.path.join(UPLOAD_FOLDER, file)
-        ext = os.path.splitext(file)[1].lower()
-        if ext == ".txt":
-            with open(path, "r", encoding="utf-8") as f:
-                documents_raw.append(f.read())
-                file_names.append(file)
-        elif ext == ".docx":
-            try:
-                text = stemmer.read_docx_file(path)
-                documents_raw.append(text)
-                file_names.append(file)
-            except Exception as e:
-                print(f"Error reading DOCX {file}: {e}")
-        elif ext == ".pdf":
-            try:
-                text = stemmer.read_pdf_file(path)
-                documents_raw.append(text)
-                file_names.append(file)
-            except Exception as e:
-                print(f"Error reading PDF {file}: {e}")
+# Cache query: teks -> token (per versi pipeline) dan multiset token ->
+# hasil ranking (per versi index). Ukuran lewat env QUERY_CACHE_SIZE /
+# RESULT_CACHE_SIZE (jumlah entri, 0 = nonaktif)
+query_cache = QueryCache(
+    pipeline,
+    max_queries=int(os.environ.get('QUERY_CACHE_SIZE', '4096')),
+    max_results=int(os.environ.get('RESULT_CACHE_SIZE', '1024')),
+)
 
-    return documents_raw, file_names
+# Index GVSM dipakai ulang antar request selama isi korpus sama, dan
+# disimpan ke disk agar proses / worker baru cukup memory-map index
+INDEX_PATH = os.path.join('DatMin_Web/Backend', 'gvsm_index')
+search_index = SearchIndex(index_path=INDEX_PATH)
+
+# Faktor SVD model LSI disimpan di samping index GVSM
+LSI_INDEX_PATH = os.path.join('DatMin_Web/Backend', 'lsi_index')
+
+
+def build_lsi(doc_tokens, version):
+    """
+    LSIModel untuk satu versi korpus, dimuat dari LSI_INDEX_PATH jika
+    dibangun dari versi korpus dan LSI_K yang sama; selain itu SVD
+    dihitung lalu disimpan.
+    """
+    try:
+        return LSIModel.load(LSI_INDEX_PATH, documents=doc_tokens, version=version, k=LSI_K)
+    except (OSError, ValueError):
+        # Belum ada, format lama, korpus lain, atau k berbeda
+        pass
+
+    model = LSIModel(doc_tokens, k=LSI_K)
+    try:
+        model.save(LSI_INDEX_PATH, version=version)
+    except OSError as e:
+        print(f"Gagal menyimpan index LSI ke {LSI_INDEX_PATH}: {e}")
+    return model
+
+
+# Model ranking yang bisa dipilih lewat parameter "model" di /search dan
+# /search/batch. "gvsm" = model snapshot; model lain dibangun dari token
+# snapshot (TokenCorpus) oleh factory(doc_tokens, version) bersama
+# snapshot-nya, sebelum snapshot dipasang (lihat build_rankers)
+RANKING_MODELS = {
+    'gvsm': None,
+    'bm25': lambda doc_tokens, version: BM25Model(doc_tokens),
+    'tfidf': lambda doc_tokens, version: BM25Model(doc_tokens, weighting='tfidf'),
+    'lsi': build_lsi,
+}
+DEFAULT_RANKING_MODEL = 'gvsm'
+
+
+def build_rankers(doc_tokens, version):
+    """
+    Model ranking selain GVSM untuk snapshot baru. Dipakai ulang dari
+    snapshot aktif jika versi korpusnya sama (seperti SearchIndex.build_model),
+    kecuali model hasil fold-in yang mengabaikan term baru (lihat
+    rankers_need_rebuild).
+
+    Returns:
+        dict: nama model -> model ranking
+    """
+    snapshot = search_index.snapshot
+    rankers = {}
+    for name, factory in RANKING_MODELS.items():
+        if factory is None:
+            continue
+        if snapshot is not None and snapshot.version == version and name in snapshot.rankers \
+                and not rankers_need_rebuild({name: snapshot.rankers[name]}):
+            rankers[name] = snapshot.rankers[name]
+        else:
+            rankers[name] = factory(doc_tokens, version)
+    return rankers
+
+
+def rankers_need_rebuild(rankers):
+    """
+    True jika ada model yang dokumen fold-in-nya kehilangan term (LSI:
+    term baru tidak ada di ruang laten), sehingga dokumen itu tidak bisa
+    ditemukan lewat term tersebut sampai model dibangun ulang
+    """
+    return any(getattr(ranker, 'dropped_terms', 0) for ranker in rankers.values())
+
+
+def results_version(snapshot):
+    """
+    Versi index untuk cache hasil ranking. Snapshot dengan model fold-in
+    yang belum lengkap punya versi korpus yang sama dengan snapshot hasil
+    rebuild-nya, jadi diberi versi cache tersendiri agar hasilnya tidak
+    terpakai lagi setelah rebuild.
+    """
+    if rankers_need_rebuild(snapshot.rankers):
+        return (snapshot.version, 'fold-in')
+    return snapshot.version
+
+
+def update_rankers(snapshot, doc_tokens, version, new_tokens):
+    """
+    Model ranking snapshot setelah dokumen new_tokens ditambahkan di akhir.
+    Model dengan add_documents (LSI: fold-in) disalin lalu diperbarui;
+    BM25 / TF-IDF dibangun ulang karena idf dan panjang rata-rata dokumen
+    mengubah bobot semua postings.
+    """
+    if not snapshot.rankers:
+        return build_rankers(doc_tokens, version)
+
+    rankers = {}
+    for name, ranker in snapshot.rankers.items():
+        if hasattr(ranker, 'add_documents'):
+            # Snapshot lama tetap utuh untuk request yang sedang berjalan
+            ranker = ranker.copy()
+            ranker.add_documents([new_tokens])
+            ranker.documents = doc_tokens
+        else:
+            ranker = RANKING_MODELS[name](doc_tokens, version)
+        rankers[name] = ranker
+    return rankers
+
+
+def build_snapshot():
+    """
+    Bangun IndexSnapshot dari isi folder uploads saat ini, dengan cache
+    per file (DocumentStore / SQLite).
+
+    Setiap dokumen di-cache dengan kunci (hash isi file, versi pipeline),
+    sehingga hanya file baru / berubah yang diekstrak dan di-preprocess ulang.
+    Hash hanya dihitung ulang jika mtime file berubah.
+
+    Token disimpan sebagai array id int32 terhadap satu vocabulary bersama
+    (bukan list str), dan token snapshot berupa TokenCorpus. Teks mentah dan
+    detail preprocessing tidak dimuat; dibaca per dokumen saat dibutuhkan.
+
+    Dipanggil oleh SnapshotBuilder (thread latar belakang), bukan di jalur
+    request, kecuali saat cold start.
+    """
+    timer = StageTimer(stage_seconds, 'index_build')
+    watch_version, folder_files = corpus_watcher.snapshot()
+    pipeline_version = pipeline.version
+
+    # filename -> (mtime, content_hash), urut saat file pertama tercatat
+    cached_files = document_store.files()
+
+    # Urutan doc_id = urutan di store (file yang di-upload lewat
+    # ingest_document ada di akhir), file baru di akhir urut nama, sehingga
+    # rebuild menghasilkan doc_id dan versi yang sama dengan jalur incremental
+    positions = {file: i for i, file in enumerate(cached_files)}
+    uploads_state = sorted(
+        get_uploads_state(folder_files),
+        key=lambda item: (positions.get(item[0], len(positions)), item[0])
+    )
+    # content_hash -> True (berhasil) / False (gagal diekstrak) untuk versi pipeline ini
+    cached_states = document_store.entry_states(pipeline_version)
+    # Term unik untuk semua id token di store
+    cached_vocab = document_store.terms()
+    vocabulary = Vocabulary(cached_vocab)
+
+    files = {}
+    missing = []
+    for file, mtime in uploads_state:
+        cached = cached_files.get(file)
+        if cached and cached[0] == mtime:
+            content_hash = cached[1]
+        else:
+            try:
+                content_hash = file_sha256(os.path.join(UPLOAD_FOLDER, file))
+            except OSError:
+                continue
+        files[file] = (mtime, content_hash)
+
+        if content_hash not in cached_states:
+            missing.append(file)
+    timer.lap('cache_check')
+
+    # Hanya file baru / berubah yang diproses ulang (paralel antar core)
+    new_entries = {}
+    if missing:
+        for file, raw, tokens, steps in ingest_files(UPLOAD_FOLDER, missing, pipeline, workers=INGEST_WORKERS):
+            key = (files[file][1], pipeline_version)
+            new_entries[key] = encode_entry(vocabulary, raw, tokens, steps)
+
+        # File yang gagal diekstrak dicatat agar tidak dicoba ulang
+        # sampai isinya berubah
+        for file in missing:
+            new_entries.setdefault((files[file][1], pipeline_version), None)
+
+        stemmer.save_cache(STEM_CACHE_PATH)
+    timer.lap('extract')
+
+    # Semua perubahan di-commit sekaligus (atomik)
+    if new_entries or files != cached_files:
+        with document_store.transaction():
+            document_store.append_terms(vocabulary.terms, len(cached_vocab))
+            for key, entry in new_entries.items():
+                document_store.put_entry(key, entry)
+            document_store.set_files(files)
+
+    # Entri yang masih dibaca snapshot aktif / snapshot lama milik request
+    # yang sedang berjalan baru dihapus pada build berikutnya setelah
+    # snapshot itu tidak dipakai lagi
+    document_store.prune_entries(
+        {(h, pipeline_version) for _, h in files.values()} | search_index.live_doc_keys()
+    )
+
+    stored_ids = document_store.load_ids(pipeline_version)
+
+    doc_ids, doc_keys, file_names = [], [], []
+    for file, (mtime, content_hash) in files.items():
+        ids = stored_ids.get(content_hash)
+        if ids is None:
+            # Gagal diekstrak (mis. PDF rusak), lewati seperti sebelumnya
+            continue
+        doc_ids.append(ids)
+        doc_keys.append((content_hash, pipeline_version))
+        file_names.append(file)
+
+    tokens = TokenCorpus.from_encoded(vocabulary, doc_ids)
+    version = corpus_fingerprint(
+        [(file, files[file][1]) for file in file_names], pipeline_version
+    )
+    timer.lap('load')
+    # Korpus kosong: tidak ada model (GVSMModel butuh minimal satu dokumen)
+    model = search_index.build_model(tokens, version=version) if file_names else None
+    timer.lap('model')
+    # Model ranking lain dibangun di sini (thread builder), bukan di request
+    rankers = build_rankers(tokens, version) if file_names else {}
+    timer.lap('rankers')
+    timer.finish()
+
+    return IndexSnapshot(
+        version=version,
+        source=(watch_version, pipeline_version),
+        model=model,
+        texts=DocumentTexts(document_store, doc_keys, cache=raw_text_cache),
+        tokens=tokens,
+        file_names=file_names,
+        doc_keys=doc_keys,
+        rankers=rankers,
+    )
+
+
+# Snapshot baru dibangun di thread latar belakang lalu dipasang secara
+# atomik; request tetap memakai snapshot lama selama build berjalan
+index_builder = SnapshotBuilder(
+    build_snapshot, search_index.install, is_current=lambda: _snapshot_is_current()
+)
+_cold_start_lock = threading.Lock()
+
+
+def _snapshot_is_current(snapshot=None):
+    snapshot = snapshot or search_index.snapshot
+    return snapshot is not None and snapshot.source == (corpus_watcher.version, pipeline.version)
+
+
+def _on_corpus_change(version):
+    # Saat cold start snapshot pertama dibangun oleh current_snapshot()
+    if search_index.snapshot is not None:
+        index_builder.request()
+
+
+def _index_gauge(read):
+    # Nilai gauge dari snapshot aktif; None (tidak dilaporkan) jika belum ada model
+    def callback():
+        snapshot = search_index.snapshot
+        if snapshot is None or snapshot.model is None:
+            return None
+        return read(snapshot)
+    return callback
+
+
+def _matrix_nnz(snapshot):
+    model = snapshot.model
+    matrices = {'doc_vectors': model.doc_vectors, 'S': model.S,
+                'transformed_docs': model.transformed_docs}
+    # Mode "factored" tidak menyimpan S / transformed_docs
+    return {(name,): matrix.nnz for name, matrix in matrices.items() if matrix is not None}
+
+
+def _cache_stat(field):
+    def callback():
+        caches = {**query_cache.cache_info(), 'raw_text': raw_text_cache.cache_info(),
+                  'stem': stemmer.cache_info()}
+        return {(name,): info[field] for name, info in caches.items()}
+    return callback
+
+
+metrics.gauge('datmin_index_documents', 'Jumlah dokumen di snapshot aktif',
+              callback=_index_gauge(len))
+metrics.gauge('datmin_index_vocabulary_terms', 'Ukuran vocabulary V model aktif',
+              callback=_index_gauge(lambda snapshot: snapshot.model.V))
+metrics.gauge('datmin_index_nnz', 'Entri non-zero matriks model aktif', ['matrix'],
+              callback=_index_gauge(_matrix_nnz))
+metrics.counter('datmin_index_builds_total', 'Jumlah snapshot index yang dipasang',
+                callback=lambda: index_builder.builds)
+metrics.counter('datmin_cache_hits_total', 'Cache hit', ['cache'], callback=_cache_stat('hits'))
+metrics.counter('datmin_cache_misses_total', 'Cache miss', ['cache'], callback=_cache_stat('misses'))
+metrics.gauge('datmin_cache_entries', 'Jumlah entri cache', ['cache'], callback=_cache_stat('size'))
+
+
+def current_snapshot():
+    """
+    Snapshot untuk request ini. Tidak pernah menunggu rebuild kecuali
+    belum ada snapshot sama sekali (cold start).
+    """
+    snapshot = search_index.snapshot
+    if snapshot is None:
+        with _cold_start_lock:
+            snapshot = search_index.snapshot
+            if snapshot is None:
+                snapshot = index_builder.build_now()
+    elif not _snapshot_is_current(snapshot):
+        index_builder.request()
+    return snapshot
+
+
+def ingest_document(name, tmp_path, content_hash):
+    """
+    Tambahkan satu file upload ke store dan index aktif (incremental).
+
+    Hanya file ini yang diekstrak dan di-preprocess; model GVSM aktif
+    disalin lalu diperbarui dengan GVSMModel.add_documents, sehingga
+    dokumen lain tidak diproses ulang. Dijalankan lewat
+    index_builder.apply() (eksklusif terhadap rebuild latar belakang).
+
+    Args:
+        name (str): Nama file tujuan di UPLOAD_FOLDER
+        tmp_path (str): File upload sementara (dipindah ke UPLOAD_FOLDER)
+        content_hash (str): sha256 isi file (dihitung saat upload diterima)
+
+    Returns:
+        IndexSnapshot: Snapshot baru yang memuat dokumen ini
+
+    Raises:
+        FileExistsError: Nama file sudah ada atau isinya sama dengan dokumen lain
+        ValueError: File gagal diekstrak atau diindex; store dan folder
+            uploads tidak berubah
+    """
+    snapshot = search_index.snapshot
+    path = os.path.join(UPLOAD_FOLDER, name)
+    pipeline_version = pipeline.version
+    # Isi folder sebelum upload: snapshot baru hanya dianggap mutakhir jika
+    # scan setelah upload = isi ini + file upload (lihat di bawah)
+    watch_version, folder_files = corpus_watcher.snapshot()
+
+    cached_files = document_store.files()
+    if name in snapshot.filename_index or os.path.exists(path):
+        raise FileExistsError(f"Dokumen {name} sudah ada")
+    for file, (_, h) in cached_files.items():
+        if h == content_hash and os.path.exists(os.path.join(UPLOAD_FOLDER, file)):
+            raise FileExistsError(f"Isi dokumen sama dengan {file}")
+
+    try:
+        raw, tokens, steps = process_file(tmp_path, pipeline)
+    except Exception as e:
+        raise ValueError(f"Gagal membaca {name}: {e}")
+
+    # Vocabulary store hanya bertambah, jadi id token snapshot aktif tetap valid
+    cached_vocab = document_store.terms()
+    vocabulary = Vocabulary(cached_vocab)
+    entry = encode_entry(vocabulary, raw, tokens, steps)
+    key = (content_hash, pipeline_version)
+
+    # Snapshot baru dihitung lengkap sebelum store / folder uploads diubah,
+    # sehingga error di sini tidak meninggalkan file yang sudah diterima
+    doc_tokens = snapshot.tokens.extend(vocabulary, [entry['ids']])
+    file_names = snapshot.file_names + [name]
+    doc_keys = snapshot.doc_keys + [key]
+    version = corpus_fingerprint(
+        [(file, k[0]) for file, k in zip(file_names, doc_keys)], pipeline_version
+    )
+
+    if snapshot.model is None:
+        model = search_index.build_model(doc_tokens, version=version)
+    else:
+        # Snapshot lama tetap utuh untuk request yang sedang berjalan
+        model = snapshot.model.copy()
+        model.add_documents([tokens])
+        model.documents = doc_tokens
+    rankers = update_rankers(snapshot, doc_tokens, version, tokens)
+
+    # File dipindah terakhir di dalam transaksi (rename tidak mengubah
+    # mtime); jika commit gagal, file dikembalikan ke lokasi sementara
+    mtime = os.stat(tmp_path).st_mtime
+    moved = False
+    try:
+        with document_store.transaction():
+            document_store.append_terms(vocabulary.terms, len(cached_vocab))
+            document_store.put_entry(key, entry)
+            # Baris lama (file sudah dihapus dari folder, belum di-rebuild)
+            # dibuang agar file ini tercatat di akhir, sama dengan doc_id-nya
+            document_store.delete_files([name])
+            document_store.put_file(name, mtime, content_hash)
+            os.replace(tmp_path, path)
+            moved = True
+    except BaseException:
+        if moved:
+            os.replace(path, tmp_path)
+        raise
+
+    # Watcher ikut melihat file baru. Perubahan lain di folder yang
+    # tertangkap scan yang sama (mis. file disalin manual) belum masuk
+    # snapshot ini, jadi snapshot hanya ditandai mutakhir jika folder
+    # berisi tepat isi sebelumnya + file upload; selain itu rebuild diminta
+    corpus_watcher.refresh(force=True)
+    new_version, new_files = corpus_watcher.snapshot()
+    # Model fold-in yang mengabaikan term baru juga butuh rebuild
+    source = None
+    if snapshot.source == (watch_version, pipeline_version) and \
+            set(new_files) == set(folder_files) | {(name, mtime)} and \
+            not rankers_need_rebuild(rankers):
+        source = (new_version, pipeline_version)
+    else:
+        index_builder.request()
+
+    return IndexSnapshot(
+        version=version,
+        source=source,
+        model=model,
+        texts=DocumentTexts(document_store, doc_keys, cache=raw_text_cache),
+        tokens=doc_tokens,
+        file_names=file_names,
+        doc_keys=doc_keys,
+        rankers=rankers,
+    )
 
 
 # ======================
 # API: GET DOKUMEN SERVER
 # ======================
-@app.route('/documents')
+@app.route('/documents', methods=['GET'])
 def list_documents():
     files = []
-    for fname in os.listdir(UPLOAD_FOLDER):
-        fpath = os.path.join(UPLOAD_FOLDER, fname)
-        if os.path.isfile(fpath):
-            ext = os.path.splitext(fname)[1]
-            files.append({
-                "id": fname,
-                "name": fname,
-                "type": ext,
-                "status": "Available"
-            })
+    for fname, _ in corpus_watcher.files():
+        ext = os.path.splitext(fname)[1]
+        files.append({
+            "id": fname,
+            "name": fname,
+            "type": ext,
+            "status": "Available"
+        })
     return jsonify(files)
 
+# ======================
+# API: UPLOAD DOKUMEN
+# ======================
+@app.route('/documents', methods=['POST'])
+def upload_document():
+    """
+    Upload satu dokumen (.txt / .docx / .pdf) dan langsung index.
+
+    Body berupa multipart form dengan field `file`, atau isi file mentah
+    dengan nama di query `?filename=`. File ditulis ke disk per chunk
+    sambil di-hash; isi yang sama dengan dokumen lain ditolak (409).
+    """
+    upload = request.files.get('file')
+    if upload is not None:
+        filename, stream = upload.filename, upload.stream
+    else:
+        filename, stream = request.args.get('filename'), request.stream
+
+    name = secure_filename(filename or '')
+    ext = os.path.splitext(name)[1].lower()
+    if not name or ext not in SUPPORTED_EXTENSIONS:
+        return jsonify({"error": f"Supported file types: {sorted(SUPPORTED_EXTENSIONS)}"}), 400
+
+    os.makedirs(UPLOAD_TMP_FOLDER, exist_ok=True)
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+    timer = StageTimer(stage_seconds, 'upload')
+    fd, tmp_path = tempfile.mkstemp(suffix=ext, dir=UPLOAD_TMP_FOLDER)
+    os.close(fd)
+    try:
+        try:
+            with timer.stage('upload'):
+                content_hash, size = save_stream(stream, tmp_path, max_bytes=MAX_UPLOAD_MB * 1024 * 1024)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 413
+
+        # Cold start dibangun dulu (di luar lock apply)
+        with timer.stage('cache_check'):
+            current_snapshot()
+        try:
+            with timer.stage('ingest'):
+                snapshot = index_builder.apply(lambda: ingest_document(name, tmp_path, content_hash))
+        except FileExistsError as e:
+            return jsonify({"error": str(e)}), 409
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 422
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    timer.finish()
+    doc_id = snapshot.filename_index[name]
+    return jsonify({
+        "id": name,
+        "name": name,
+        "type": ext,
+        "status": "Available",
+        "doc_id": doc_id,
+        "size": size,
+        "tokens": len(snapshot.tokens.term_ids(doc_id))
+    }), 201
+
+
+def get_preprocessing_detail(snapshot, doc_id):
+    """Detail preprocessing dokumen dari cache (tanpa menjalankan ulang pipeline)"""
+    vocabulary = snapshot.tokens.vocabulary
+    steps = {name: vocabulary.decode(ids)
+             for name, ids in document_store.get_steps(snapshot.doc_keys[doc_id]).items()}
+    return pipeline.format_steps(snapshot.texts[doc_id], steps, snapshot.tokens[doc_id])
+
+
+# ======================
+# API: DETAIL PREPROCESSING DOKUMEN
+# ======================
+@app.route('/documents/<path:doc_name>/preprocessing')
+def document_preprocessing(doc_name):
+    snapshot = current_snapshot()
+
+    doc_id = snapshot.filename_index.get(doc_name)
+    if doc_id is None:
+        return jsonify({"error": "Document not found"}), 404
+
+    return jsonify({
+        "doc_id": doc_id,
+        "documentName": doc_name,
+        "preprocessing": get_preprocessing_detail(snapshot, doc_id)
+    })
+
 # ======================
 # API: SEARCH QUERY (VSM)
 # ======================
@@ -178,78 +708,297 @@ def search():
          
     query = data["query"].strip()
 
+    model_name = data.get("model", DEFAULT_RANKING_MODEL)
+    if model_name not in RANKING_MODELS:
+        return jsonify({"error": f"model must be one of {sorted(RANKING_MODELS)}"}), 400
+
     # 2. Cek jika query kosong
     if not query:
         return jsonify([])
 
-    # 3. Load & preprocessing dokumen
-    documents_raw, doc_tokens, file_names = load_documents_cached()
+    timer = StageTimer(stage_seconds, 'search')
+
+    # 3. Load & preprocessing dokumen (snapshot index aktif)
+    with timer.stage('cache_check'):
+        snapshot = current_snapshot()
+    documents_raw, doc_tokens, file_names = snapshot.texts, snapshot.tokens, snapshot.file_names
     
     # Pastikan file_names valid
     if not file_names:
         return jsonify({"error": "No documents found"}), 500
 
-    # doc_tokens sudah di-cache di load_documents_cached
+    # doc_tokens sudah di-cache di snapshot (build_snapshot)
 
     # 4. VSM
     # Option 1
     # vsm = VectorSpaceModel(doc_tokens)
 
-    # Option 2
-    # lsi_model = LSIModel(documents_raw, k=2)
+    # Option 2 (LSI): parameter "model": "lsi" -> LSIModel (lsi_model.py)
 
     # Option 3
     # print("===========> doc_tokens", doc_tokens)
     # print("===========> documents_raw", documents_raw)
-    gvsm = GVSMModel(doc_tokens)
 
-
-    # 5. Preprocess query
-    query_tokens = pipeline.process_query(query)
-    query_string = " ".join(query_tokens)
-    query_string = query_string.lower().split() # Tokenize Query Input
-    print("===============>  ", query_string)
+    # 5. Preprocess query (cache per versi pipeline)
+    with timer.stage('query_preprocessing'):
+        query_string = query_terms(query)
 
     # 6. Matching
     # results = vsm.match(query_string)
-    # results = lsi_model.match(query_string)
-    results = gvsm.match(query_string)
+    if data.get("compact"):
+        return search_compact(data, query, query_string, snapshot, timer, model_name)
+
+    # Inverted index: hanya dokumen yang bisa mendapat skor > 0 yang dihitung.
+    # Query yang sama (multiset token) pada index yang sama diambil dari cache
+    with timer.stage('scoring'):
+        results = query_cache.results(
+            results_version(snapshot), query_string, 5,
+            lambda: rank_documents(snapshot, model_name, query_string, 5), model=model_name
+        )
 
     response = []
 
     # 7. Loop hasil
     # print(results)
-    for rank, result in enumerate(results, start=1):
-        doc_id = result["doc_id"]
-        score = result["score"]
-        if doc_id < 0 or doc_id >= len(documents_raw):
-            continue
+    # Detail preprocessing diambil dari cache hasil indexing; dicatat
+    # sebagai satu tahap per request (bukan per hasil)
+    with timer.stage('detail_preprocessing'):
+        for rank, result in enumerate(results, start=1):
+            doc_id = result["doc_id"]
+            score = result["score"]
+            if doc_id < 0 or doc_id >= len(documents_raw):
+                continue
+
+            preprocessing_detail = get_preprocessing_detail(snapshot, doc_id)
+
+            # Ambil nama file
+            current_filename = file_names[doc_id] if doc_id < len(file_names) else "Unknown File"
+
+            response.append({
+                "doc_id": doc_id,
+                "documentName": current_filename,
+                "filename": current_filename,     
+                "similarity": similarity_percent(model_name, score, results),
+                "rank": rank,
+                "preprocessing": preprocessing_detail,
+                
+                # --- PERBAIKAN DI SINI ---
+                # Menambahkan penanda bahwa ini adalah data dari server,
+                # sehingga UI tidak menampilkan logo upload.
+                "source": "server" 
+                # -------------------------
+            })
 
-        doc_text = documents_raw[doc_id]
-        
-        # Jalankan preprocessing detail
-        preprocessing_detail = pipeline.process_document_with_steps(doc_text)
+    return timed_response(response, timer, data)
+
+
+def query_terms(query, pipeline_version=None):
+    """
+    Token query untuk ranking (cache per versi pipeline), lalu lowercase
+    dan split ulang. Dipakai /search dan /search/batch agar query yang
+    sama selalu menghasilkan token dan ranking yang sama.
+    """
+    query_tokens = query_cache.tokens(query, pipeline_version)
+    return " ".join(query_tokens).lower().split()
+
+
+def rank_documents(snapshot, model_name, query_tokens, top_n):
+    """
+    Hasil ranking model yang dipilih untuk snapshot ini
+
+    Args:
+        snapshot (IndexSnapshot): Snapshot index aktif
+        model_name (str): Kunci RANKING_MODELS
+        query_tokens (list): Token query (hasil preprocessing)
+        top_n (int): Jumlah hasil
+
+    Returns:
+        list: [{"doc_id": int, "score": float, ...}, ...] terurut skor menurun
+    """
+    if model_name == 'gvsm':
+        gvsm = snapshot.model
+        return gvsm.match(query_tokens, top_n=top_n,
+                          candidate_ids=gvsm.candidate_documents(query_tokens))
+    # BM25 / TF-IDF: postings terurut impact, berhenti begitu top-k pasti.
+    # LSI: query di-fold-in ke ruang k dimensi, skor = mat-vec N x k
+    return snapshot.rankers[model_name].match(query_tokens, top_n=top_n)
+
+
+def similarity_percent(model_name, score, results):
+    """
+    Skor untuk field "similarity" (persen). Skor BM25 tidak terbatas di
+    [0, 1], jadi ditampilkan relatif terhadap hasil teratas query ini.
+    """
+    if model_name == 'bm25':
+        top_score = results[0]["score"] if results else 0.0
+        score = score / top_score if top_score > 0 else 0.0
+    return round(score * 100, 2)
+
+
+def timed_response(payload, timer, data):
+    """
+    jsonify(payload) dengan tahap 'serialization' tercatat di metrik.
+    Jika request berisi "debug_timings": true, waktu tiap tahap (ms)
+    ikut dikirim; response list dibungkus menjadi {"results": [...]}.
+    """
+    with timer.stage('serialization'):
+        response = jsonify(payload)
+    timings = timer.finish()
+
+    if not data.get("debug_timings"):
+        return response
+    if isinstance(payload, list):
+        payload = {"results": payload}
+    return jsonify({**payload, "debug_timings": timings})
+
+
+def search_compact(data, query, query_tokens, snapshot, timer, model_name=DEFAULT_RANKING_MODEL):
+    """
+    Response ringkas: hanya id, skor dan snippet, dengan cursor pagination.
+    Detail preprocessing diambil terpisah lewat /documents/<name>/preprocessing.
+    """
+    try:
+        limit = int(data.get("limit", DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    offset = 0
+    cursor = data.get("cursor")
+    if cursor:
+        try:
+            offset = decode_cursor(str(cursor), query, snapshot.version)
+        except StaleCursorError as e:
+            return jsonify({"error": str(e)}), 409
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+    # Ambil satu hasil ekstra untuk tahu apakah masih ada halaman berikutnya
+    top_n = offset + limit + 1
+    with timer.stage('scoring'):
+        results = query_cache.results(
+            results_version(snapshot), query_tokens, top_n,
+            lambda: rank_documents(snapshot, model_name, query_tokens, top_n), model=model_name
+        )
+    page = results[offset:offset + limit]
+
+    with timer.stage('snippets'):
+        snippet_terms = tokenizer.process_text(query)
+        response = []
+        for rank, result in enumerate(page, start=offset + 1):
+            doc_id = result["doc_id"]
+            response.append({
+                "doc_id": doc_id,
+                "documentName": snapshot.file_names[doc_id],
+                "similarity": similarity_percent(model_name, result["score"], results),
+                "rank": rank,
+                "snippet": make_snippet(snapshot.texts[doc_id], snippet_terms),
+                "source": "server"
+            })
+
+    next_cursor = None
+    if len(results) > offset + limit:
+        next_cursor = encode_cursor(offset + limit, query, snapshot.version)
+
+    return timed_response({"results": response, "next_cursor": next_cursor}, timer, data)
+
+
+# ======================
+# API: BATCH SEARCH (GVSM)
+# ======================
+@app.route("/search/batch", methods=["POST"])
+def search_batch():
+    """
+    Banyak query dalam satu request. Body: {"queries": [...], "top_n": 5, "model": "gvsm"}
+    Dengan model GVSM semua query dinilai sekaligus dengan GVSMModel.match_batch.
+    """
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data.get("queries"), list):
+        return jsonify({"error": "queries must be a list of strings"}), 400
+
+    queries = data["queries"]
+    if len(queries) > MAX_BATCH_QUERIES:
+        return jsonify({"error": f"At most {MAX_BATCH_QUERIES} queries per request"}), 400
+    if not all(isinstance(q, str) for q in queries):
+        return jsonify({"error": "queries must be a list of strings"}), 400
+
+    try:
+        top_n = max(1, min(int(data.get("top_n", 5)), MAX_PAGE_SIZE))
+    except (TypeError, ValueError):
+        return jsonify({"error": "top_n must be an integer"}), 400
+
+    model_name = data.get("model", DEFAULT_RANKING_MODEL)
+    if model_name not in RANKING_MODELS:
+        return jsonify({"error": f"model must be one of {sorted(RANKING_MODELS)}"}), 400
+
+    timer = StageTimer(stage_seconds, 'search_batch')
+    with timer.stage('cache_check'):
+        snapshot = current_snapshot()
+    file_names = snapshot.file_names
+    if not file_names:
+        return jsonify({"error": "No documents found"}), 500
 
-        # Ambil nama file
-        current_filename = file_names[doc_id] if doc_id < len(file_names) else "Unknown File"
+    gvsm = snapshot.model
+
+    with timer.stage('query_preprocessing'):
+        pipeline_version = pipeline.version
+        query_tokens = [query_terms(q, pipeline_version) for q in queries]
+
+    # Hanya query yang belum ada di cache hasil yang dinilai (satu match_batch)
+    with timer.stage('scoring'):
+        cache_version = results_version(snapshot)
+        batch_results = [query_cache.lookup(cache_version, tokens, top_n, model_name)
+                         for tokens in query_tokens]
+        missing = [i for i, results in enumerate(batch_results) if results is None]
+        if missing:
+            if model_name == 'gvsm':
+                computed = gvsm.match_batch([query_tokens[i] for i in missing], top_n=top_n)
+            else:
+                computed = [rank_documents(snapshot, model_name, query_tokens[i], top_n) for i in missing]
+            for i, results in zip(missing, computed):
+                query_cache.store(cache_version, query_tokens[i], top_n, results, model_name)
+                batch_results[i] = results
 
+    response = []
+    for query, results in zip(queries, batch_results):
         response.append({
-            "doc_id": doc_id,
-            "documentName": current_filename,
-            "filename": current_filename,     
-            "similarity": round(score * 100, 2),
-            "rank": rank,
-            "preprocessing": preprocessing_detail,
-            
-            # --- PERBAIKAN DI SINI ---
-            # Menambahkan penanda bahwa ini adalah data dari server,
-            # sehingga UI tidak menampilkan logo upload.
-            "source": "server" 
-            # -------------------------
+            "query": query,
+            "results": [
+                {
+                    "doc_id": result["doc_id"],
+                    "documentName": file_names[result["doc_id"]],
+                    "similarity": similarity_percent(model_name, result["score"], results),
+                    "rank": rank,
+                    "source": "server"
+                }
+                for rank, result in enumerate(results, start=1)
+            ]
         })
 
-    return jsonify(response)
+    return timed_response({"results": response}, timer, data)
+
+
+# ======================
+# API: METRIK PROMETHEUS
+# ======================
+@app.route("/metrics")
+def prometheus_metrics():
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+
+# ======================
+# API: STATISTIK CACHE
+# ======================
+@app.route("/cache/stats")
+def cache_stats():
+    """Ukuran dan hit rate semua cache di proses ini"""
+    return jsonify({
+        **query_cache.cache_info(),
+        "raw_text": raw_text_cache.cache_info(),
+        "stem": stemmer.cache_info(),
+    })
 
 
 if __name__ == "__main__":
+    corpus_watcher.start()
     app.run(debug=True)
@@ -0,0 +1,74 @@
+"""
+Benchmark throughput GVSMModel: loop match() vs match_batch()
+=============================================================
+
+Korpus dan query sintetis (distribusi term Zipf). Hasil kedua cara
+dipastikan sama (doc_id identik, skor selisih < 1e-9).
+
+Cara menjalankan (dari root repo):
+    python DatMin_Web/Backend/benchmarks/bench_batch.py
+    python DatMin_Web/Backend/benchmarks/bench_batch.py --docs 5000 --queries 1000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from GVSM.gvsm import GVSMModel
+
+
+def zipf_documents(n_docs, vocab_size, mean_length, rng):
+    ranks = np.arange(1, vocab_size + 1)
+    probs = 1.0 / ranks
+    probs /= probs.sum()
+    lengths = rng.poisson(mean_length, size=n_docs) + 1
+    return [[f"t{i}" for i in rng.choice(vocab_size, size=length, p=probs)] for length in lengths]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--docs', type=int, default=2000)
+    parser.add_argument('--vocab', type=int, default=5000)
+    parser.add_argument('--doc-length', type=int, default=60)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--top-n', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    documents = zipf_documents(args.docs, args.vocab, args.doc_length, rng)
+    queries = zipf_documents(args.queries, args.vocab, 3, rng)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = GVSMModel(documents)
+
+    start = time.perf_counter()
+    single = [model.match(q, top_n=args.top_n) for q in queries]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = model.match_batch(queries, top_n=args.top_n)
+    batch_time = time.perf_counter() - start
+
+    for a, b in zip(single, batch):
+        if [r["doc_id"] for r in a] != [r["doc_id"] for r in b] or \
+                any(abs(r["score"] - s["score"]) > 1e-9 for r, s in zip(a, b)):
+            print("(!!) Hasil match_batch berbeda dengan match")
+            sys.exit(1)
+
+    print(f"{args.docs} dokumen, V={model.V}, {args.queries} query, top_n={args.top_n}")
+    print(f"loop match()  : {loop_time:.3f}s ({args.queries / loop_time:.1f} query/s)")
+    print(f"match_batch() : {batch_time:.3f}s ({args.queries / batch_time:.1f} query/s)"
+          f"  speedup {loop_time / batch_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark cold load cache dokumen: pickle lama vs DocumentStore (SQLite)
+========================================================================
+
+Cache sintetis (teks mentah + token ter-encode, format preprocessing_cache.pkl
+terakhir) ditulis sebagai pickle, lalu dimigrasi ke DocumentStore dengan
+DocumentStore.migrate_pickle. Setiap cara dimuat di proses baru (cold) seperti
+saat app.py start:
+- pickle : load_cache lama, seluruh isi (teks, token, tahap) masuk memori
+- store  : files + vocabulary + id token saja; teks mentah dibaca per dokumen
+
+Dilaporkan waktu load dan kenaikan resident memory (VmRSS). Token hasil
+kedua cara dipastikan identik.
+
+Cara menjalankan (dari root repo):
+    python DatMin_Web/Backend/benchmarks/bench_document_store.py
+    python DatMin_Web/Backend/benchmarks/bench_document_store.py --docs 20000 --doc-length 1000
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_batch import zipf_documents
+from cache_utils import DocumentStore, encode_entry
+from token_corpus import TokenCorpus, Vocabulary
+
+PIPELINE_VERSION = "bench"
+
+
+def build_pickle(path, n_docs, vocab_size, doc_length, seed):
+    rng = np.random.default_rng(seed)
+    vocabulary = Vocabulary()
+    files, entries = {}, {}
+    for i, tokens in enumerate(zipf_documents(n_docs, vocab_size, doc_length, rng)):
+        raw = " ".join(tokens)
+        content_hash = hashlib.sha256(raw.encode('utf-8')).hexdigest()
+        files[f"doc{i:06d}.txt"] = (0.0, content_hash)
+        steps = {"tokens": tokens, "removed_stopwords": [], "filtered_tokens": tokens}
+        entries[(content_hash, PIPELINE_VERSION)] = encode_entry(vocabulary, raw, tokens, steps)
+
+    with open(path, 'wb') as f:
+        pickle.dump({'files': files, 'vocab': vocabulary.terms, 'entries': entries}, f)
+
+
+def load_pickle(path):
+    with open(path, 'rb') as f:
+        cache = pickle.load(f)
+    vocabulary = Vocabulary(cache['vocab'])
+    ids = [cache['entries'][(h, PIPELINE_VERSION)]['ids'] for _, h in cache['files'].values()]
+    return cache, TokenCorpus.from_encoded(vocabulary, ids)
+
+
+def load_store(path):
+    store = DocumentStore(path)
+    files = store.files()
+    vocabulary = Vocabulary(store.terms())
+    stored_ids = store.load_ids(PIPELINE_VERSION)
+    ids = [stored_ids[h] for _, h in files.values()]
+    return store, TokenCorpus.from_encoded(vocabulary, ids)
+
+
+def resident_kb():
+    # ru_maxrss ikut terbawa dari proses induk saat fork/exec, jadi pakai
+    # VmRSS saat ini jika tersedia (Linux)
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child(kind, path):
+    """Dijalankan di proses baru: print 'detik kenaikan_rss_kb checksum'"""
+    before = resident_kb()
+    start = time.perf_counter()
+    loaded, corpus = load_pickle(path) if kind == 'pickle' else load_store(path)
+    elapsed = time.perf_counter() - start
+    after = resident_kb()
+    checksum = hashlib.sha256(corpus.ids.tobytes() + corpus.offsets.tobytes()).hexdigest()[:16]
+    print(f"{elapsed} {after - before} {checksum}")
+
+
+def run_child(kind, path):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', kind, path],
+                         check=True, capture_output=True, text=True).stdout.split()
+    return float(out[0]), int(out[1]) / 1024, out[2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--docs', type=int, default=5000)
+    parser.add_argument('--vocab', type=int, default=20000)
+    parser.add_argument('--doc-length', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--child', nargs=2, metavar=('KIND', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    workdir = tempfile.mkdtemp(prefix='bench_store_')
+    try:
+        pickle_path = os.path.join(workdir, 'preprocessing_cache.pkl')
+        store_path = os.path.join(workdir, 'document_store.sqlite3')
+        build_pickle(pickle_path, args.docs, args.vocab, args.doc_length, args.seed)
+        pickle_size = os.path.getsize(pickle_path)
+
+        shutil.copy(pickle_path, pickle_path + '.copy')
+        store = DocumentStore(store_path)
+        store.migrate_pickle(pickle_path + '.copy')
+        store.close()
+
+        pickle_time, pickle_rss, pickle_sum = run_child('pickle', pickle_path)
+        store_time, store_rss, store_sum = run_child('store', store_path)
+        if pickle_sum != store_sum:
+            print("(!!) Token hasil DocumentStore berbeda dengan pickle")
+            sys.exit(1)
+
+        print(f"{args.docs} dokumen, pickle {pickle_size / 2 ** 20:.1f} MB, "
+              f"store {os.path.getsize(store_path) / 2 ** 20:.1f} MB")
+        print(f"pickle : load {pickle_time:.3f}s, +{pickle_rss:.1f} MB RSS")
+        print(f"store  : load {store_time:.3f}s, +{store_rss:.1f} MB RSS"
+              f"  ({pickle_time / store_time:.1f}x lebih cepat, "
+              f"{pickle_rss / max(store_rss, 0.1):.1f}x lebih hemat memori)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark memori & latency GVSMModel: scoring "materialized" vs "factored"
+==========================================================================
+
+Korpus sintetis (distribusi term Zipf, lihat bench_batch.py). Untuk setiap
+ukuran korpus dilaporkan:
+- waktu build model
+- memori index yang tersimpan (nbytes array sparse/dense milik model)
+- puncak alokasi selama build (tracemalloc)
+- latency rata-rata match() dengan candidate pruning
+
+Jika kedua mode dibangun, ranking dipastikan sama dan skor selisih relatif
+< 1e-9. Mode materialized dilewati untuk korpus di atas --max-materialized
+dokumen (S dan transformed_docs tidak muat di memori mesin kecil).
+
+Cara menjalankan (dari root repo):
+    python DatMin_Web/Backend/benchmarks/bench_factored.py
+    python DatMin_Web/Backend/benchmarks/bench_factored.py --sizes 1000 10000 --max-materialized 10000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import scipy.sparse as sp
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from GVSM.gvsm import GVSMModel
+from bench_batch import zipf_documents
+
+
+def index_bytes(model):
+    """Total nbytes array yang disimpan model (tanpa list token dokumen)"""
+    total = 0
+    for value in vars(model).values():
+        if sp.issparse(value):
+            total += value.data.nbytes + value.indices.nbytes + value.indptr.nbytes
+        elif isinstance(value, np.ndarray):
+            total += value.nbytes
+    return total
+
+
+def build(documents, scoring):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = GVSMModel(documents, scoring=scoring)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return model, elapsed, peak
+
+
+def run_queries(model, queries, top_n):
+    results = []
+    start = time.perf_counter()
+    for q in queries:
+        results.append(model.match(q, top_n=top_n, candidate_ids=model.candidate_documents(q)))
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def same_results(a, b):
+    for x, y in zip(a, b):
+        if [r["doc_id"] for r in x] != [r["doc_id"] for r in y]:
+            return False
+        if any(abs(r["score"] - s["score"]) > 1e-9 * max(abs(r["score"]), 1e-12) for r, s in zip(x, y)):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--vocab-per-doc', type=float, default=2.0,
+                        help='ukuran vocabulary = sizes * nilai ini')
+    parser.add_argument('--doc-length', type=int, default=60)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--max-materialized', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    mb = lambda b: b / 2 ** 20
+    print(f"{'N':>7} {'V':>7} {'mode':>12} {'build (s)':>10} {'index (MB)':>11}"
+          f" {'peak (MB)':>10} {'query (ms)':>11}")
+    for n in args.sizes:
+        rng = np.random.default_rng(args.seed)
+        documents = zipf_documents(n, int(n * args.vocab_per_doc), args.doc_length, rng)
+        queries = zipf_documents(args.queries, int(n * args.vocab_per_doc), 3, rng)
+
+        outputs = {}
+        for scoring in ("materialized", "factored"):
+            if scoring == "materialized" and n > args.max_materialized:
+                print(f"{n:>7} {'':>7} {scoring:>12}   (dilewati, > --max-materialized)")
+                continue
+            model, build_time, peak = build(documents, scoring)
+            outputs[scoring], latency = run_queries(model, queries, args.top_n)
+            print(f"{n:>7} {model.V:>7} {scoring:>12} {build_time:>10.2f} {mb(index_bytes(model)):>11.1f}"
+                  f" {mb(peak):>10.1f} {latency * 1e3:>11.2f}")
+            del model
+
+        if len(outputs) == 2 and not same_results(outputs["materialized"], outputs["factored"]):
+            print(f"(!!) Hasil factored berbeda dengan materialized untuk N={n}")
+            sys.exit(1)
+
+    print("Ranking identik pada semua ukuran yang dibandingkan.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark update incremental GVSMModel vs build ulang
+=====================================================
+
+Korpus sintetis (distribusi term Zipf, lihat bench_batch.py). Untuk setiap
+mode scoring dilaporkan waktu build penuh, add_documents satu dokumen dan
+remove_documents satu dokumen (masing-masing pada salinan model). Hasil
+update dibandingkan dengan model yang dibangun ulang dari token yang sama
+(doc_norms dan skor match selisih < 1e-9; dokumen terhapus = dokumen kosong).
+
+Keluar dengan kode 1 jika hasil berbeda, atau jika menambah satu dokumen
+tidak lebih murah dari --max-ratio x waktu build ulang.
+
+Cara menjalankan (dari root repo):
+    python DatMin_Web/Backend/benchmarks/bench_incremental.py
+    python DatMin_Web/Backend/benchmarks/bench_incremental.py --docs 3000 --vocab 20000 --max-ratio 0.1
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from GVSM.gvsm import GVSMModel
+from bench_batch import zipf_documents
+
+
+def timed(fn):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return result, time.perf_counter() - start
+
+
+def same_results(model, reference, queries, top_n):
+    if not np.allclose(model.doc_norms, reference.doc_norms, rtol=1e-9, atol=1e-9):
+        return False
+    for query in queries:
+        got = model.match(query, top_n=top_n)
+        expected = reference.match(query, top_n=top_n)
+        if len(got) != len(expected) or \
+                any(abs(r["score"] - s["score"]) > 1e-9 for r, s in zip(got, expected)):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--docs', type=int, default=3000)
+    parser.add_argument('--vocab', type=int, default=20000)
+    parser.add_argument('--doc-length', type=int, default=60)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--max-ratio', type=float, default=0.25,
+                        help='batas waktu add_documents(1 dokumen) / waktu build ulang')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    documents = zipf_documents(args.docs + 1, args.vocab, args.doc_length, rng)
+    base, extra = documents[:-1], documents[-1]
+    queries = zipf_documents(args.queries, args.vocab, 3, rng)
+
+    failed = False
+    for scoring in ("materialized", "factored"):
+        model, build_time = timed(lambda: GVSMModel(base, scoring=scoring))
+        nnz = model.S.nnz if model.S is not None else 0
+
+        added, add_time = timed(lambda: _add(model, extra))
+        rebuilt, rebuild_time = timed(lambda: GVSMModel(base + [extra], scoring=scoring))
+        removed, remove_time = timed(lambda: _remove(model, 0))
+
+        ratio = add_time / rebuild_time
+        print(f"{scoring:>12}: N={model.doc_count} V={model.V} nnz(S)={nnz}"
+              f"  build {build_time:.3f}s  add 1 dok {add_time:.3f}s ({ratio:.1%} dari build ulang)"
+              f"  remove 1 dok {remove_time:.3f}s")
+
+        if not same_results(added, rebuilt, queries, args.top_n):
+            print(f"(!!) {scoring}: hasil add_documents berbeda dengan build ulang")
+            failed = True
+        emptied, _ = timed(lambda: GVSMModel([[]] + base[1:], scoring=scoring))
+        if not same_results(removed, emptied, queries, args.top_n):
+            print(f"(!!) {scoring}: hasil remove_documents berbeda dengan build ulang")
+            failed = True
+        if ratio > args.max_ratio:
+            print(f"(!!) {scoring}: add_documents tidak lebih murah dari {args.max_ratio:.0%} build ulang")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+def _add(model, tokens):
+    updated = model.copy()
+    updated.add_documents([tokens])
+    return updated
+
+
+def _remove(model, doc_id):
+    updated = model.copy()
+    updated.remove_documents([doc_id])
+    return updated
+
+
+if __name__ == "__main__":
+    main()
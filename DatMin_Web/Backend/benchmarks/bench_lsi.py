@@ -0,0 +1,115 @@
+"""
+Benchmark LSIModel (truncated SVD) vs GVSMModel
+===============================================
+
+Korpus sintetis (distribusi term Zipf, lihat bench_batch.py). Untuk setiap
+ukuran korpus dan setiap k dilaporkan:
+- waktu build model (LSI: bobot TF-IDF + svds)
+- memori index yang tersimpan (nbytes array milik model, lihat bench_factored.py)
+- puncak alokasi selama build (tracemalloc)
+- latency rata-rata match()
+- overlap top-n LSI dengan top-n GVSM (bukan ukuran kualitas: korpus
+  sintetis tidak punya struktur laten, hanya gambaran seberapa jauh
+  ranking berubah)
+
+GVSM memakai mode "materialized" sampai --max-materialized dokumen, di
+atasnya "factored" (seperti run_benchmarks.py).
+
+Cara menjalankan (dari root repo):
+    python DatMin_Web/Backend/benchmarks/bench_lsi.py
+    python DatMin_Web/Backend/benchmarks/bench_lsi.py --sizes 1000 10000 --k 50 100 200
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from GVSM.gvsm import GVSMModel
+from bench_batch import zipf_documents
+from bench_factored import index_bytes
+from lsi_model import LSIModel
+from token_corpus import TokenCorpus
+
+
+def build(factory):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = factory()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return model, elapsed, peak
+
+
+def run_queries(match, queries):
+    results = []
+    start = time.perf_counter()
+    for q in queries:
+        results.append(match(q))
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def overlap(results, reference):
+    """Rata-rata |top-n hasil ∩ top-n referensi| / |top-n referensi|"""
+    ratios = []
+    for got, ref in zip(results, reference):
+        ref_ids = {r["doc_id"] for r in ref}
+        if ref_ids:
+            ratios.append(len(ref_ids & {r["doc_id"] for r in got}) / len(ref_ids))
+    return float(np.mean(ratios)) if ratios else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--k', type=int, nargs='+', default=[50, 100, 200])
+    parser.add_argument('--vocab-per-doc', type=float, default=2.0,
+                        help='ukuran vocabulary = sizes * nilai ini')
+    parser.add_argument('--doc-length', type=int, default=60)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--max-materialized', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    mb = lambda b: b / 2 ** 20
+    print(f"{'N':>7} {'V':>7} {'model':>16} {'build (s)':>10} {'index (MB)':>11}"
+          f" {'peak (MB)':>10} {'query (ms)':>11} {'overlap':>8}")
+    for n in args.sizes:
+        rng = np.random.default_rng(args.seed)
+        vocab_size = int(n * args.vocab_per_doc)
+        corpus = TokenCorpus.from_token_lists(zipf_documents(n, vocab_size, args.doc_length, rng))
+        queries = zipf_documents(args.queries, vocab_size, 3, rng)
+
+        scoring = "materialized" if n <= args.max_materialized else "factored"
+        model, build_time, peak = build(lambda: GVSMModel(corpus, scoring=scoring))
+        reference, latency = run_queries(
+            lambda q: model.match(q, top_n=args.top_n, candidate_ids=model.candidate_documents(q)),
+            queries,
+        )
+        print(f"{n:>7} {model.V:>7} {'gvsm ' + scoring:>16} {build_time:>10.2f}"
+              f" {mb(index_bytes(model)):>11.1f} {mb(peak):>10.1f} {latency * 1e3:>11.2f} {'-':>8}")
+        del model
+
+        for k in args.k:
+            model, build_time, peak = build(lambda: LSIModel(corpus, k=k))
+            results, latency = run_queries(lambda q: model.match(q, top_n=args.top_n), queries)
+            print(f"{n:>7} {model.V:>7} {f'lsi k={k}':>16} {build_time:>10.2f}"
+                  f" {mb(index_bytes(model)):>11.1f} {mb(peak):>10.1f} {latency * 1e3:>11.2f}"
+                  f" {overlap(results, reference):>8.1%}")
+            del model
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Benchmark IndonesianPorterStemmer: aturan terkompilasi (trie) vs aturan lama
+============================================================================
+
+Token diambil dari korpus uploads (tokenizing + stopword filtering seperti
+PreprocessingPipeline), lalu di-stem dengan:
+- LegacyStemmer  : implementasi lama (scan list + sort prefix setiap panggilan)
+- compiled       : implementasi sekarang dengan trie, tanpa cache
+- compiled+cache : implementasi sekarang dengan cache LRU
+
+Hasil ketiganya dipastikan identik sebelum waktu dilaporkan.
+
+Cara menjalankan (dari root repo):
+    python DatMin_Web/Backend/benchmarks/bench_stemmer.py
+    python DatMin_Web/Backend/benchmarks/bench_stemmer.py --include-pdf --max-files 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from filtering import StopwordFilter
+from indonesian_porter_stemmer import IndonesianPorterStemmer
+from ingestion import extract_text
+from tokenizing import Tokenizer
+
+
+class LegacyStemmer(IndonesianPorterStemmer):
+    """Aturan affix versi lama, disalin apa adanya sebagai pembanding"""
+
+    def _remove_particles(self, word):
+        for particle in self.particles:
+            if word.endswith(particle) and len(word) > len(particle) + 2:
+                return word[:-len(particle)]
+        return word
+
+    def _remove_possessives(self, word):
+        for poss in self.possessives:
+            if word.endswith(poss) and len(word) > len(poss) + 2:
+                return word[:-len(poss)]
+        return word
+
+    def _remove_confix(self, word):
+        confixes = [
+            ('ber', 'an'),
+            ('ke', 'an'),
+            ('pe', 'an'),
+            ('per', 'an'),
+            ('me', 'an'),
+        ]
+        for prefix, suffix in confixes:
+            if word.startswith(prefix) and word.endswith(suffix):
+                stem = word[len(prefix):-len(suffix)]
+                if len(stem) >= 2:
+                    return stem
+        return word
+
+    def _remove_suffix(self, word):
+        for suffix in self.suffixes:
+            if word.endswith(suffix) and len(word) > len(suffix) + 2:
+                stem = word[:-len(suffix)]
+                if self._is_valid_stem(stem):
+                    return stem
+        return word
+
+    def _remove_prefix(self, word):
+        sorted_prefixes = sorted(self.prefixes_rules.items(),
+                                 key=lambda x: len(x[0]),
+                                 reverse=True)
+        for prefix, min_stem_length in sorted_prefixes:
+            if word.startswith(prefix):
+                stem = word[len(prefix):]
+                if len(stem) < min_stem_length:
+                    continue
+                if prefix in ['mem', 'men', 'meng', 'meny']:
+                    restored = self._restore_nasal(stem, prefix)
+                    if self._is_valid_stem(restored):
+                        return restored
+                if self._is_valid_stem(stem):
+                    return stem
+        return word
+
+    def _is_valid_stem(self, stem):
+        if len(stem) < 2:
+            return False
+        if not stem.isalpha():
+            return False
+        if stem in self.root_words:
+            return True
+        vowels = set('aiueo')
+        if not any(c in vowels for c in stem):
+            return False
+        return True
+
+
+def load_tokens(uploads, include_pdf=False, max_files=None):
+    tokenizer = Tokenizer()
+    stopword_filter = StopwordFilter()
+    reader = IndonesianPorterStemmer(cache_size=0)
+
+    extensions = {'.txt', '.docx'} | ({'.pdf'} if include_pdf else set())
+    files = [f for f in sorted(os.listdir(uploads))
+             if os.path.splitext(f)[1].lower() in extensions]
+    if max_files:
+        files = files[:max_files]
+
+    tokens = []
+    for file in files:
+        try:
+            text = extract_text(os.path.join(uploads, file), reader)
+        except Exception as e:
+            print(f"(!!) Skip {file}: {e}")
+            continue
+        tokens.extend(stopword_filter.filter_tokens(tokenizer.process_text(text)))
+    return tokens, len(files)
+
+
+def time_stem(stemmer, tokens, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = stemmer.stem_tokens(tokens)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--uploads', default=os.path.join(BACKEND_DIR, 'uploads'))
+    parser.add_argument('--include-pdf', action='store_true',
+                        help='ikut ekstrak PDF (lambat, PyPDF2)')
+    parser.add_argument('--max-files', type=int, default=None)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    tokens, n_files = load_tokens(args.uploads, args.include_pdf, args.max_files)
+    print(f"{len(tokens)} token ({len(set(tokens))} unik) dari {n_files} file")
+
+    legacy_time, legacy_out = time_stem(LegacyStemmer(cache_size=0), tokens, args.repeat)
+    compiled_time, compiled_out = time_stem(IndonesianPorterStemmer(cache_size=0), tokens, args.repeat)
+
+    cached = IndonesianPorterStemmer()
+    cached_time, cached_out = time_stem(cached, tokens, args.repeat)
+
+    if not (legacy_out == compiled_out == cached_out):
+        mismatches = sum(1 for a, b in zip(legacy_out, compiled_out) if a != b)
+        print(f"(!!) Hasil stemming berbeda pada {mismatches} token")
+        sys.exit(1)
+
+    per_token = lambda t: t / max(len(tokens), 1) * 1e6
+    print(f"legacy         : {legacy_time:.3f}s ({per_token(legacy_time):.2f} us/token)")
+    print(f"compiled       : {compiled_time:.3f}s ({per_token(compiled_time):.2f} us/token)"
+          f"  speedup {legacy_time / compiled_time:.2f}x")
+    print(f"compiled+cache : {cached_time:.3f}s ({per_token(cached_time):.2f} us/token)"
+          f"  speedup {legacy_time / cached_time:.2f}x  {cached.cache_info()}")
+    print("Output identik untuk semua token.")
+
+
+if __name__ == "__main__":
+    main()
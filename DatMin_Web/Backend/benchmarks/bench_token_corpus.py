@@ -0,0 +1,106 @@
+"""
+Benchmark TokenCorpus (id int32 + offsets) vs list of list str
+==============================================================
+
+Korpus sintetis (distribusi term Zipf, lihat bench_batch.py). Dilaporkan:
+- memori per token (tracemalloc, termasuk vocabulary)
+- waktu pickle load (seperti cache_utils.load_cache saat startup)
+- waktu build GVSMModel dari kedua representasi
+
+Model dari kedua representasi dipastikan identik (vocab, TF, norma).
+
+Cara menjalankan (dari root repo):
+    python DatMin_Web/Backend/benchmarks/bench_token_corpus.py
+    python DatMin_Web/Backend/benchmarks/bench_token_corpus.py --docs 5000 --doc-length 400
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from GVSM.gvsm import GVSMModel
+from bench_batch import zipf_documents
+from token_corpus import TokenCorpus
+
+
+def measure(build):
+    """(objek, byte yang dialokasikan) untuk hasil build()"""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def pickle_load_time(obj, repeat):
+    blob = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pickle.loads(blob)
+        best = min(best, time.perf_counter() - start)
+    return best, len(blob)
+
+
+def build_time(documents):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = GVSMModel(documents)
+    return model, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--docs', type=int, default=3000)
+    parser.add_argument('--vocab', type=int, default=20000)
+    parser.add_argument('--doc-length', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    token_lists, list_bytes = measure(lambda: zipf_documents(args.docs, args.vocab, args.doc_length, rng))
+    corpus, corpus_bytes = measure(lambda: TokenCorpus.from_token_lists(token_lists))
+    # String term dipinjam dari token_lists (tidak teralokasi ulang), hitung manual
+    corpus_bytes += sum(sys.getsizeof(term) for term in corpus.vocabulary.terms)
+    n_tokens = len(corpus.ids)
+
+    list_load, list_size = pickle_load_time(token_lists, args.repeat)
+    # Layout cache: list term + array id (lihat app.build_snapshot)
+    corpus_load, corpus_size = pickle_load_time(
+        (corpus.vocabulary.terms, corpus.ids, corpus.offsets), args.repeat
+    )
+
+    list_model, list_build = build_time(token_lists)
+    corpus_model, corpus_build = build_time(corpus)
+    if (list_model.vocab != corpus_model.vocab
+            or (list_model.doc_vectors != corpus_model.doc_vectors).nnz
+            or not np.array_equal(list_model.doc_norms, corpus_model.doc_norms)):
+        print("(!!) Model dari TokenCorpus berbeda dengan model dari list token")
+        sys.exit(1)
+
+    print(f"{args.docs} dokumen, {n_tokens} token, {len(corpus.vocabulary)} term unik")
+    print(f"{'':>12} {'B/token':>8} {'pickle MB':>10} {'load (s)':>9} {'GVSM build (s)':>15}")
+    print(f"{'list[str]':>12} {list_bytes / n_tokens:>8.1f} {list_size / 2 ** 20:>10.1f}"
+          f" {list_load:>9.3f} {list_build:>15.2f}")
+    print(f"{'TokenCorpus':>12} {corpus_bytes / n_tokens:>8.1f} {corpus_size / 2 ** 20:>10.1f}"
+          f" {corpus_load:>9.3f} {corpus_build:>15.2f}")
+    print(f"memori {list_bytes / corpus_bytes:.1f}x lebih kecil, load {list_load / corpus_load:.1f}x"
+          f" lebih cepat, build {list_build / corpus_build:.1f}x lebih cepat")
+
+
+if __name__ == "__main__":
+    main()
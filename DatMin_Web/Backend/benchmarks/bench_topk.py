@@ -0,0 +1,94 @@
+"""
+Benchmark seleksi top-k GVSMModel.match: loop Python lama vs rank_top_k (NumPy)
+===============================================================================
+
+Skor acak (sebagian nol, sebagian seri, sebagian > 1.0) dengan berbagai
+ukuran korpus. Hasil kedua versi dipastikan identik, termasuk urutan
+dokumen dengan skor seri.
+
+Cara menjalankan (dari root repo):
+    python DatMin_Web/Backend/benchmarks/bench_topk.py
+    python DatMin_Web/Backend/benchmarks/bench_topk.py --sizes 1000 100000 --top-n 10
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from GVSM.gvsm import rank_top_k
+
+
+def legacy_top_k(scores, mapping_back, top_n):
+    """Ekor match() versi lama, disalin apa adanya sebagai pembanding"""
+    results = []
+    for i, score in enumerate(scores):
+        final_score = min(float(score), 1.0)
+        if final_score > 0.0001:
+            results.append((mapping_back[i], final_score))
+
+    results.sort(key=lambda x: -x[1])
+    if top_n:
+        results = results[:top_n]
+    return results
+
+
+def vectorized_top_k(scores, mapping_back, top_n):
+    positions, values = rank_top_k(scores, top_n)
+    ids = positions if mapping_back is None else mapping_back[positions]
+    return [(int(i), float(v)) for i, v in zip(ids, values)]
+
+
+def make_scores(n, rng):
+    scores = rng.random(n)
+    scores[rng.random(n) < 0.5] = 0.0                    # banyak dokumen tanpa term query
+    scores = np.round(scores, 3)                          # memunculkan skor seri
+    scores[rng.integers(0, n, size=max(1, n // 1000))] = 1.0000001  # floating error > 1
+    return scores
+
+
+def best_time(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--top-n', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'N':>9} {'legacy (ms)':>12} {'numpy (ms)':>11} {'speedup':>8}")
+    for n in args.sizes:
+        scores = make_scores(n, rng)
+
+        # Tanpa candidate_ids (posisi = doc_id) dan dengan candidate_ids acak
+        candidates = np.sort(rng.choice(n * 2, size=n, replace=False))
+        for mapping_back in (None, candidates):
+            expected = legacy_top_k(scores, mapping_back if mapping_back is not None else range(n), args.top_n)
+            actual = vectorized_top_k(scores, mapping_back, args.top_n)
+            if expected != actual:
+                print(f"(!!) Hasil berbeda untuk N={n}")
+                sys.exit(1)
+
+        legacy = best_time(lambda: legacy_top_k(scores, range(n), args.top_n), args.repeat)
+        vectorized = best_time(lambda: vectorized_top_k(scores, None, args.top_n), args.repeat)
+        print(f"{n:>9} {legacy * 1e3:>12.3f} {vectorized * 1e3:>11.3f} {legacy / vectorized:>7.1f}x")
+
+    print("Output identik untuk semua ukuran.")
+
+
+if __name__ == "__main__":
+    main()
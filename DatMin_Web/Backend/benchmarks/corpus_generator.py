@@ -0,0 +1,196 @@
+"""
+Generator korpus sintetis Bahasa Indonesia untuk benchmark
+==========================================================
+
+Kata dasar dipilih dengan distribusi Zipf (kata dasar nyata yang umum
+di dokumen uploads, ditambah kata dasar sintetis dari suku kata KV),
+lalu diberi imbuhan seperti teks asli sehingga stemmer ikut bekerja:
+- prefix meN- (dengan peluluhan: pakai -> memakai, tulis -> menulis,
+  kirim -> mengirim, sapu -> menyapu), ber-, di-, ter-, peN-, se-
+- suffix -kan, -an, -i, konfiks ke-an, peN-an, per-an, ber-an
+- partikel -lah, -kah, -pun dan possessive -nya, -ku, -mu
+Stopword disisipkan di antara kata, kalimat diberi huruf kapital dan
+tanda baca sehingga Tokenizer dan StopwordFilter juga teruji.
+
+Hasil deterministik untuk seed yang sama.
+
+Cara menjalankan (contoh dokumen):
+    python DatMin_Web/Backend/benchmarks/corpus_generator.py --docs 3
+"""
+
+import argparse
+
+import numpy as np
+
+# Kata dasar nyata (urutan kira-kira dari yang paling sering)
+ROOT_WORDS = [
+    'data', 'sistem', 'guna', 'ajar', 'didik', 'teknologi', 'informasi',
+    'kembang', 'proses', 'hasil', 'laku', 'bangun', 'jaring', 'aman',
+    'kelola', 'analisis', 'model', 'hitung', 'ukur', 'tuju', 'dasar',
+    'baru', 'buat', 'kerja', 'pakai', 'tulis', 'baca', 'kirim', 'simpan',
+    'cari', 'pilih', 'atur', 'bantu', 'dukung', 'tingkat', 'ubah', 'tentu',
+    'ambil', 'beri', 'jalan', 'temu', 'bentuk', 'lihat', 'dengar', 'tanya',
+    'jawab', 'pikir', 'rasa', 'tahu', 'kenal', 'latih', 'uji', 'nilai',
+    'rancang', 'terap', 'olah', 'sebar', 'lindung', 'serang', 'pantau',
+    'sehat', 'obat', 'rawat', 'sakit', 'tanam', 'panen', 'pasar', 'jual',
+    'beli', 'bayar', 'modal', 'untung', 'rugi', 'tukar', 'harga', 'biaya',
+    'sekolah', 'guru', 'murid', 'kelas', 'buku', 'ilmu', 'teliti', 'kaji',
+    'tata', 'hukum', 'atur', 'putus', 'pimpin', 'wakil', 'pilih', 'suara',
+    'kota', 'desa', 'rumah', 'jalan', 'air', 'tanah', 'hutan', 'laut',
+    'iklim', 'cuaca', 'panas', 'hujan', 'energi', 'listrik', 'mesin',
+    'komputer', 'program', 'kode', 'aplikasi', 'layan', 'akses', 'sandi',
+    'kunci', 'pesan', 'sambung', 'hubung', 'gabung', 'pisah', 'bagi',
+    'kumpul', 'susun', 'urut', 'banding', 'beda', 'sama', 'ganti', 'tambah',
+    'kurang', 'kali', 'angka', 'huruf', 'kata', 'kalimat', 'bahasa',
+    'budaya', 'seni', 'musik', 'main', 'lari', 'renang', 'olahraga',
+    'makan', 'minum', 'masak', 'tidur', 'duduk', 'diri', 'pindah', 'datang',
+    'pergi', 'pulang', 'tinggal', 'hidup', 'mati', 'lahir', 'tumbuh',
+    'sel', 'gen', 'darah', 'jantung', 'otak', 'saraf', 'tulang', 'kulit',
+    'sampah', 'limbah', 'cemar', 'bersih', 'rusak', 'baik', 'besar',
+    'kecil', 'tinggi', 'rendah', 'cepat', 'lambat', 'kuat', 'lemah',
+    'mudah', 'sulit', 'penting', 'utama', 'khusus', 'umum', 'luas', 'sempit',
+]
+
+STOPWORDS = [
+    'yang', 'dan', 'di', 'ke', 'dari', 'untuk', 'dengan', 'pada', 'dalam',
+    'ini', 'itu', 'adalah', 'akan', 'juga', 'atau', 'tidak', 'dapat',
+    'sebagai', 'oleh', 'karena', 'secara', 'sehingga', 'telah', 'lebih',
+]
+
+VOWELS = set('aeiou')
+SYLLABLES = [c + v for c in 'bcdfghjklmnprstwy' for v in 'aiueo']
+
+
+def men_prefix(root, base='me'):
+    """Prefix meN- / peN- dengan peluluhan huruf awal kata dasar"""
+    first = root[0]
+    if first in 'pb':
+        return base + 'm' + (root[1:] if first == 'p' else root)
+    if first in 'td':
+        return base + 'n' + (root[1:] if first == 't' else root)
+    if first in 'cjz':
+        return base + 'n' + root
+    if first == 's':
+        return base + 'ny' + root[1:]
+    if first == 'k':
+        return base + 'ng' + root[1:]
+    if first in VOWELS or first in 'gh':
+        return base + 'ng' + root
+    return base + root
+
+
+# (nama bentuk, fungsi kata dasar -> kata berimbuhan)
+AFFIX_FORMS = [
+    ('meN-', men_prefix),
+    ('meN-kan', lambda r: men_prefix(r) + 'kan'),
+    ('meN-i', lambda r: men_prefix(r) + 'i'),
+    ('ber-', lambda r: 'ber' + r),
+    ('di-', lambda r: 'di' + r),
+    ('di-kan', lambda r: 'di' + r + 'kan'),
+    ('ter-', lambda r: 'ter' + r),
+    ('peN-', lambda r: men_prefix(r, 'pe')),
+    ('peN-an', lambda r: men_prefix(r, 'pe') + 'an'),
+    ('per-an', lambda r: 'per' + r + 'an'),
+    ('ke-an', lambda r: 'ke' + r + 'an'),
+    ('ber-an', lambda r: 'ber' + r + 'an'),
+    ('se-', lambda r: 'se' + r),
+    ('-an', lambda r: r + 'an'),
+    ('-kan', lambda r: r + 'kan'),
+    ('-nya', lambda r: r + 'nya'),
+    ('-lah', lambda r: r + 'lah'),
+    ('-kah', lambda r: r + 'kah'),
+    ('-pun', lambda r: r + 'pun'),
+    ('-ku', lambda r: r + 'ku'),
+    ('-mu', lambda r: r + 'mu'),
+]
+
+
+class IndonesianCorpusGenerator:
+    """
+    Args:
+        vocab_size (int): Jumlah kata dasar (nyata + sintetis)
+        affix_rate (float): Peluang sebuah kata diberi imbuhan
+        stopword_rate (float): Peluang menyisipkan stopword sebelum kata
+        zipf_s (float): Eksponen distribusi Zipf kata dasar
+        seed (int): Seed generator acak
+    """
+
+    def __init__(self, vocab_size=5000, affix_rate=0.45, stopword_rate=0.3, zipf_s=1.0, seed=42):
+        self.rng = np.random.default_rng(seed)
+        self.affix_rate = affix_rate
+        self.stopword_rate = stopword_rate
+        self.roots = self._build_roots(vocab_size)
+
+        ranks = np.arange(1, len(self.roots) + 1, dtype=np.float64)
+        probs = ranks ** -zipf_s
+        self.root_probs = probs / probs.sum()
+
+    def _build_roots(self, vocab_size):
+        roots = list(dict.fromkeys(ROOT_WORDS))[:vocab_size]
+        seen = set(roots)
+        while len(roots) < vocab_size:
+            n_syllables = self.rng.integers(2, 4)
+            word = ''.join(SYLLABLES[i] for i in self.rng.integers(0, len(SYLLABLES), n_syllables))
+            if self.rng.random() < 0.3:
+                word += 'ng' if self.rng.random() < 0.5 else 'r'
+            if word not in seen:
+                seen.add(word)
+                roots.append(word)
+        return roots
+
+    def words(self, n):
+        """n kata (kata dasar Zipf + imbuhan + stopword), huruf kecil"""
+        roots = self.rng.choice(len(self.roots), size=n, p=self.root_probs)
+        affixed = self.rng.random(n) < self.affix_rate
+        forms = self.rng.integers(0, len(AFFIX_FORMS), n)
+        stops = self.rng.random(n) < self.stopword_rate
+        stopword_ids = self.rng.integers(0, len(STOPWORDS), n)
+
+        words = []
+        for i in range(n):
+            if stops[i]:
+                words.append(STOPWORDS[stopword_ids[i]])
+            root = self.roots[roots[i]]
+            words.append(AFFIX_FORMS[forms[i]][1](root) if affixed[i] else root)
+        return words
+
+    def document(self, length):
+        """Satu dokumen ~length kata, dalam kalimat ber-tanda baca"""
+        words = self.words(length)
+        sentences = []
+        start = 0
+        while start < len(words):
+            end = start + int(self.rng.integers(6, 18))
+            sentence = words[start:end]
+            sentence[0] = sentence[0].capitalize()
+            sentences.append(' '.join(sentence) + ('.' if self.rng.random() < 0.9 else '?'))
+            start = end
+        return ' '.join(sentences)
+
+    def documents(self, n_docs, mean_length=120):
+        """List teks dokumen, panjang ~ Poisson(mean_length)"""
+        lengths = self.rng.poisson(mean_length, size=n_docs) + 1
+        return [self.document(int(length)) for length in lengths]
+
+    def queries(self, n_queries, mean_length=3):
+        """List teks query pendek (tanpa tanda baca)"""
+        lengths = self.rng.poisson(mean_length - 1, size=n_queries) + 1
+        return [' '.join(self.words(int(length))) for length in lengths]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--docs', type=int, default=3)
+    parser.add_argument('--doc-length', type=int, default=60)
+    parser.add_argument('--vocab', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    generator = IndonesianCorpusGenerator(vocab_size=args.vocab, seed=args.seed)
+    for text in generator.documents(args.docs, args.doc_length):
+        print(text)
+        print()
+
+
+if __name__ == "__main__":
+    main()
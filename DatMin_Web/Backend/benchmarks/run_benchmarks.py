@@ -0,0 +1,293 @@
+"""
+Benchmark skala seluruh tahap retrieval (korpus sintetis Bahasa Indonesia)
+==========================================================================
+
+Untuk setiap ukuran korpus (default 1k, 10k, 100k dokumen dari
+corpus_generator.py) diukur terpisah:
+- tokenize   : Tokenizer.process_text
+- filter     : StopwordFilter.filter_tokens
+- stem       : IndonesianPorterStemmer.stem_tokens (stemmer baru, cache kosong)
+- gvsm_build : GVSMModel dari TokenCorpus (seperti app.build_snapshot)
+- gvsm_match : candidate_documents + match per query (seperti /search)
+- vsm_build  : VectorSpaceModel dari token list
+- vsm_match  : VectorSpaceModel.match per query
+- bm25_build : BM25Model dari TokenCorpus (postings terurut impact)
+- bm25_match : BM25Model.match top-5 per query (dengan pruning)
+- tfidf_match: BM25Model(weighting="tfidf").match top-5 per query
+
+GVSM memakai mode "materialized" sampai --materialized-max-docs dokumen,
+di atasnya "factored" (S dan transformed_docs tidak muat di memori).
+VectorSpaceModel (inverted index, term-at-a-time) dijalankan sampai
+--vsm-max-docs dokumen; ukuran di atasnya dicatat "skipped".
+
+Hasil berupa JSON (stdout, atau --output). Dengan --compare BASELINE,
+waktu tiap tahap dibandingkan dengan hasil tersimpan dan tahap yang lebih
+lambat dari --threshold ditandai REGRESSION (exit code 1).
+
+Cara menjalankan (dari root repo):
+    python DatMin_Web/Backend/benchmarks/run_benchmarks.py --output baseline.json
+    python DatMin_Web/Backend/benchmarks/run_benchmarks.py --sizes 1000 10000 --compare baseline.json
+    python DatMin_Web/Backend/benchmarks/run_benchmarks.py --current new.json --compare baseline.json
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import scipy
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from GVSM.gvsm import GVSMModel
+from corpus_generator import IndonesianCorpusGenerator
+from filtering import StopwordFilter
+from indonesian_porter_stemmer import IndonesianPorterStemmer
+from token_corpus import TokenCorpus
+from tokenizing import Tokenizer
+from vector_space_model import VectorSpaceModel
+from bm25 import BM25Model
+
+RESULT_FORMAT_VERSION = 1
+STAGES = ("tokenize", "filter", "stem", "gvsm_build", "gvsm_match", "vsm_build", "vsm_match",
+          "bm25_build", "bm25_match", "tfidf_match")
+
+
+def timed(fn):
+    """(hasil fn(), detik); output print dari model dibuang"""
+    gc.collect()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+    return result, elapsed
+
+
+def best_of(fn, repeat):
+    """Waktu terbaik dari beberapa kali jalan (tahap murah rentan noise)"""
+    best = None
+    for _ in range(repeat):
+        result, seconds = timed(fn)
+        best = seconds if best is None else min(best, seconds)
+    return result, best
+
+
+def stage(seconds, items, unit):
+    return {"seconds": seconds, "items": items, "unit": unit,
+            "per_item_us": seconds / items * 1e6 if items else 0.0}
+
+
+def match_stage(match, queries):
+    """Waktu per query (p50 / p95) selain total"""
+    latencies = []
+    for query in queries:
+        _, elapsed = timed(lambda: match(query))
+        latencies.append(elapsed)
+    result = stage(sum(latencies), len(queries), "query")
+    result["p50_ms"] = float(np.percentile(latencies, 50)) * 1000
+    result["p95_ms"] = float(np.percentile(latencies, 95)) * 1000
+    return result
+
+
+def postings_read_ratio(ranker, queries, top_n=5):
+    """Bagian postings term query yang dibaca top_k dengan pruning"""
+    pruned = sum(ranker.top_k(query, top_n)[2] for query in queries)
+    full = sum(ranker.top_k(query, top_n, prune=False)[2] for query in queries)
+    return pruned / full if full else 0.0
+
+
+def run_size(n_docs, args):
+    generator = IndonesianCorpusGenerator(vocab_size=args.vocab, seed=args.seed)
+    texts = generator.documents(n_docs, args.doc_length)
+    query_texts = generator.queries(args.queries)
+
+    tokenizer = Tokenizer()
+    stopword_filter = StopwordFilter()
+    results = {}
+
+    tokens, seconds = best_of(lambda: [tokenizer.process_text(text) for text in texts], args.repeat)
+    results["tokenize"] = stage(seconds, n_docs, "doc")
+    n_tokens = sum(len(doc) for doc in tokens)
+
+    filtered, seconds = best_of(lambda: [stopword_filter.filter_tokens(doc) for doc in tokens],
+                                args.repeat)
+    results["filter"] = stage(seconds, n_docs, "doc")
+
+    def stem_all():
+        # Stemmer baru setiap kali: cache stem mulai kosong seperti indexing awal
+        stemmer = IndonesianPorterStemmer()
+        return stemmer, [stemmer.stem_tokens(doc) for doc in filtered]
+
+    (stemmer, stemmed), seconds = best_of(stem_all, args.repeat)
+    results["stem"] = stage(seconds, n_docs, "doc")
+    del tokens, filtered
+
+    queries = [stemmer.stem_tokens(stopword_filter.filter_tokens(tokenizer.process_text(q)))
+               for q in query_texts]
+
+    scoring = "materialized" if n_docs <= args.materialized_max_docs else "factored"
+    corpus = TokenCorpus.from_token_lists(stemmed)
+    model, seconds = timed(lambda: GVSMModel(corpus, scoring=scoring))
+    results["gvsm_build"] = stage(seconds, n_docs, "doc")
+    results["gvsm_build"]["scoring"] = scoring
+
+    def gvsm_match(query):
+        return model.match(query, candidate_ids=model.candidate_documents(query))
+
+    results["gvsm_match"] = match_stage(gvsm_match, queries)
+    results["gvsm_match"]["scoring"] = scoring
+    vocabulary = model.V
+    del model
+
+    bm25, seconds = timed(lambda: BM25Model(corpus))
+    results["bm25_build"] = stage(seconds, n_docs, "doc")
+    for name, ranker in (("bm25_match", bm25), ("tfidf_match", BM25Model(corpus, weighting="tfidf"))):
+        results[name] = match_stage(lambda query: ranker.match(query, top_n=5), queries)
+        results[name]["postings_read"] = postings_read_ratio(ranker, queries)
+    del bm25, ranker, corpus
+
+    if n_docs <= args.vsm_max_docs:
+        vsm, seconds = timed(lambda: VectorSpaceModel(stemmed))
+        results["vsm_build"] = stage(seconds, n_docs, "doc")
+        vsm_queries = [" ".join(q) for q in queries[:args.vsm_queries or None]]
+        results["vsm_match"] = match_stage(vsm.match, vsm_queries)
+        del vsm
+    else:
+        results["vsm_build"] = results["vsm_match"] = {"skipped": f"docs > {args.vsm_max_docs}"}
+
+    results["corpus"] = {"docs": n_docs, "tokens": n_tokens, "vocabulary": vocabulary,
+                         "queries": len(queries)}
+    return results
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(current, baseline, threshold, min_seconds):
+    """
+    Bandingkan dua hasil benchmark
+
+    Returns:
+        list: (size, stage, baseline_s, current_s, ratio, status)
+    """
+    rows = []
+    for size, stages in current["results"].items():
+        base_stages = baseline["results"].get(size)
+        if base_stages is None:
+            continue
+        for name in STAGES:
+            cur, base = stages.get(name, {}), base_stages.get(name, {})
+            if "seconds" not in cur or "seconds" not in base:
+                continue
+            if cur.get("scoring") != base.get("scoring") or cur["items"] != base["items"]:
+                rows.append((size, name, base["seconds"], cur["seconds"], None, "incomparable"))
+                continue
+            ratio = cur["seconds"] / base["seconds"] if base["seconds"] > 0 else float("inf")
+            slower = cur["seconds"] - base["seconds"]
+            if ratio > 1 + threshold and slower > min_seconds:
+                status = "REGRESSION"
+            elif ratio < 1 - threshold and -slower > min_seconds:
+                status = "faster"
+            else:
+                status = "ok"
+            rows.append((size, name, base["seconds"], cur["seconds"], ratio, status))
+    return rows
+
+
+def print_table(report, out):
+    for size, stages in report["results"].items():
+        corpus = stages.get("corpus", {})
+        print(f"\n{size} dokumen ({corpus.get('tokens')} token, V={corpus.get('vocabulary')})", file=out)
+        for name in STAGES:
+            result = stages.get(name, {})
+            if "seconds" not in result:
+                print(f"  {name:<11} {result.get('skipped', '-')}", file=out)
+                continue
+            line = f"  {name:<11} {result['seconds']:>9.3f}s  {result['per_item_us']:>12.1f} us/{result['unit']}"
+            if "p50_ms" in result:
+                line += f"  p50 {result['p50_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms"
+            if "postings_read" in result:
+                line += f"  postings {result['postings_read']:.1%}"
+            if "scoring" in result:
+                line += f"  [{result['scoring']}]"
+            print(line, file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--doc-length', type=int, default=120)
+    parser.add_argument('--vocab', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--vsm-queries', type=int, default=None,
+                        help='Jumlah query untuk vsm_match (default semua query)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Jumlah ulangan tahap tokenize / filter / stem (diambil yang tercepat)')
+    parser.add_argument('--vsm-max-docs', type=int, default=100000)
+    parser.add_argument('--materialized-max-docs', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Tulis hasil JSON ke file ini (default stdout)')
+    parser.add_argument('--current', help='Pakai hasil JSON ini alih-alih menjalankan benchmark')
+    parser.add_argument('--compare', metavar='BASELINE', help='Hasil JSON pembanding')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Tahap yang lebih lambat dari (1 + threshold) x baseline = regresi')
+    parser.add_argument('--min-seconds', type=float, default=0.05,
+                        help='Selisih waktu minimum agar dianggap regresi (abaikan noise)')
+    args = parser.parse_args()
+
+    if args.current:
+        with open(args.current) as f:
+            report = json.load(f)
+    else:
+        report = {
+            "format": RESULT_FORMAT_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "environment": environment(),
+            "config": {key: value for key, value in vars(args).items()
+                       if key not in ("output", "current", "compare", "threshold", "min_seconds")},
+            "results": {},
+        }
+        for n_docs in args.sizes:
+            print(f"Menjalankan {n_docs} dokumen...", file=sys.stderr)
+            report["results"][str(n_docs)] = run_size(n_docs, args)
+            if args.output:
+                # Ditulis ulang setiap ukuran selesai: hasil parsial tetap tersimpan
+                with open(args.output, 'w') as f:
+                    json.dump(report, f, indent=2)
+
+        if not args.output:
+            json.dump(report, sys.stdout, indent=2)
+            print()
+
+    print_table(report, sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold, args.min_seconds)
+        print(f"\nDibandingkan dengan {args.compare} (threshold {args.threshold:.0%}):", file=sys.stderr)
+        for size, name, base, cur, ratio, status in rows:
+            ratio_text = f"{ratio:6.2f}x" if ratio is not None else "     -"
+            print(f"  {size:>7} {name:<11} {base:>9.3f}s -> {cur:>9.3f}s {ratio_text}  {status}",
+                  file=sys.stderr)
+        if any(row[-1] == "REGRESSION" for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+import math
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from token_corpus import TokenCorpus
+
+
+# Cara menggunakan BM25Model
+
+# ==========================================================
+# from bm25 import BM25Model
+
+# bm25 = BM25Model(doc_tokens)                       # TokenCorpus atau list token list
+# tfidf = BM25Model(doc_tokens, weighting="tfidf")   # cosine TF-IDF
+# bm25.match(query_tokens, top_n=5)   -> [{"doc_id": 3, "score": 7.41}, ...]
+# bm25.top_k(query_tokens, 5)         -> (doc_ids, scores, postings_read)
+# ==========================================================
+
+# Skema bobot yang didukung:
+# - "bm25"  : Okapi BM25 (idf versi Lucene, selalu > 0), skor tidak terbatas
+# - "tfidf" : cosine TF-IDF dengan tf log (1 + ln tf) dan idf ln(1 + N / df), skor di [0, 1]
+WEIGHTINGS = ("bm25", "tfidf")
+
+# Ukuran blok postings pertama yang dibaca per term; blok berikutnya
+# dua kali lipat, sehingga query yang bisa berhenti cepat hanya membaca
+# sedikit postings dan query yang tidak bisa dipangkas tidak membayar
+# overhead pengecekan ambang terlalu sering
+FIRST_BLOCK = 64
+
+# Toleransi relatif untuk perbandingan dengan ambang (urutan penjumlahan
+# float berbeda antara akumulator parsial dan skor akhir)
+SCORE_EPSILON = 1e-9
+
+
+class BM25Model:
+    """
+    Ranking BM25 / TF-IDF dengan postings terurut impact
+    ----------------------------------------------------
+    Bobot setiap pasangan (term, dokumen) dihitung sekali saat build
+    (impact). Skor dokumen = sum(bobot_query[t] * impact[t, d]).
+
+    Disimpan dua layout postings yang berbagi indptr (CSC, N x V):
+    - postings      : per term terurut doc_id, untuk akses acak skor
+                      dokumen kandidat
+    - impact_docs / impact_values : per term terurut impact menurun
+
+    top_k membaca postings terurut impact blok demi blok, dimulai dari term
+    dengan kontribusi maksimum terbesar. Setelah setiap blok, batas atas
+    skor dokumen yang belum pernah terlihat adalah sum(bobot_query[t] *
+    impact blok berikutnya[t]). Begitu skor parsial ke-k melewati batas itu
+    (ide ambang MaxScore / WAND), tidak ada dokumen baru yang bisa masuk
+    top-k: sisa postings tidak dibaca, dan hanya dokumen yang skor
+    parsialnya masih bisa mencapai ambang dihitung lengkap lewat akses acak.
+    Hasilnya identik dengan scoring penuh (skor menurun, seri diurutkan
+    doc_id menaik).
+
+    Args:
+        documents: TokenCorpus atau list token list (hasil preprocessing)
+        weighting (str): "bm25" atau "tfidf" (lihat WEIGHTINGS)
+        k1 (float): Saturasi tf BM25
+        b (float): Normalisasi panjang dokumen BM25
+    """
+
+    def __init__(self, documents, weighting="bm25", k1=1.2, b=0.75):
+        if weighting not in WEIGHTINGS:
+            raise ValueError(f"weighting must be one of {WEIGHTINGS}, got {weighting!r}")
+        if not isinstance(documents, TokenCorpus):
+            documents = TokenCorpus.from_token_lists(documents)
+
+        self.documents = documents
+        self.weighting = weighting
+        self.k1 = k1
+        self.b = b
+
+        # Vocabulary bisa bertambah setelah model dibangun (dipakai bersama);
+        # term dengan id >= V tidak dikenal model ini
+        self.vocabulary = documents.vocabulary
+        self.V = len(self.vocabulary)
+        self.doc_count = len(documents)
+
+        lengths = documents.lengths()
+        rows = np.repeat(np.arange(self.doc_count, dtype=np.int64), lengths)
+        tf = csr_matrix(
+            (np.ones(len(documents.ids), dtype=np.float64), (rows, documents.ids)),
+            shape=(self.doc_count, self.V),
+        )
+        tf.sum_duplicates()
+
+        self.df = np.bincount(tf.indices, minlength=self.V)
+        self.idf = self._idf(self.df)
+        self.doc_lengths = lengths
+        self.avg_doc_length = float(lengths.mean()) if self.doc_count else 0.0
+
+        tf.data = self._impacts(tf)
+        self.postings = tf.tocsc()
+        self.postings.sort_indices()
+        self._build_impact_order()
+
+    # =============================
+    # BOBOT
+    # =============================
+    def _idf(self, df):
+        n = self.doc_count
+        with np.errstate(divide="ignore"):
+            if self.weighting == "bm25":
+                return np.log1p((n - df + 0.5) / (df + 0.5))
+            return np.log1p(n / np.maximum(df, 1))
+
+    def _impacts(self, tf):
+        """Impact per entri non-zero matriks TF (baris = dokumen)"""
+        doc_of_entry = np.repeat(np.arange(self.doc_count), np.diff(tf.indptr))
+        idf = self.idf[tf.indices]
+
+        if self.weighting == "bm25":
+            avg = self.avg_doc_length or 1.0
+            norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_of_entry] / avg)
+            return idf * tf.data * (self.k1 + 1) / (tf.data + norm)
+
+        weights = (1 + np.log(tf.data)) * idf
+        norms = np.sqrt(np.bincount(doc_of_entry, weights=weights * weights, minlength=self.doc_count))
+        return weights / norms[doc_of_entry]
+
+    def _build_impact_order(self):
+        """Postings per term diurutkan impact menurun (seri: doc_id menaik)"""
+        post = self.postings
+        term_of_entry = np.repeat(np.arange(self.V), np.diff(post.indptr))
+        order = np.lexsort((post.indices, -post.data, term_of_entry))
+        self.impact_docs = post.indices[order]
+        self.impact_values = post.data[order]
+
+    def query_weights(self, query_tokens):
+        """
+        Bobot term query
+
+        Returns:
+            dict: id term -> bobot (hanya term yang ada di korpus)
+        """
+        counts = {}
+        index = self.vocabulary.index
+        for token in query_tokens:
+            tid = index.get(token)
+            if tid is not None and tid < self.V and self.df[tid] > 0:
+                counts[tid] = counts.get(tid, 0) + 1
+
+        if self.weighting == "bm25":
+            return {tid: float(count) for tid, count in counts.items()}
+
+        weights = {tid: (1 + math.log(count)) * self.idf[tid] for tid, count in counts.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        return {tid: w / norm for tid, w in weights.items()}
+
+    # =============================
+    # SCORING
+    # =============================
+    def _exact_scores(self, weights, doc_ids):
+        """Skor lengkap dokumen doc_ids (akses acak ke postings terurut doc_id)"""
+        post = self.postings
+        scores = np.zeros(len(doc_ids), dtype=np.float64)
+        for tid, weight in weights.items():
+            docs = post.indices[post.indptr[tid]:post.indptr[tid + 1]]
+            values = post.data[post.indptr[tid]:post.indptr[tid + 1]]
+            pos = np.minimum(np.searchsorted(docs, doc_ids), len(docs) - 1)
+            found = docs[pos] == doc_ids
+            scores[found] += weight * values[pos[found]]
+        return scores
+
+    def _exhaustive(self, weights):
+        post = self.postings
+        scores = np.zeros(self.doc_count, dtype=np.float64)
+        for tid, weight in weights.items():
+            start, end = post.indptr[tid], post.indptr[tid + 1]
+            scores[post.indices[start:end]] += weight * post.data[start:end]
+        doc_ids = np.flatnonzero(scores)
+        read = int(sum(post.indptr[tid + 1] - post.indptr[tid] for tid in weights))
+        return doc_ids, self._exact_scores(weights, doc_ids), read
+
+    def top_k(self, query_tokens, top_n=5, prune=True):
+        """
+        Dokumen dengan skor tertinggi untuk query
+
+        Args:
+            query_tokens (list): Token query (hasil preprocessing)
+            top_n (int): Jumlah hasil; None / 0 = semua dokumen yang cocok
+            prune (bool): False = baca semua postings term query
+
+        Returns:
+            tuple: (doc_ids, scores, postings_read) - doc_ids dan scores
+            numpy array terurut skor menurun (seri: doc_id menaik)
+        """
+        weights = self.query_weights(query_tokens)
+        if not weights:
+            return np.zeros(0, dtype=np.int64), np.zeros(0), 0
+
+        if not top_n or not prune:
+            doc_ids, scores, read = self._exhaustive(weights)
+        else:
+            doc_ids, scores, read = self._pruned(weights, top_n)
+        return self._rank(doc_ids, scores, top_n) + (read,)
+
+    @staticmethod
+    def _rank(doc_ids, scores, top_n):
+        order = np.lexsort((doc_ids, -scores))
+        if top_n:
+            order = order[:top_n]
+        return doc_ids[order], scores[order]
+
+    def _pruned(self, weights, top_n):
+        indptr = self.postings.indptr
+        terms = list(weights)
+        weight = np.array([weights[t] for t in terms])
+        starts = np.array([indptr[t] for t in terms], dtype=np.int64)
+        ends = np.array([indptr[t + 1] for t in terms], dtype=np.int64)
+        pointers = starts.copy()
+        blocks = np.full(len(terms), FIRST_BLOCK, dtype=np.int64)
+
+        # Impact terbesar yang belum dibaca per term (0 jika habis)
+        frontier = weight * self.impact_values[starts]
+
+        acc = np.zeros(self.doc_count, dtype=np.float64)
+        seen_mask = np.zeros(self.doc_count, dtype=bool)
+        seen = []
+        read = 0
+        kth = 0.0
+
+        while True:
+            unseen_bound = frontier.sum()
+            if unseen_bound == 0:
+                break
+
+            # Blok berikutnya dari term dengan kontribusi maksimum terbesar
+            i = int(np.argmax(frontier))
+            start = pointers[i]
+            end = min(start + blocks[i], ends[i])
+            docs = self.impact_docs[start:end]
+            acc[docs] += weight[i] * self.impact_values[start:end]
+            read += end - start
+            pointers[i] = end
+            blocks[i] *= 2
+            frontier[i] = weight[i] * self.impact_values[end] if end < ends[i] else 0.0
+
+            new = docs[~seen_mask[docs]]
+            if len(new):
+                seen_mask[new] = True
+                seen.append(new)
+
+            n_seen = sum(len(s) for s in seen)
+            if n_seen >= top_n:
+                if len(seen) > 1:
+                    seen = [np.concatenate(seen)]
+                partial = acc[seen[0]]
+                kth = np.partition(partial, n_seen - top_n)[n_seen - top_n]
+                # Tidak ada dokumen baru yang bisa mengalahkan skor ke-k
+                if frontier.sum() < kth * (1 - SCORE_EPSILON):
+                    break
+
+        seen = np.concatenate(seen) if seen else np.zeros(0, dtype=np.int64)
+        # Dokumen yang sudah terlihat tetapi belum lengkap: masih mungkin
+        # masuk top-k hanya jika skor parsial + sisa batas atas >= ambang
+        remaining = frontier.sum()
+        candidates = np.sort(seen[acc[seen] + remaining >= kth * (1 - SCORE_EPSILON)])
+        return candidates, self._exact_scores(weights, candidates), read
+
+    def match(self, query_tokens, top_n=5, prune=True):
+        """
+        Returns:
+            list: [{"doc_id": int, "score": float}, ...] terurut skor menurun
+        """
+        doc_ids, scores, _ = self.top_k(query_tokens, top_n, prune=prune)
+        return [
+            {"doc_id": int(idx), "score": float(sc)}
+            for idx, sc in zip(doc_ids.tolist(), scores.tolist())
+        ]
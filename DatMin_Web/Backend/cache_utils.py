@@ -1,12 +1,494 @@
+import hashlib
 import os
 import pickle
+import sqlite3
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
 
-def save_cache(data, filename):
-    with open(filename, 'wb') as f:
-        pickle.dump(data, f)
+import numpy as np
 
-def load_cache(filename):
-    if not os.path.exists(filename):
-        return None
+from token_corpus import Vocabulary
+
+
+# Cara menggunakan DocumentStore
+
+# ==========================================================
+# from cache_utils import DocumentStore
+
+# store = DocumentStore('DatMin_Web/Backend/document_store.sqlite3')
+# store.migrate_pickle('DatMin_Web/Backend/preprocessing_cache.pkl')
+# with store.transaction():
+#     store.put_entry((content_hash, pipeline_version), entry)
+#     store.set_files(files)
+# raw = store.get_raw((content_hash, pipeline_version))
+
+# texts = DocumentTexts(store, keys, cache=RawTextCache(max_bytes=64 * 2**20))
+# texts[doc_id]  -> teks mentah, dibaca dari disk hanya jika belum di cache
+# ==========================================================
+
+# Naikkan jika skema tabel berubah
+STORE_SCHEMA_VERSION = 1
+
+# Teks mentah lebih panjang dari ini disimpan terkompresi (zlib)
+COMPRESS_MIN_CHARS = 512
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    name         TEXT PRIMARY KEY,
+    mtime        REAL NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS terms (
+    id   INTEGER PRIMARY KEY,
+    term TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    content_hash     TEXT NOT NULL,
+    pipeline_version TEXT NOT NULL,
+    failed           INTEGER NOT NULL DEFAULT 0,
+    raw              TEXT,
+    ids              BLOB,
+    PRIMARY KEY (content_hash, pipeline_version)
+);
+CREATE TABLE IF NOT EXISTS steps (
+    content_hash     TEXT NOT NULL,
+    pipeline_version TEXT NOT NULL,
+    position         INTEGER NOT NULL,
+    name             TEXT NOT NULL,
+    ids              BLOB NOT NULL,
+    PRIMARY KEY (content_hash, pipeline_version, position)
+);
+"""
+
+
+def _pack_ids(ids):
+    return np.asarray(ids, dtype='<i4').tobytes()
+
+
+def _unpack_ids(blob):
+    return np.frombuffer(blob, dtype='<i4')
+
+
+def _pack_raw(raw):
+    # Teks pendek tetap TEXT (kompresi tidak sebanding); entri lama
+    # (selalu TEXT) tetap terbaca tanpa migrasi
+    if len(raw) < COMPRESS_MIN_CHARS:
+        return raw
+    return zlib.compress(raw.encode('utf-8'), 6)
+
+
+def _unpack_raw(value):
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode('utf-8')
+    return value
+
+
+def encode_entry(vocabulary, raw, tokens, steps):
+    """Entri cache dengan token (dan tahap preprocessing) sebagai array id int32"""
+    return {
+        'raw': raw,
+        'ids': vocabulary.intern(tokens),
+        'steps': {name: vocabulary.intern(values) for name, values in steps.items()},
+    }
+
+
+class DocumentStore:
+    """
+    Cache hasil ekstraksi + preprocessing dalam SQLite
+    --------------------------------------------------
+    Pengganti preprocessing_cache.pkl. Setiap dokumen disimpan sebagai
+    baris tersendiri dengan kunci (hash isi file, versi pipeline), sehingga
+    bisa dibaca / ditulis per dokumen tanpa memuat seluruh cache:
+    - files   : filename -> (mtime, content_hash), urut saat file pertama
+                tercatat (rowid); urutan ini = urutan doc_id snapshot
+    - terms   : vocabulary bersama (id -> term); term yang tidak lagi
+                dipakai entri manapun dihapus saat prune_entries, id-nya
+                tidak dipakai ulang
+    - entries : teks mentah (TEXT, atau BLOB zlib untuk teks panjang)
+                + id token (BLOB int32), atau penanda gagal
+    - steps   : id token tiap tahap preprocessing
+
+    Perubahan dalam transaction() di-commit secara atomik. Mode WAL
+    membuat pembaca (proses lain) tidak terblokir saat ada penulisan.
+    Berbeda dengan pickle, membuka file ini tidak mengeksekusi kode.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self.transaction():
+            for statement in _SCHEMA.split(';'):
+                if statement.strip():
+                    self._conn.execute(statement)
+            version = self._meta('schema_version')
+            if version is None:
+                self._set_meta('schema_version', STORE_SCHEMA_VERSION)
+            elif int(version) != STORE_SCHEMA_VERSION:
+                raise ValueError(
+                    f"Unsupported document store schema {version}, expected {STORE_SCHEMA_VERSION}"
+                )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Kelompokkan penulisan menjadi satu commit atomik (rollback jika error).
+        Boleh bersarang; hanya transaksi terluar yang melakukan commit.
+        """
+        with self._lock:
+            if self._conn.in_transaction:
+                yield
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _meta(self, key):
+        rows = self._query("SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0][0] if rows else None
+
+    def _set_meta(self, key, value):
+        with self.transaction():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value))
+            )
+
+    # =============================
+    # FILES & VOCABULARY
+    # =============================
+    # Upsert (bukan INSERT OR REPLACE) agar rowid file yang sudah ada, dan
+    # dengan itu posisinya dalam urutan files(), tidak berubah
+    _UPSERT_FILE = (
+        "INSERT INTO files (name, mtime, content_hash) VALUES (?, ?, ?) "
+        "ON CONFLICT (name) DO UPDATE SET mtime = excluded.mtime, "
+        "content_hash = excluded.content_hash"
+    )
+
+    def files(self):
+        """dict filename -> (mtime, content_hash), urut saat file pertama tercatat"""
+        return {name: (mtime, h) for name, mtime, h in
+                self._query("SELECT name, mtime, content_hash FROM files ORDER BY rowid")}
+
+    def set_files(self, files):
+        """
+        Samakan tabel files dengan dict filename -> (mtime, content_hash).
+        File yang sudah tercatat tetap di posisinya, file baru ditambahkan
+        di akhir sesuai urutan dict.
+        """
+        with self.transaction():
+            current = {name for (name,) in self._conn.execute("SELECT name FROM files")}
+            self.delete_files(current - set(files))
+            self._conn.executemany(
+                self._UPSERT_FILE, [(name, mtime, h) for name, (mtime, h) in files.items()]
+            )
+
+    def delete_files(self, names):
+        """Hapus baris files untuk nama-nama ini (jika ada)"""
+        with self.transaction():
+            self._conn.executemany("DELETE FROM files WHERE name = ?", [(name,) for name in names])
+
+    def put_file(self, name, mtime, content_hash):
+        """Tambah (di akhir urutan) / perbarui satu baris files tanpa menulis ulang seluruh tabel"""
+        with self.transaction():
+            self._conn.execute(self._UPSERT_FILE, (name, mtime, content_hash))
+
+    def terms(self):
+        """
+        List term berurutan sesuai id; None untuk id term yang sudah
+        di-prune (panjang list tidak pernah berkurang, lihat _prune_terms)
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT id, term FROM terms ORDER BY id").fetchall()
+            next_id = int(self._meta('next_term_id') or 0)
+        if rows:
+            next_id = max(next_id, rows[-1][0] + 1)
+        if len(rows) == next_id:
+            return [term for _, term in rows]
+        terms = [None] * next_id
+        for i, term in rows:
+            terms[i] = term
+        return terms
+
+    def append_terms(self, terms, start):
+        """Simpan terms[start:] (term baru hasil Vocabulary.intern)"""
+        with self.transaction():
+            self._conn.executemany(
+                "INSERT INTO terms (id, term) VALUES (?, ?)",
+                [(i, terms[i]) for i in range(start, len(terms)) if terms[i] is not None],
+            )
+
+    def _prune_terms(self):
+        """
+        Hapus term yang tidak dipakai id token entri / steps manapun.
+
+        Panjang vocabulary dicatat di meta next_term_id sehingga id term
+        yang dihapus (termasuk di akhir) tidak diberikan ke term baru:
+        snapshot yang masih di memori tetap memetakan id lama ke term lama.
+
+        Returns:
+            int: Jumlah term yang dihapus
+        """
+        next_id = len(self.terms())
+        used = np.zeros(next_id, dtype=bool)
+        for (blob,) in self._conn.execute(
+                "SELECT ids FROM entries WHERE ids IS NOT NULL UNION ALL SELECT ids FROM steps"):
+            used[_unpack_ids(blob)] = True
+        unused = [(i,) for (i,) in self._conn.execute("SELECT id FROM terms").fetchall() if not used[i]]
+        if unused:
+            self._set_meta('next_term_id', next_id)
+            self._conn.executemany("DELETE FROM terms WHERE id = ?", unused)
+        return len(unused)
+
+    # =============================
+    # ENTRI DOKUMEN
+    # =============================
+    def entry_states(self, pipeline_version):
+        """dict content_hash -> True (berhasil) / False (gagal diekstrak)"""
+        return {h: not failed for h, failed in self._query(
+            "SELECT content_hash, failed FROM entries WHERE pipeline_version = ?",
+            (pipeline_version,),
+        )}
+
+    def put_entry(self, key, entry):
+        """
+        Simpan satu entri
+
+        Args:
+            key (tuple): (content_hash, pipeline_version)
+            entry (dict): {'raw', 'ids', 'steps'} (lihat encode_entry);
+                None = file gagal diekstrak
+        """
+        with self.transaction():
+            self._conn.execute("DELETE FROM steps WHERE content_hash = ? AND pipeline_version = ?", key)
+            if entry is None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (content_hash, pipeline_version, failed) "
+                    "VALUES (?, ?, 1)", key
+                )
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (content_hash, pipeline_version, failed, raw, ids) "
+                "VALUES (?, ?, 0, ?, ?)", key + (_pack_raw(entry['raw']), _pack_ids(entry['ids']))
+            )
+            self._conn.executemany(
+                "INSERT INTO steps (content_hash, pipeline_version, position, name, ids) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [key + (i, name, _pack_ids(ids)) for i, (name, ids) in enumerate(entry['steps'].items())],
+            )
+
+    def prune_entries(self, keep_keys):
+        """
+        Hapus semua entri (semua versi pipeline) selain keep_keys, beserta
+        term yang tidak lagi dipakai entri yang tersisa (transaksi yang sama)
+
+        Returns:
+            int: Jumlah entri yang dihapus
+        """
+        keep_keys = set(keep_keys)
+        stale = [key for key in self._query("SELECT content_hash, pipeline_version FROM entries")
+                 if tuple(key) not in keep_keys]
+        if not stale:
+            return 0
+        with self.transaction():
+            self._conn.executemany(
+                "DELETE FROM entries WHERE content_hash = ? AND pipeline_version = ?", stale
+            )
+            self._conn.executemany(
+                "DELETE FROM steps WHERE content_hash = ? AND pipeline_version = ?", stale
+            )
+            self._prune_terms()
+        return len(stale)
+
+    def load_ids(self, pipeline_version):
+        """dict content_hash -> array id token (int32) untuk entri yang berhasil"""
+        return {h: _unpack_ids(blob) for h, blob in self._query(
+            "SELECT content_hash, ids FROM entries WHERE pipeline_version = ? AND failed = 0",
+            (pipeline_version,),
+        )}
+
+    def get_raw(self, key):
+        """Teks mentah satu dokumen (dibaca dari disk saat dibutuhkan)"""
+        rows = self._query(
+            "SELECT raw FROM entries WHERE content_hash = ? AND pipeline_version = ?", key
+        )
+        if not rows or rows[0][0] is None:
+            raise KeyError(key)
+        return _unpack_raw(rows[0][0])
+
+    def get_steps(self, key):
+        """dict nama tahap -> array id token, urutan tahap seperti saat disimpan"""
+        return {name: _unpack_ids(blob) for name, blob in self._query(
+            "SELECT name, ids FROM steps WHERE content_hash = ? AND pipeline_version = ? "
+            "ORDER BY position", key
+        )}
+
+    # =============================
+    # MIGRASI DARI PICKLE
+    # =============================
+    def migrate_pickle(self, pickle_path):
+        """
+        Impor preprocessing_cache.pkl lama (sekali saja) ke store yang masih
+        kosong, lalu rename file pickle menjadi *.migrated.
+
+        Entri format list str (sebelum TokenCorpus) di-encode ke id int32.
+
+        Returns:
+            int: Jumlah entri yang diimpor
+        """
+        if not os.path.exists(pickle_path) or self._query("SELECT 1 FROM entries LIMIT 1"):
+            return 0
+
+        # Pickle hanya dibaca dari path lokal milik aplikasi sendiri
+        with open(pickle_path, 'rb') as f:
+            data = pickle.load(f)
+
+        vocabulary = Vocabulary(data.get('vocab', []))
+        entries = {}
+        for key, entry in data.get('entries', {}).items():
+            if entry is not None and 'ids' not in entry:
+                if 'tokens' not in entry or 'steps' not in entry:
+                    continue
+                entry = encode_entry(vocabulary, entry['raw'], entry['tokens'], entry['steps'])
+            entries[key] = entry
+
+        with self.transaction():
+            self._conn.execute("DELETE FROM terms")
+            self.append_terms(vocabulary.terms, 0)
+            for key, entry in entries.items():
+                self.put_entry(key, entry)
+            self.set_files(data.get('files', {}))
+
+        os.replace(pickle_path, pickle_path + '.migrated')
+        return len(entries)
+
+
+class RawTextCache:
+    """
+    Cache LRU teks mentah dengan batas ukuran dalam byte
+    ----------------------------------------------------
+    Ukuran entri dihitung dengan sys.getsizeof (memori objek str
+    sebenarnya). Entri paling lama tidak dipakai dibuang sampai total
+    ukuran <= max_bytes. Teks yang sendirian melebihi max_bytes tidak
+    di-cache.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, loader):
+        """
+        Teks untuk key; panggil loader(key) dan simpan hasilnya jika belum ada
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+
+        # Baca dari disk di luar lock agar request lain tidak menunggu
+        text = loader(key)
+        size = sys.getsizeof(text)
+        if size > self.max_bytes:
+            return text
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (text, size)
+                self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted
+        return text
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def cache_info(self):
+        """
+        Statistik cache
+
+        Returns:
+            dict: hits, misses, size (jumlah teks), bytes, max_bytes, hit_rate
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+class DocumentTexts:
+    """
+    Urutan teks mentah dokumen yang dibaca dari DocumentStore saat diakses
+    (texts[doc_id]), sehingga teks korpus tidak perlu ada di memori.
+    Dengan cache (RawTextCache), hanya working set yang tetap resident.
+    """
+
+    def __init__(self, store, keys, cache=None):
+        self.store = store
+        self.keys = keys
+        self.cache = cache
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, doc_id):
+        key = self.keys[doc_id]
+        if self.cache is None:
+            return self.store.get_raw(key)
+        return self.cache.get(key, self.store.get_raw)
+
+
+def file_sha256(filename, chunk_size=1024 * 1024):
+    """Hash isi file (bukan nama / mtime) untuk kunci cache per dokumen"""
+    digest = hashlib.sha256()
     with open(filename, 'rb') as f:
-        return pickle.load(f)
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def corpus_fingerprint(files, pipeline_version):
+    """
+    Versi korpus dari daftar (filename, content_hash) dan versi pipeline.
+    Berubah hanya jika isi / susunan dokumen benar-benar berubah.
+    """
+    digest = hashlib.sha256(str(pipeline_version).encode('utf-8'))
+    for name, content_hash in files:
+        digest.update(b'\0' + name.encode('utf-8') + b'\0' + content_hash.encode('ascii'))
+    return digest.hexdigest()
@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+
+
+# Cara menggunakan CorpusWatcher
+
+# ==========================================================
+# from corpus_watcher import CorpusWatcher
+
+# watcher = CorpusWatcher(UPLOAD_FOLDER, ttl=2.0, on_change=lambda version: ...)
+# watcher.start()                  # opsional: scan di thread latar belakang
+# version, files = watcher.snapshot()   # tanpa akses filesystem di jalur request
+# watcher.refresh(force=True)      # setelah upload / hapus file
+# ==========================================================
+
+
+class CorpusWatcher:
+    """
+    Status folder uploads di memori
+    -------------------------------
+    Menyimpan daftar (filename, mtime) semua file biasa di folder dan
+    sebuah nomor versi yang hanya naik jika daftar itu benar-benar berubah
+    (file baru, dihapus, atau mtime berubah).
+
+    Dua mode:
+    - TTL (default): snapshot() men-scan ulang folder paling sering sekali
+      per `ttl` detik; request lain memakai hasil di memori.
+    - Latar belakang (start()): thread daemon men-scan setiap `ttl` detik,
+      snapshot() tidak pernah menyentuh filesystem.
+    """
+
+    def __init__(self, folder, ttl=2.0, on_change=None):
+        self.folder = folder
+        self.ttl = ttl
+        # Dipanggil dengan versi baru setiap kali isi folder berubah
+        self.on_change = on_change
+
+        # (version, files) dalam satu tuple agar pembacaan selalu konsisten
+        self._current = (0, ())
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def scan(self):
+        """
+        Baca folder sekarang
+
+        Returns:
+            tuple: ((filename, mtime), ...) terurut nama, hanya file biasa
+        """
+        files = []
+        try:
+            entries = list(os.scandir(self.folder))
+        except FileNotFoundError:
+            return ()
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    files.append((entry.name, entry.stat().st_mtime))
+            except OSError:
+                # File dihapus di tengah scan
+                continue
+        return tuple(sorted(files))
+
+    def refresh(self, force=False):
+        """
+        Scan ulang jika TTL sudah lewat (atau force) dan naikkan versi jika berubah
+
+        Returns:
+            bool: True jika isi folder berubah
+        """
+        if not force and not self._expired():
+            return False
+
+        with self._lock:
+            # Cek ulang: thread lain mungkin baru saja scan
+            if not force and not self._expired():
+                return False
+            files = self.scan()
+            self._checked_at = time.monotonic()
+            version, current = self._current
+            if files == current:
+                return False
+            self._current = (version + 1, files)
+
+        if self.on_change is not None:
+            self.on_change(version + 1)
+        return True
+
+    def _expired(self):
+        return self._checked_at is None or time.monotonic() - self._checked_at >= self.ttl
+
+    def snapshot(self):
+        """
+        Returns:
+            tuple: (version, ((filename, mtime), ...))
+        """
+        if not self.running or self._checked_at is None:
+            self.refresh()
+        return self._current
+
+    @property
+    def version(self):
+        return self.snapshot()[0]
+
+    def files(self, extensions=None):
+        """
+        List (filename, mtime) dari snapshot, opsional difilter ekstensi (lowercase, dengan titik)
+        """
+        files = self.snapshot()[1]
+        if extensions is None:
+            return list(files)
+        return [(name, mtime) for name, mtime in files
+                if os.path.splitext(name)[1].lower() in extensions]
+
+    # =============================
+    # THREAD LATAR BELAKANG
+    # =============================
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Mulai scan berkala di thread daemon (idempoten)"""
+        if self.running:
+            return
+        self.refresh(force=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="corpus-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.ttl):
+            try:
+                self.refresh(force=True)
+            except OSError as e:
+                print(f"Corpus watcher gagal scan {self.folder}: {e}")
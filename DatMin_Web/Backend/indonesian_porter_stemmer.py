@@ -13,13 +13,18 @@ Fitur:
 - Menangani nasalisasi (perubahan huruf karena prefix me-)
 - Exception handling untuk kata-kata khusus
 - Membaca input dari file: txt, docx, pdf
+- Cache LRU hasil stemming yang bisa disimpan ke / dimuat dari disk
 
 Author: Claude
 Date: 2024
 """
 
+import hashlib
+import json
 import os
 import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 # Import untuk file processing
@@ -35,12 +40,57 @@ try:
 except ImportError:
     PDF_AVAILABLE = False
 
+# Naikkan jika logika stemming (bukan hanya tabel aturan) berubah,
+# agar cache stem yang tersimpan di disk tidak dipakai lagi
+STEMMER_VERSION = 1
+
+VOWELS = frozenset('aiueo')
+
+# Atribut tabel aturan; perubahan pada tabel ini memicu kompilasi ulang trie
+RULE_TABLES = (
+    'prefixes_rules', 'suffixes', 'particles', 'possessives', 'confixes',
+    'nasal_prefixes', 'root_words', 'special_words',
+)
+
+
+def _tracked(base, methods, name):
+    """
+    Subclass dict / list / set yang menghitung jumlah perubahan (mutations),
+    sehingga perubahan tabel aturan terdeteksi tanpa hashing ulang isinya
+    """
+    def wrap(method_name):
+        original = getattr(base, method_name)
+
+        def method(self, *args, **kwargs):
+            self.mutations += 1
+            return original(self, *args, **kwargs)
+        method.__name__ = method_name
+        return method
+
+    namespace = {'mutations': 0, '__module__': __name__, '__qualname__': name}
+    namespace.update({method_name: wrap(method_name) for method_name in methods})
+    return type(name, (base,), namespace)
+
+
+_RuleDict = _tracked(dict, (
+    '__setitem__', '__delitem__', '__ior__', 'clear', 'pop', 'popitem', 'setdefault', 'update',
+), '_RuleDict')
+_RuleList = _tracked(list, (
+    '__setitem__', '__delitem__', '__iadd__', '__imul__', 'append', 'extend', 'insert',
+    'pop', 'remove', 'clear', 'sort', 'reverse',
+), '_RuleList')
+_RuleSet = _tracked(set, (
+    '__ior__', '__iand__', '__isub__', '__ixor__', 'add', 'discard', 'remove', 'pop', 'clear',
+    'update', 'difference_update', 'intersection_update', 'symmetric_difference_update',
+), '_RuleSet')
+
+
 class IndonesianPorterStemmer:
     """
     Implementasi Porter Stemmer untuk Bahasa Indonesia
     """
     
-    def __init__(self):
+    def __init__(self, cache_size=100000):
         # Definisi awalan (prefixes) - diurutkan dari terpanjang
         self.prefixes_rules = {
             # Complex prefixes (harus dicek lebih dulu)
@@ -80,6 +130,18 @@ class IndonesianPorterStemmer:
         # Partikel dan possessive
         self.particles = ['lah', 'kah', 'tah', 'pun']
         self.possessives = ['nya', 'ku', 'mu']
+
+        # Kombinasi prefix-suffix (confix), dicek sesuai urutan
+        self.confixes = [
+            ('ber', 'an'),
+            ('ke', 'an'),
+            ('pe', 'an'),
+            ('per', 'an'),
+            ('me', 'an'),
+        ]
+
+        # Prefix yang memerlukan pengembalian huruf nasal
+        self.nasal_prefixes = {'mem', 'men', 'meng', 'meny'}
         
         # Kata dasar yang tidak perlu di-stem
         self.root_words = {
@@ -101,6 +163,287 @@ class IndonesianPorterStemmer:
             'bertemu': 'temu',
             'berpisah': 'pisah',
         }
+
+        # Cache LRU: kata -> hasil stem (0 = nonaktif)
+        self.cache_size = cache_size
+        self._stem_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Tabel aturan dikompilasi sekali menjadi trie
+        self._rules_fingerprint = None
+        self.compile_rules()
+
+    def __setattr__(self, name, value):
+        # Tabel aturan dibungkus agar perubahan di tempat ikut terhitung
+        if name in RULE_TABLES:
+            if isinstance(value, dict) and not isinstance(value, _RuleDict):
+                value = _RuleDict(value)
+            elif isinstance(value, list) and not isinstance(value, _RuleList):
+                value = _RuleList(value)
+            elif isinstance(value, (set, frozenset)) and not isinstance(value, _RuleSet):
+                value = _RuleSet(value)
+        super().__setattr__(name, value)
+
+    def __getstate__(self):
+        # Lock tidak bisa di-pickle (dibutuhkan saat dikirim ke process worker)
+        state = self.__dict__.copy()
+        del state['_cache_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache_lock = threading.Lock()
+
+    # =============================
+    # KOMPILASI ATURAN
+    # =============================
+    def compile_rules(self):
+        """
+        Kompilasi tabel aturan menjadi trie prefix / suffix.
+
+        Setiap trie menemukan semua kandidat affix dalam satu kali jalan
+        di atas kata. Kandidat diberi prioritas sesuai urutan pengecekan
+        aturan aslinya sehingga hasil stemming tidak berubah. Panggil
+        ulang setelah mengubah tabel aturan secara manual (stem_tokens()
+        melakukannya otomatis). Cache stem ikut dikosongkan.
+        """
+        # Prefix dicek dari yang terpanjang (urutan dict untuk panjang sama)
+        sorted_prefixes = sorted(self.prefixes_rules.items(),
+                                 key=lambda x: len(x[0]),
+                                 reverse=True)
+        self._prefix_trie = self._build_trie(
+            (prefix, (priority, prefix, min_stem_length))
+            for priority, (prefix, min_stem_length) in enumerate(sorted_prefixes)
+        )
+
+        # Suffix, partikel dan possessive dicocokkan dari belakang kata
+        self._suffix_trie = self._build_trie(
+            (suffix[::-1], (priority, suffix))
+            for priority, suffix in enumerate(self.suffixes)
+        )
+        self._particle_trie = self._build_trie(
+            (particle[::-1], (priority, particle))
+            for priority, particle in enumerate(self.particles)
+        )
+        self._possessive_trie = self._build_trie(
+            (poss[::-1], (priority, poss))
+            for priority, poss in enumerate(self.possessives)
+        )
+        self._confix_trie = self._build_trie(
+            (prefix, (priority, prefix, suffix))
+            for priority, (prefix, suffix) in enumerate(self.confixes)
+        )
+
+        self._rules_fingerprint = self.rules_fingerprint()
+        self._rules_state = self._rules_mutation_state()
+        self.clear_cache()
+
+    @staticmethod
+    def _build_trie(entries):
+        """
+        Bangun trie dari pasangan (kunci, payload)
+
+        Returns:
+            dict: Node trie. Node akhir sebuah kunci menyimpan (pada kunci None)
+            tuple payload semua kunci yang berakhir di sepanjang jalur menuju
+            node tersebut, sudah urut sesuai prioritas.
+        """
+        root = {}
+        for key, payload in entries:
+            node = root
+            for char in key:
+                node = node.setdefault(char, {})
+            node.setdefault(None, []).append(payload)
+
+        # Gabungkan payload dari node-node di atasnya agar pencocokan cukup
+        # mengambil daftar milik node terakhir yang cocok
+        def accumulate(node, inherited):
+            own = node.get(None)
+            if own is not None:
+                inherited = tuple(sorted(inherited + tuple(own)))
+                node[None] = inherited
+            for char, child in node.items():
+                if char is not None:
+                    accumulate(child, inherited)
+
+        accumulate(root, ())
+        return root
+
+    @staticmethod
+    def _match_trie(trie, chars):
+        """
+        Jalankan trie di atas urutan karakter
+
+        Returns:
+            tuple: Payload semua kunci yang cocok, urut sesuai prioritas
+        """
+        node = trie
+        found = ()
+        for char in chars:
+            node = node.get(char)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+    # =============================
+    # CACHE STEMMING
+    # =============================
+    def rules_fingerprint(self):
+        """
+        Sidik jari tabel aturan stemmer
+
+        Returns:
+            str: Hash yang berubah jika aturan prefix/suffix/partikel/
+            possessive/root word/kata khusus berubah
+        """
+        rules = {
+            'version': STEMMER_VERSION,
+            'prefixes': sorted(self.prefixes_rules.items()),
+            'suffixes': self.suffixes,
+            'particles': self.particles,
+            'possessives': self.possessives,
+            'confixes': self.confixes,
+            'nasal_prefixes': sorted(self.nasal_prefixes),
+            'root_words': sorted(self.root_words),
+            'special_words': sorted(self.special_words.items()),
+        }
+        payload = json.dumps(rules, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def _rules_mutation_state(self):
+        # Murah (tanpa hashing isi): berubah jika tabel diganti atau diubah di tempat
+        state = []
+        for name in RULE_TABLES:
+            table = getattr(self, name)
+            state.append((id(table), getattr(table, 'mutations', None)))
+        return tuple(state)
+
+    def _check_rules(self):
+        """Kompilasi ulang (dan kosongkan cache) jika tabel aturan sudah berubah"""
+        if self._rules_mutation_state() != self._rules_state \
+                and self.rules_fingerprint() != self._rules_fingerprint:
+            self.compile_rules()
+
+    def compiled_fingerprint(self):
+        """
+        Sidik jari aturan yang sedang dipakai (dihitung sekali saat
+        compile_rules, bukan setiap pemanggilan seperti rules_fingerprint)
+
+        Returns:
+            str: Sama dengan rules_fingerprint() setelah tabel terakhir diubah
+        """
+        self._check_rules()
+        return self._rules_fingerprint
+
+    def clear_cache(self):
+        """
+        Kosongkan cache stem. Counter hit / miss tidak di-reset (monoton,
+        diekspor sebagai counter di /metrics)
+        """
+        with self._cache_lock:
+            self._stem_cache.clear()
+
+    def cache_info(self):
+        """
+        Statistik cache stem
+
+        Returns:
+            dict: hits, misses, size, max_size, hit_rate
+        """
+        total = self.cache_hits + self.cache_misses
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'size': len(self._stem_cache),
+            'max_size': self.cache_size,
+            'hit_rate': self.cache_hits / total if total else 0.0,
+        }
+
+    def cache_entries(self, words):
+        """
+        Entri cache untuk kata-kata tertentu (tanpa mengubah urutan LRU /
+        counter), mis. untuk dikirim dari proses worker ke proses utama
+
+        Args:
+            words (iterable): Kata (dinormalisasi seperti di stem())
+
+        Returns:
+            list: List pasangan (kata, stem) yang ada di cache
+        """
+        with self._cache_lock:
+            entries = []
+            for word in {w.lower().strip() for w in words}:
+                stemmed = self._stem_cache.get(word)
+                if stemmed is not None:
+                    entries.append((word, stemmed))
+        return entries
+
+    def merge_cache(self, entries):
+        """
+        Tambahkan entri (kata, stem) ke cache tanpa menghitung hit / miss
+
+        Args:
+            entries (iterable): Pasangan (kata, stem), mis. dari cache_entries()
+                proses worker dengan tabel aturan yang sama
+        """
+        if not self.cache_size:
+            return
+        with self._cache_lock:
+            for word, stemmed in entries:
+                self._stem_cache[word] = stemmed
+                self._stem_cache.move_to_end(word)
+            while len(self._stem_cache) > self.cache_size:
+                self._stem_cache.popitem(last=False)
+
+    def save_cache(self, filepath):
+        """
+        Simpan cache stem ke file JSON (urutan LRU dipertahankan)
+
+        Args:
+            filepath (str): Path file tujuan
+        """
+        self._check_rules()
+        with self._cache_lock:
+            entries = list(self._stem_cache.items())
+
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': self._rules_fingerprint, 'entries': entries}, f)
+        os.replace(tmp_path, filepath)
+
+    def load_cache(self, filepath):
+        """
+        Muat cache stem dari file JSON
+
+        File diabaikan jika tidak ada, rusak, atau dibuat dengan tabel
+        aturan yang berbeda dari aturan saat ini.
+
+        Args:
+            filepath (str): Path file cache
+
+        Returns:
+            int: Jumlah entri yang dimuat
+        """
+        self._check_rules()
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return 0
+
+        if not isinstance(data, dict) or data.get('fingerprint') != self._rules_fingerprint:
+            return 0
+
+        entries = data.get('entries', [])
+        if self.cache_size:
+            entries = entries[-self.cache_size:]
+        else:
+            entries = []
+        self.merge_cache(entries)
+        return len(entries)
     
     def stem_tokens(self, tokens):
         """
@@ -115,6 +458,10 @@ class IndonesianPorterStemmer:
         if not isinstance(tokens, list):
             raise TypeError("Input harus berupa list token")
 
+        # Aturan dikompilasi ulang + cache dikosongkan jika tabel aturan
+        # diubah sejak terakhir dicek
+        self._check_rules()
+
         stemmed_tokens = []
         for token in tokens:
             if isinstance(token, str) and token.isalpha():
@@ -137,7 +484,28 @@ class IndonesianPorterStemmer:
         """
         # Normalisasi: lowercase dan trim
         word = word.lower().strip()
-        
+
+        if not self.cache_size:
+            return self._stem_word(word)
+
+        with self._cache_lock:
+            cached = self._stem_cache.get(word)
+            if cached is not None:
+                self._stem_cache.move_to_end(word)
+                self.cache_hits += 1
+                return cached
+            self.cache_misses += 1
+
+        result = self._stem_word(word)
+
+        with self._cache_lock:
+            self._stem_cache[word] = result
+            if len(self._stem_cache) > self.cache_size:
+                self._stem_cache.popitem(last=False)
+        return result
+
+    def _stem_word(self, word):
+        """Stemming tanpa cache untuk kata yang sudah dinormalisasi"""
         # Kata terlalu pendek
         if len(word) <= 2:
             return word
@@ -187,15 +555,15 @@ class IndonesianPorterStemmer:
     
     def _remove_particles(self, word):
         """Hapus partikel di akhir kata"""
-        for particle in self.particles:
-            if word.endswith(particle) and len(word) > len(particle) + 2:
+        for _, particle in self._match_trie(self._particle_trie, reversed(word)):
+            if len(word) > len(particle) + 2:
                 return word[:-len(particle)]
         return word
     
     def _remove_possessives(self, word):
         """Hapus possessive pronouns"""
-        for poss in self.possessives:
-            if word.endswith(poss) and len(word) > len(poss) + 2:
+        for _, poss in self._match_trie(self._possessive_trie, reversed(word)):
+            if len(word) > len(poss) + 2:
                 return word[:-len(poss)]
         return word
     
@@ -204,16 +572,8 @@ class IndonesianPorterStemmer:
         Hapus kombinasi prefix-suffix (confix)
         Contoh: ke-an, ber-an, pe-an, per-an
         """
-        confixes = [
-            ('ber', 'an'),
-            ('ke', 'an'),
-            ('pe', 'an'),
-            ('per', 'an'),
-            ('me', 'an'),
-        ]
-        
-        for prefix, suffix in confixes:
-            if word.startswith(prefix) and word.endswith(suffix):
+        for _, prefix, suffix in self._match_trie(self._confix_trie, word):
+            if word.endswith(suffix):
                 stem = word[len(prefix):-len(suffix)]
                 if len(stem) >= 2:
                     return stem
@@ -222,8 +582,8 @@ class IndonesianPorterStemmer:
     
     def _remove_suffix(self, word):
         """Hapus suffix dengan prioritas dari yang terpanjang"""
-        for suffix in self.suffixes:
-            if word.endswith(suffix) and len(word) > len(suffix) + 2:
+        for _, suffix in self._match_trie(self._suffix_trie, reversed(word)):
+            if len(word) > len(suffix) + 2:
                 stem = word[:-len(suffix)]
                 if self._is_valid_stem(stem):
                     return stem
@@ -233,27 +593,22 @@ class IndonesianPorterStemmer:
         """
         Hapus prefix dengan penanganan nasalisasi
         """
-        # Cek prefix dari yang terpanjang ke terpendek
-        sorted_prefixes = sorted(self.prefixes_rules.items(), 
-                                key=lambda x: len(x[0]), 
-                                reverse=True)
-        
-        for prefix, min_stem_length in sorted_prefixes:
-            if word.startswith(prefix):
-                stem = word[len(prefix):]
-                
-                # Validasi panjang stem
-                if len(stem) < min_stem_length:
-                    continue
-                
-                # Handling khusus untuk prefix dengan nasalisasi
-                if prefix in ['mem', 'men', 'meng', 'meny']:
-                    restored = self._restore_nasal(stem, prefix)
-                    if self._is_valid_stem(restored):
-                        return restored
-                
-                if self._is_valid_stem(stem):
-                    return stem
+        # Kandidat prefix sudah urut dari yang terpanjang ke terpendek
+        for _, prefix, min_stem_length in self._match_trie(self._prefix_trie, word):
+            stem = word[len(prefix):]
+            
+            # Validasi panjang stem
+            if len(stem) < min_stem_length:
+                continue
+            
+            # Handling khusus untuk prefix dengan nasalisasi
+            if prefix in self.nasal_prefixes:
+                restored = self._restore_nasal(stem, prefix)
+                if self._is_valid_stem(restored):
+                    return restored
+            
+            if self._is_valid_stem(stem):
+                return stem
         
         return word
     
@@ -318,8 +673,7 @@ class IndonesianPorterStemmer:
             return True
         
         # Minimal harus ada vokal
-        vowels = set('aiueo')
-        if not any(c in vowels for c in stem):
+        if VOWELS.isdisjoint(stem):
             return False
         
         return True
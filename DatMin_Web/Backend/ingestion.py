@@ -0,0 +1,197 @@
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+# Cara menggunakan ingestion paralel
+
+# ==========================================================
+# from ingestion import ingest_files
+
+# results = ingest_files(UPLOAD_FOLDER, files, pipeline, workers=4)
+# for file, text, tokens, steps in results:
+#     ...
+#
+# content_hash, size = save_stream(request.stream, tmp_path, max_bytes=50 * 2 ** 20)
+# ==========================================================
+
+SUPPORTED_EXTENSIONS = {'.txt', '.docx', '.pdf'}
+
+# Worker dibuat dengan "spawn", bukan fork (default Linux): ingest_files
+# dipanggil dari thread builder di proses Flask yang multithread, dan
+# child hasil fork bisa mewarisi lock yang sedang dipegang thread lain
+# (mis. _cache_lock stemmer, lock SQLite) lalu macet selamanya
+WORKER_START_METHOD = "spawn"
+
+# Pipeline milik proses worker, dikirim sekali lewat initializer
+_worker_pipeline = None
+
+
+def extract_text(path, stemmer):
+    """
+    Ekstrak teks mentah dari file .txt / .docx / .pdf
+
+    Args:
+        path (str): Path file
+        stemmer (IndonesianPorterStemmer): Dipakai untuk membaca docx / pdf
+
+    Returns:
+        str: Isi file
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".txt":
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    elif ext == ".docx":
+        return stemmer.read_docx_file(path)
+    elif ext == ".pdf":
+        return stemmer.read_pdf_file(path)
+    raise ValueError(f"Format file tidak didukung: {ext}")
+
+
+def save_stream(stream, path, max_bytes=None, chunk_size=1024 * 1024):
+    """
+    Tulis stream (mis. body upload) ke file per chunk sambil menghitung hash
+    isinya, tanpa menampung seluruh file di memori.
+
+    Args:
+        stream: Objek file-like dengan read(n)
+        path (str): File tujuan (ditimpa)
+        max_bytes (int): Batas ukuran; None = tanpa batas
+        chunk_size (int): Ukuran chunk baca
+
+    Returns:
+        tuple: (sha256 hex isi file, ukuran byte); hash sama dengan
+            cache_utils.file_sha256 sehingga bisa dibandingkan dengan store
+
+    Raises:
+        ValueError: Jika ukuran melebihi max_bytes (file tujuan dihapus)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, 'wb') as f:
+            for chunk in iter(lambda: stream.read(chunk_size), b''):
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise ValueError(f"File melebihi batas {max_bytes} byte")
+                digest.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return digest.hexdigest(), size
+
+
+def process_file(path, pipeline):
+    """
+    Ekstrak + preprocessing satu file
+
+    Returns:
+        tuple: (teks mentah, token hasil preprocessing, dict tahap preprocessing)
+    """
+    text = extract_text(path, pipeline.stemmer)
+    tokens, steps = pipeline.process_document_full(text)
+    return text, tokens, steps
+
+
+def _init_worker(pipeline):
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+
+
+def _process_in_worker(path):
+    # Exception per file dikembalikan sebagai pesan, bukan dilempar,
+    # supaya satu PDF rusak tidak menggagalkan seluruh batch.
+    # Entri cache stem untuk kata file ini ikut dikirim balik, karena cache
+    # milik worker hilang saat pool ditutup
+    try:
+        text, tokens, steps = process_file(path, _worker_pipeline)
+    except Exception as e:
+        return None, str(e), []
+    return (text, tokens, steps), None, _stem_cache_entries(_worker_pipeline, steps)
+
+
+def _stem_cache_entries(pipeline, steps):
+    cache_entries = getattr(pipeline.stemmer, 'cache_entries', None)
+    if cache_entries is None:
+        return []
+    return cache_entries(steps.get('filtered_tokens', []))
+
+
+def _report_error(file, error):
+    ext = os.path.splitext(file)[1].lstrip('.').upper()
+    print(f"Error reading {ext} {file}: {error}")
+
+
+def default_workers():
+    """Jumlah worker dari env INGEST_WORKERS, default jumlah core CPU"""
+    value = os.environ.get('INGEST_WORKERS')
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            pass
+    return os.cpu_count() or 1
+
+
+def ingest_files(folder, files, pipeline, workers=None):
+    """
+    Ekstrak dan preprocessing banyak file, paralel antar core CPU.
+
+    Hasil selalu mengikuti urutan `files` (deterministik), terlepas dari
+    worker mana yang selesai lebih dulu. File yang gagal dibaca dilewati.
+    Jika process pool rusak (worker mati), sisa file diproses serial di
+    proses utama.
+
+    Args:
+        folder (str): Folder tempat file berada
+        files (list): Nama file yang akan diproses
+        pipeline (PreprocessingPipeline): Pipeline preprocessing
+        workers (int): Jumlah proses worker; None = default_workers(),
+            1 = serial tanpa process pool
+
+    Returns:
+        list: List tuple (filename, teks mentah, token, dict tahap preprocessing).
+            Entri cache stem hasil worker digabung ke pipeline.stemmer, sehingga
+            save_cache setelahnya ikut menyimpan kata dari semua file
+    """
+    files = [f for f in files if os.path.splitext(f)[1].lower() in SUPPORTED_EXTENSIONS]
+    paths = [os.path.join(folder, f) for f in files]
+
+    if workers is None:
+        workers = default_workers()
+    workers = min(workers, len(files))
+
+    outcomes = [None] * len(files)
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context(WORKER_START_METHOD),
+                                     initializer=_init_worker,
+                                     initargs=(pipeline,)) as executor:
+                for i, (processed, error, cache_entries) in enumerate(
+                        executor.map(_process_in_worker, paths)):
+                    outcomes[i] = (processed, error)
+                    if cache_entries:
+                        pipeline.stemmer.merge_cache(cache_entries)
+        except (BrokenProcessPool, OSError) as e:
+            print(f"Process pool gagal ({e}), lanjut secara serial")
+
+    results = []
+    for i, (file, path) in enumerate(zip(files, paths)):
+        if outcomes[i] is None:
+            try:
+                outcomes[i] = (process_file(path, pipeline), None)
+            except Exception as e:
+                outcomes[i] = (None, str(e))
+
+        processed, error = outcomes[i]
+        if error is not None:
+            _report_error(file, error)
+            continue
+        results.append((file,) + processed)
+
+    return results
@@ -0,0 +1,278 @@
+import copy
+import math
+import os
+
+import numpy as np
+from scipy.sparse.linalg import svds
+
+from GVSM.gvsm import (
+    corpus_tf_matrix, rank_top_k, read_index_manifest, read_index_vocab, write_index_dir,
+)
+from token_corpus import TokenCorpus
+
+
+# Cara menggunakan LSIModel
+
+# ==========================================================
+# from lsi_model import LSIModel
+
+# lsi = LSIModel(doc_tokens, k=100)                  # TokenCorpus atau list token list
+# lsi.match(query_tokens, top_n=5)   -> [{"doc_id": 3, "score": 0.82}, ...]
+# lsi = lsi.copy(); lsi.add_documents([new_tokens])   # fold-in tanpa SVD ulang
+# lsi.save('DatMin_Web/Backend/lsi_index', version=corpus_version)
+# lsi = LSIModel.load('DatMin_Web/Backend/lsi_index', version=corpus_version, k=100)
+# ==========================================================
+
+# Bobot matriks dokumen-term sebelum SVD:
+# - "tfidf" : (1 + ln tf) * ln(1 + N / df)
+# - "tf"    : frekuensi mentah
+WEIGHTINGS = ("tfidf", "tf")
+
+DEFAULT_K = 100
+
+# Layout index di disk (LSIModel.save / load). Naikkan jika layout berubah.
+INDEX_FORMAT = "lsi-index"
+INDEX_FORMAT_VERSION = 1
+
+
+class LSIModel:
+    """
+    Latent Semantic Indexing dengan truncated SVD
+    ---------------------------------------------
+    Matriks dokumen-term A (N x V, sparse) didekomposisi A ~ U_k S_k V_k^T
+    dengan scipy.sparse.linalg.svds. Yang disimpan hanya faktornya:
+    - doc_vectors  : baris A V_k = U_k S_k, dinormalisasi (N x k)
+    - term_vectors : V_k (V x k), untuk fold-in query
+
+    Query di-fold-in ke ruang k dimensi: q_k = sum(bobot_query[t] *
+    term_vectors[t]) hanya untuk term query, lalu skor cosine = doc_vectors
+    @ q_k (mat-vec dense N x k). Tidak ada operasi berukuran V saat query.
+
+    Args:
+        documents: TokenCorpus atau list token list (hasil preprocessing)
+        k (int): Jumlah dimensi laten (dibatasi oleh ukuran matriks)
+        weighting (str): "tfidf" atau "tf" (lihat WEIGHTINGS)
+    """
+
+    def __init__(self, documents, k=DEFAULT_K, weighting="tfidf"):
+        if weighting not in WEIGHTINGS:
+            raise ValueError(f"weighting must be one of {WEIGHTINGS}, got {weighting!r}")
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        if not isinstance(documents, TokenCorpus):
+            documents = TokenCorpus.from_token_lists(documents)
+        if len(documents) == 0:
+            raise ValueError("Documents must be a non-empty list of token lists")
+
+        self.documents = documents
+        self.weighting = weighting
+        self.doc_count = len(documents)
+
+        self.vocab, tf = corpus_tf_matrix(documents)
+        self.V = len(self.vocab)
+        self.df = np.bincount(tf.indices, minlength=self.V)
+        self.idf = np.log1p(self.doc_count / np.maximum(self.df, 1))
+
+        matrix = self._weighted(tf)
+        self.k = k
+        term_vectors, singular_values = self._truncated_svd(matrix, k)
+        self.singular_values = singular_values
+        self.term_vectors = term_vectors.astype(np.float32)
+        # A V_k = U_k S_k, tanpa menyimpan U_k terpisah
+        self.doc_vectors = self._normalize(np.asarray(matrix @ term_vectors)).astype(np.float32)
+        # Token dokumen fold-in yang diabaikan karena belum ada di vocab;
+        # > 0 berarti model perlu dibangun ulang agar dokumen itu bisa dicari
+        self.dropped_terms = 0
+
+    def _weighted(self, tf):
+        if self.weighting == "tf":
+            return tf
+        weighted = tf.copy()
+        weighted.data = (1 + np.log(weighted.data)) * self.idf[weighted.indices]
+        return weighted
+
+    @staticmethod
+    def _truncated_svd(matrix, k):
+        """
+        k vektor singular kanan terbesar dari matriks N x V
+
+        Returns:
+            tuple: (V_k sebagai array V x k, singular value menurun)
+        """
+        rank_limit = min(matrix.shape)
+        if rank_limit == 0:
+            return np.zeros((matrix.shape[1], 0)), np.zeros(0)
+        if k < rank_limit:
+            # v0 tetap agar hasil ARPACK deterministik untuk korpus yang sama
+            v0 = np.ones(rank_limit) / math.sqrt(rank_limit)
+            _, s, vt = svds(matrix.astype(np.float64), k=k, v0=v0)
+        else:
+            # Matriks kecil: svds butuh k < min(N, V), pakai SVD dense
+            _, s, vt = np.linalg.svd(matrix.toarray(), full_matrices=False)
+
+        order = np.argsort(-s, kind="stable")
+        keep = order[s[order] > 1e-10]
+        return vt[keep].T, s[keep]
+
+    @staticmethod
+    def _normalize(vectors):
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    # =============================
+    # UPDATE INCREMENTAL
+    # =============================
+    def copy(self):
+        """
+        Salinan dangkal untuk update incremental: add_documents membuat
+        array baru, sehingga model asli (mis. milik snapshot lain) tidak berubah
+        """
+        return copy.copy(self)
+
+    def add_documents(self, documents):
+        """
+        Tambahkan dokumen dengan fold-in ke ruang laten yang sudah ada:
+        vektor dokumen = bobot(d) @ term_vectors, sama seperti query. Faktor
+        SVD, df dan idf tidak dihitung ulang dan term baru diabaikan, jadi
+        hasilnya mendekati (tidak identik dengan) SVD ulang. Token yang
+        diabaikan dihitung di dropped_terms; pemanggil harus menjadwalkan
+        build penuh jika nilainya > 0.
+
+        Args:
+            documents (list): List token list dokumen baru (di akhir doc_id)
+
+        Returns:
+            int: Jumlah token dokumen baru yang tidak dikenal vocab LSI
+        """
+        rows = np.zeros((len(documents), self.doc_vectors.shape[1]), dtype=np.float64)
+        dropped = 0
+        for i, tokens in enumerate(documents):
+            dropped += sum(1 for token in tokens if token not in self.vocab)
+            vector = self.fold_in(tokens)
+            if vector is not None:
+                rows[i] = vector
+        self.doc_vectors = np.vstack(
+            [self.doc_vectors, self._normalize(rows).astype(np.float32)]
+        )
+        self.doc_count += len(documents)
+        self.dropped_terms += dropped
+        return dropped
+
+    # =============================
+    # QUERY
+    # =============================
+    def fold_in(self, query_tokens):
+        """
+        Vektor query di ruang laten (k,), None jika tidak ada term yang dikenal
+        """
+        counts = {}
+        for token in query_tokens:
+            tid = self.vocab.get(token)
+            if tid is not None:
+                counts[tid] = counts.get(tid, 0) + 1
+        if not counts:
+            return None
+
+        term_ids = np.fromiter(counts, dtype=np.int64, count=len(counts))
+        weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        if self.weighting == "tfidf":
+            weights = (1 + np.log(weights)) * self.idf[term_ids]
+        return weights @ self.term_vectors[term_ids]
+
+    def match(self, query_tokens, top_n=5):
+        """
+        Returns:
+            list: [{"doc_id": int, "score": float}, ...] terurut skor (cosine) menurun
+        """
+        query_vector = self.fold_in(query_tokens)
+        if query_vector is None:
+            return []
+        norm = np.linalg.norm(query_vector)
+        if norm == 0:
+            return []
+
+        scores = self.doc_vectors @ (query_vector / norm).astype(np.float32)
+        doc_ids, top_scores = rank_top_k(scores, top_n)
+        return [
+            {"doc_id": int(idx), "score": float(sc)}
+            for idx, sc in zip(doc_ids.tolist(), top_scores.tolist())
+        ]
+
+    # =============================
+    # SIMPAN / MUAT INDEX
+    # =============================
+    # Layout direktori (sama seperti index GVSM):
+    #   manifest.json  -> format, versi korpus, k, weighting, ukuran
+    #   vocab.txt      -> term per baris, urut term id
+    #   <nama>.npy     -> doc_vectors, term_vectors, singular_values, idf, df
+    _ARRAYS = ("doc_vectors", "term_vectors", "singular_values", "idf", "df")
+
+    def save(self, path, version=None):
+        """
+        Simpan faktor SVD ke direktori `path` (ditulis ke direktori sementara
+        lalu di-rename, sehingga pembaca tidak pernah melihat index setengah jadi).
+
+        Args:
+            path (str): Direktori tujuan (ditimpa jika sudah ada)
+            version: Penanda versi korpus, dicek ulang saat load
+        """
+        def write_arrays(tmp_path):
+            for name in self._ARRAYS:
+                np.save(os.path.join(tmp_path, f"{name}.npy"), np.asarray(getattr(self, name)))
+
+        manifest = {
+            "format": INDEX_FORMAT,
+            "format_version": INDEX_FORMAT_VERSION,
+            "k": self.k,
+            "weighting": self.weighting,
+            "V": self.V,
+            "doc_count": self.doc_count,
+            "version": None if version is None else str(version),
+        }
+        write_index_dir(path, self.vocab, manifest, write_arrays)
+
+    @classmethod
+    def load(cls, path, documents=None, mmap=True, version=None, k=None, weighting=None):
+        """
+        Muat faktor hasil save() tanpa menghitung ulang SVD.
+
+        Args:
+            path (str): Direktori index
+            documents: Token dokumen (opsional, tidak dipakai untuk scoring)
+            mmap (bool): Memory-map array (read-only, dibagi antar proses)
+            version: Jika diberikan, harus sama dengan versi saat save()
+            k (int): Jika diberikan, harus sama dengan k saat build
+            weighting (str): Jika diberikan, harus sama dengan weighting saat build
+
+        Returns:
+            LSIModel: Model siap pakai
+
+        Raises:
+            OSError: File index tidak ada / tidak terbaca
+            ValueError: Format tidak cocok, atau versi korpus / k / weighting berbeda
+        """
+        manifest = read_index_manifest(path, INDEX_FORMAT, INDEX_FORMAT_VERSION, "LSI")
+        if version is not None and manifest["version"] != str(version):
+            raise ValueError("Index was built for a different corpus version")
+        if k is not None and manifest["k"] != k:
+            raise ValueError(f"Index was built with k={manifest['k']}, expected {k}")
+        if weighting is not None and manifest["weighting"] != weighting:
+            raise ValueError(f"Index was built with weighting={manifest['weighting']!r}")
+        if documents is not None and len(documents) != manifest["doc_count"]:
+            raise ValueError("documents length does not match the index")
+
+        model = cls.__new__(cls)
+        model.documents = documents
+        model.weighting = manifest["weighting"]
+        model.k = manifest["k"]
+        model.V = manifest["V"]
+        model.doc_count = manifest["doc_count"]
+        model.dropped_terms = 0
+
+        model.vocab = read_index_vocab(path, model.V)
+
+        mmap_mode = "r" if mmap else None
+        for name in cls._ARRAYS:
+            setattr(model, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode))
+        return model
@@ -0,0 +1,211 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Cara menggunakan metrics
+
+# ==========================================================
+# from metrics import MetricsRegistry, StageTimer
+
+# registry = MetricsRegistry()
+# stage_seconds = registry.histogram('search_stage_seconds', 'Latency per tahap', ['endpoint', 'stage'])
+# registry.gauge('index_documents', 'Jumlah dokumen', callback=lambda: len(snapshot))
+#
+# timer = StageTimer(stage_seconds, endpoint='search')
+# with timer.stage('scoring'):
+#     results = gvsm.match(query_tokens)
+# timer.lap('load')        # atau: waktu sejak tahap sebelumnya
+# timer.timings            -> {'scoring': 1.93}   (ms, untuk debug_timings)
+# registry.render()        -> teks format Prometheus untuk /metrics
+# ==========================================================
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Batas bucket latency (detik), dari 100 us sampai 10 s
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """
+    Dasar Counter / Gauge. Jika callback diberikan, nilai dibaca saat
+    render: callback() mengembalikan angka (tanpa label) atau dict
+    {tuple nilai label: angka}; None = sampel dilewati.
+    """
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=(), callback=None):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self):
+        if self.callback is not None:
+            value = self.callback()
+            items = sorted(value.items()) if isinstance(value, dict) else [((), value)]
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in items if value is not None]
+
+
+class Counter(_Metric):
+    """Nilai yang hanya bertambah (jumlah request, cache hit, ...)"""
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Nilai sesaat (ukuran index, jumlah entri cache, ...)"""
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Distribusi latency per kombinasi label (bucket kumulatif + sum + count)"""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # _values: key -> [count per bucket (non-kumulatif, + satu untuk +Inf), sum]
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Kumpulan metrik proses ini, di-render dalam format teks Prometheus"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labelnames=(), callback=None):
+        return self._register(Counter(name, help_text, labelnames, callback))
+
+    def gauge(self, name, help_text, labelnames=(), callback=None):
+        return self._register(Gauge(name, help_text, labelnames, callback))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class StageTimer:
+    """
+    Pencatat waktu per tahap untuk satu request
+
+    Setiap tahap dicatat ke histogram (label endpoint + stage) dan
+    dikumpulkan di `timings` (ms) untuk field debug_timings di response.
+    Tahap dengan nama sama dalam satu request dijumlahkan.
+    """
+
+    def __init__(self, histogram, endpoint):
+        self.histogram = histogram
+        self.endpoint = endpoint
+        self.timings = {}
+        self._start = self._lap = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._lap = time.perf_counter()
+            self.record(name, self._lap - start)
+
+    def lap(self, name):
+        """Catat waktu sejak lap() / stage() sebelumnya sebagai tahap name"""
+        now = time.perf_counter()
+        self.record(name, now - self._lap)
+        self._lap = now
+
+    def record(self, name, seconds):
+        self.histogram.observe(seconds, endpoint=self.endpoint, stage=name)
+        self.timings[name] = self.timings.get(name, 0.0) + seconds * 1000
+
+    def finish(self):
+        """Catat tahap 'total' (sejak timer dibuat) dan kembalikan timings (ms)"""
+        self.record("total", time.perf_counter() - self._start)
+        return {name: round(ms, 3) for name, ms in self.timings.items()}
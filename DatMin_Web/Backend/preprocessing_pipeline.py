@@ -1,10 +1,23 @@
 class PreprocessingPipeline:
 
+    # Naikkan setiap kali hasil preprocessing berubah (aturan tokenizing,
+    # stopword, stemming) agar cache per dokumen lama tidak dipakai lagi
+    VERSION = 1
+
     def __init__(self, tokenizer, stopword_filter, stemmer):
         self.tokenizer = tokenizer
         self.stopword_filter = stopword_filter
         self.stemmer = stemmer
 
+    @property
+    def version(self):
+        # Ikut berubah jika tabel aturan stemmer berubah (sidik jari
+        # disimpan saat kompilasi, tidak di-hash ulang setiap dibaca)
+        fingerprint = getattr(self.stemmer, 'compiled_fingerprint', None)
+        if fingerprint is None:
+            return str(self.VERSION)
+        return f"{self.VERSION}-{fingerprint()[:16]}"
+
     # ===============================
     # UNTUK VSM (list token saja)
     # ===============================
@@ -24,21 +37,45 @@ class PreprocessingPipeline:
     # UNTUK DETAIL PREPROCESSING UI
     # ===============================
     def process_document_with_steps(self, text):
-        case_folding = text.lower()
+        stemmed, steps = self.process_document_full(text)
+        return self.format_steps(text, steps, stemmed)
+
+    def process_document_full(self, text):
+        """
+        Token akhir + hasil tiap tahap dalam satu kali jalan.
+        Dipakai saat indexing agar detail preprocessing bisa di-cache
+        dan tidak perlu dihitung ulang setiap kali dokumen muncul di hasil search.
 
-        tokens = self.tokenizer.process_text(case_folding)
+        Returns:
+            tuple: (token hasil stemming, dict tahap preprocessing)
+        """
+        tokens = self.tokenizer.process_text(text.lower())
 
         filtered_tokens, removed_stopwords = \
             self.stopword_filter.filter_with_removed(tokens)
 
         stemmed = self.stemmer.stem_tokens(filtered_tokens)
 
-        return {
-            "original_text": text,
-            "case_folding": case_folding,
+        steps = {
             "tokens": tokens,
             "removed_stopwords": removed_stopwords,
             "filtered_tokens": filtered_tokens,
+        }
+        return stemmed, steps
+
+    def format_steps(self, text, steps, stemmed):
+        """
+        Susun detail preprocessing (format process_document_with_steps)
+        dari hasil tahap yang sudah di-cache.
+        """
+        filtered_tokens = steps["filtered_tokens"]
+
+        return {
+            "original_text": text,
+            "case_folding": text.lower(),
+            "tokens": steps["tokens"],
+            "removed_stopwords": steps["removed_stopwords"],
+            "filtered_tokens": filtered_tokens,
             "stemming": [
                 {
                     "original": filtered_tokens[i],
@@ -46,4 +83,4 @@ class PreprocessingPipeline:
                 }
                 for i in range(len(filtered_tokens))
             ]
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,194 @@
+import threading
+from collections import Counter, OrderedDict
+
+
+# Cara menggunakan QueryCache
+
+# ==========================================================
+# from query_cache import QueryCache
+
+# query_cache = QueryCache(pipeline, max_queries=4096, max_results=1024)
+# query_tokens = query_cache.tokens(query)               # cache level 1
+# results = query_cache.results(
+#     snapshot.version, query_tokens, top_n,
+#     lambda: gvsm.match(query_tokens, top_n=top_n),     # dihitung jika miss
+#     model='gvsm',
+# )                                                       # cache level 2
+# query_cache.cache_info()
+# ==========================================================
+
+# Jumlah versi terakhir yang diingat per tingkat cache. Lookup dengan versi
+# yang baru saja diganti (request yang masih memegang snapshot lama) tidak
+# membuang isi cache versi yang lebih baru
+RECENT_VERSIONS = 4
+
+
+class LRUCache:
+    """
+    Cache LRU sederhana dengan batas jumlah entri (thread-safe)
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def cache_info(self):
+        """
+        Returns:
+            dict: hits, misses, size, max_size, hit_rate
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+class QueryCache:
+    """
+    Cache query dua tingkat
+    -----------------------
+    1. teks query (dinormalisasi) -> token hasil preprocessing,
+       berlaku untuk satu versi pipeline
+    2. model ranking + multiset token query + top_n -> hasil ranking,
+       berlaku untuk satu versi index (snapshot.version)
+
+    Tingkat 2 memakai multiset (urutan token diabaikan, frekuensi tidak)
+    karena skor GVSM / BM25 / TF-IDF hanya bergantung pada TF query, sehingga "jaringan
+    keamanan" dan "keamanan jaringan" berbagi satu entri.
+
+    Versi pipeline / index ikut menjadi bagian kunci, jadi hasil lama
+    tidak pernah terpakai meskipun ada request yang masih memakai snapshot
+    lama. Saat muncul versi baru, hanya entri tingkat yang bersangkutan
+    yang dibuang agar tidak menghabiskan slot LRU: index baru (mis. setelah
+    upload) tidak membuang token query, karena tokenisasi tidak bergantung
+    pada index.
+    """
+
+    def __init__(self, pipeline, max_queries=4096, max_results=1024):
+        self.pipeline = pipeline
+        self.query_tokens = LRUCache(max_queries)
+        self.ranked_results = LRUCache(max_results)
+        # Tuple (tidak diubah di tempat, diganti utuh) agar bisa dibaca tanpa lock
+        self._pipeline_versions = ()
+        self._index_versions = ()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(query):
+        """Spasi berlebih dan huruf besar tidak mengubah hasil preprocessing"""
+        return " ".join(query.lower().split())
+
+    @staticmethod
+    def token_key(query_tokens):
+        """Kunci multiset token (terurut, dengan frekuensi)"""
+        return tuple(sorted(Counter(query_tokens).items()))
+
+    def _sync(self, attr, version, cache):
+        # Buang isi satu tingkat cache saat versi yang belum pernah terlihat muncul
+        if version in getattr(self, attr):
+            return
+        with self._lock:
+            versions = getattr(self, attr)
+            if version not in versions:
+                cache.clear()
+                setattr(self, attr, (versions + (version,))[-RECENT_VERSIONS:])
+
+    def tokens(self, query, pipeline_version=None):
+        """
+        Token query hasil pipeline.process_query, dari cache jika ada
+
+        Args:
+            query (str): Teks query
+            pipeline_version: Versi pipeline (None = pipeline.version)
+
+        Returns:
+            list: Token query (salinan, aman diubah pemanggil)
+        """
+        if pipeline_version is None:
+            pipeline_version = self.pipeline.version
+        self._sync('_pipeline_versions', pipeline_version, self.query_tokens)
+
+        text = self.normalize(query)
+        key = (pipeline_version, text)
+        cached = self.query_tokens.get(key)
+        if cached is None:
+            cached = tuple(self.pipeline.process_query(text))
+            self.query_tokens.put(key, cached)
+        return list(cached)
+
+    def lookup(self, index_version, query_tokens, top_n, model='gvsm'):
+        """Hasil ranking dari cache, atau None jika belum ada"""
+        self._sync('_index_versions', index_version, self.ranked_results)
+        return self.ranked_results.get((index_version, model, self.token_key(query_tokens), top_n))
+
+    def store(self, index_version, query_tokens, top_n, results, model='gvsm'):
+        self.ranked_results.put((index_version, model, self.token_key(query_tokens), top_n), results)
+
+    def results(self, index_version, query_tokens, top_n, compute, model='gvsm'):
+        """
+        Hasil ranking untuk query_tokens pada versi index tertentu
+
+        Args:
+            index_version: Versi index (snapshot.version)
+            query_tokens (list): Token query
+            top_n (int): Jumlah hasil (bagian dari kunci cache)
+            compute (callable): Menghitung hasil jika belum ada di cache
+            model (str): Model ranking yang menghasilkan hasil (bagian dari kunci cache)
+
+        Returns:
+            list: Hasil match (jangan diubah; objek yang sama dipakai ulang)
+        """
+        cached = self.lookup(index_version, query_tokens, top_n, model)
+        if cached is None:
+            cached = compute()
+            self.store(index_version, query_tokens, top_n, cached, model)
+        return cached
+
+    def clear(self):
+        self.query_tokens.clear()
+        self.ranked_results.clear()
+
+    def cache_info(self):
+        """
+        Returns:
+            dict: statistik 'query_tokens' dan 'ranked_results' (lihat LRUCache.cache_info)
+        """
+        return {
+            'query_tokens': self.query_tokens.cache_info(),
+            'ranked_results': self.ranked_results.cache_info(),
+        }
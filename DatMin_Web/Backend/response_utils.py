@@ -0,0 +1,147 @@
+import base64
+import gzip
+import hashlib
+import json
+import re
+
+# Brotli opsional, fallback ke gzip jika tidak terpasang
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+# Response lebih kecil dari ini tidak dikompresi (overhead > manfaat)
+MIN_COMPRESS_SIZE = 1024
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/plain', 'text/html'}
+
+
+class StaleCursorError(ValueError):
+    """Cursor dibuat dari versi index yang sudah tidak aktif"""
+
+
+# =============================
+# SNIPPET
+# =============================
+def make_snippet(text, terms, width=200):
+    """
+    Potongan pendek teks dokumen di sekitar kemunculan pertama salah satu term
+
+    Args:
+        text (str): Teks mentah dokumen
+        terms (list): Kata query (sebelum stemming)
+        width (int): Panjang snippet maksimal (karakter)
+
+    Returns:
+        str: Snippet; awal dokumen jika tidak ada term yang ditemukan
+    """
+    if not text:
+        return ""
+
+    start = 0
+    terms = [t for t in terms if t]
+    if terms:
+        pattern = "|".join(re.escape(t) for t in sorted(set(terms), key=len, reverse=True))
+        match = re.search(pattern, text, flags=re.IGNORECASE)
+        if match:
+            start = max(0, match.start() - width // 4)
+
+    snippet = " ".join(text[start:start + width].split())
+    if start > 0:
+        snippet = "..." + snippet
+    if start + width < len(text):
+        snippet += "..."
+    return snippet
+
+
+# =============================
+# CURSOR PAGINATION
+# =============================
+def _query_key(query):
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()[:16]
+
+
+def encode_cursor(offset, query, version):
+    """
+    Cursor opaque untuk halaman berikutnya
+
+    Cursor terikat ke query dan versi index, sehingga tidak bisa dipakai
+    untuk query lain atau setelah korpus berubah.
+    """
+    payload = {"o": offset, "q": _query_key(query), "v": str(version)[:16]}
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, query, version):
+    """
+    Baca offset dari cursor
+
+    Raises:
+        ValueError: Cursor rusak atau milik query lain
+        StaleCursorError: Index sudah berubah sejak cursor dibuat
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        offset = int(payload["o"])
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise ValueError("Invalid cursor")
+
+    if offset < 0 or payload.get("q") != _query_key(query):
+        raise ValueError("Invalid cursor")
+    if payload.get("v") != str(version)[:16]:
+        raise StaleCursorError("Cursor expired, index has changed")
+    return offset
+
+
+# =============================
+# KOMPRESI RESPONSE
+# =============================
+def choose_encoding(accept_encodings):
+    """
+    Pilih encoding dari header Accept-Encoding (werkzeug Accept)
+
+    Returns:
+        str: 'br', 'gzip', atau None
+    """
+    supported = ['br', 'gzip'] if BROTLI_AVAILABLE else ['gzip']
+    return accept_encodings.best_match(supported)
+
+
+def compress_response(response, accept_encodings):
+    """
+    Kompresi body response (gzip / brotli) sesuai Accept-Encoding
+
+    Args:
+        response (flask.Response): Response yang akan dikirim
+        accept_encodings (werkzeug.datastructures.Accept): request.accept_encodings
+
+    Returns:
+        flask.Response: Response yang sama (body dikompresi jika memenuhi syarat)
+    """
+    if (response.direct_passthrough
+            or not (200 <= response.status_code < 300)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return response
+
+    encoding = choose_encoding(accept_encodings)
+    if encoding == 'br':
+        compressed = brotli.compress(data, quality=5)
+    elif encoding == 'gzip':
+        compressed = gzip.compress(data, compresslevel=6)
+    else:
+        return response
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    response.headers['Content-Length'] = str(len(compressed))
+    return response
@@ -0,0 +1,226 @@
+import threading
+import weakref
+
+from GVSM.gvsm import GVSMModel
+
+
+# Cara menggunakan SearchIndex
+
+# ==========================================================
+# from search_index import IndexSnapshot, SearchIndex, SnapshotBuilder
+
+# index = SearchIndex(index_path='DatMin_Web/Backend/gvsm_index')
+#
+# def build():
+#     model = index.build_model(doc_tokens, version=corpus_version)
+#     return IndexSnapshot(corpus_version, source, model, texts, doc_tokens, file_names, doc_keys,
+#                          rankers={'bm25': BM25Model(doc_tokens)})
+#
+# builder = SnapshotBuilder(build, index.install)
+# builder.request()             # rebuild di thread latar belakang
+# builder.apply(update)         # update incremental: update() -> snapshot baru
+# snapshot = index.snapshot     # request tetap memakai snapshot lama sampai yang baru siap
+# ==========================================================
+
+class IndexSnapshot:
+    """
+    Satu versi index yang siap dipakai request
+    ------------------------------------------
+    Berisi semua yang dibutuhkan /search untuk satu versi korpus: model
+    GVSM, teks mentah, token, nama file dan kunci store per doc_id.
+    Tidak diubah setelah dibuat; perubahan korpus menghasilkan snapshot
+    baru yang menggantikan snapshot lama secara atomik. Model ranking lain
+    (mis. BM25, LSI) ikut dibangun sebelum snapshot dipasang, bukan saat
+    request pertama memakainya.
+    """
+
+    def __init__(self, version, source, model, texts, tokens, file_names, doc_keys,
+                 rankers=None):
+        # version : fingerprint isi korpus (untuk cursor, index di disk)
+        # source  : penanda status sumber saat dibangun (mis. versi watcher + pipeline);
+        #           None = belum mencerminkan sumber, perlu dibangun ulang
+        self.version = version
+        self.source = source
+        self.model = model
+        self.texts = texts
+        self.tokens = tokens
+        self.file_names = file_names
+        self.doc_keys = doc_keys
+        self.filename_index = {name: doc_id for doc_id, name in enumerate(file_names)}
+        # rankers : nama model -> model ranking tambahan dari token yang sama
+        self.rankers = rankers or {}
+
+    def __len__(self):
+        return len(self.file_names)
+
+
+class SearchIndex:
+    """
+    Penampung index GVSM untuk seluruh proses Flask
+    -----------------------------------------------
+    Snapshot aktif disimpan dalam satu atribut sehingga pembacaan dari
+    thread request selalu konsisten tanpa lock, dan penggantian snapshot
+    (install) bersifat atomik.
+
+    Jika index_path diberikan, model disimpan ke disk setelah dibangun
+    dan dimuat (memory-map) saat proses baru start dengan versi korpus
+    yang sama, sehingga tidak perlu membangun ulang.
+
+    Snapshot yang pernah dipasang dilacak lewat weakref sampai tidak ada
+    lagi yang memakainya (lihat live_doc_keys).
+    """
+
+    def __init__(self, model_factory=GVSMModel, index_path=None):
+        self.model_factory = model_factory
+        self.index_path = index_path
+        self._snapshot = None
+        self._live = weakref.WeakSet()
+        self._live_lock = threading.Lock()
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    @property
+    def version(self):
+        snapshot = self._snapshot
+        return snapshot.version if snapshot is not None else None
+
+    @property
+    def model(self):
+        snapshot = self._snapshot
+        return snapshot.model if snapshot is not None else None
+
+    def install(self, snapshot):
+        """Ganti snapshot aktif (request yang sedang berjalan tetap memakai snapshot lamanya)"""
+        if snapshot is not None:
+            with self._live_lock:
+                self._live.add(snapshot)
+        self._snapshot = snapshot
+
+    def live_doc_keys(self):
+        """
+        Kunci store dokumen yang masih bisa dibaca: milik snapshot aktif dan
+        snapshot lama yang masih dipegang request yang sedang berjalan.
+        Entri ini tidak boleh dihapus dari store (texts[doc_id] / detail
+        preprocessing snapshot itu akan gagal).
+
+        Returns:
+            set: Kunci (content_hash, pipeline_version)
+        """
+        with self._live_lock:
+            snapshots = list(self._live)
+        return {key for snapshot in snapshots for key in snapshot.doc_keys}
+
+    def invalidate(self):
+        """Buang snapshot aktif sehingga request berikutnya membangun ulang."""
+        self._snapshot = None
+
+    def build_model(self, doc_tokens, version):
+        """
+        Model untuk versi korpus tertentu
+
+        Model snapshot aktif dipakai ulang jika versinya sama (mis. hanya
+        mtime file yang berubah), lalu index di disk, baru membangun ulang.
+
+        Args:
+            doc_tokens (list): Token tiap dokumen (hasil preprocessing)
+            version: Penanda versi korpus (fingerprint isi dokumen)
+
+        Returns:
+            GVSMModel: Model yang dibangun dari doc_tokens versi tersebut
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot.model
+        return self._load_or_build(doc_tokens, version)
+
+    def _load_or_build(self, doc_tokens, version):
+        if self.index_path is None:
+            return self.model_factory(doc_tokens)
+
+        try:
+            return self.model_factory.load(self.index_path, documents=doc_tokens, version=version)
+        except (OSError, ValueError):
+            # Belum ada, format lama, atau dibangun dari korpus lain
+            pass
+
+        model = self.model_factory(doc_tokens)
+        try:
+            model.save(self.index_path, version=version)
+        except OSError as e:
+            print(f"Gagal menyimpan index ke {self.index_path}: {e}")
+        return model
+
+
+class SnapshotBuilder:
+    """
+    Membangun snapshot baru di thread latar belakang
+    ------------------------------------------------
+    request() tidak pernah memblokir: permintaan yang datang saat build
+    sedang berjalan digabung menjadi satu build berikutnya. build_now()
+    dipakai hanya saat belum ada snapshot sama sekali (cold start).
+    """
+
+    def __init__(self, build_fn, install_fn, is_current=None):
+        self.build_fn = build_fn
+        self.install_fn = install_fn
+        # Opsional: True jika snapshot aktif sudah mencerminkan sumber
+        # terbaru (mis. sudah diperbarui oleh apply()), build dilewati
+        self.is_current = is_current
+        self._requested = threading.Event()
+        self._build_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self.builds = 0
+        self.last_error = None
+
+    def request(self):
+        """Minta rebuild; langsung kembali"""
+        self._requested.set()
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="snapshot-builder", daemon=True
+                )
+                self._thread.start()
+
+    @property
+    def busy(self):
+        return self._requested.is_set() or self._build_lock.locked()
+
+    def build_now(self):
+        """Bangun dan pasang snapshot secara sinkron, lalu kembalikan snapshot itu"""
+        return self.apply(self.build_fn)
+
+    def apply(self, update_fn):
+        """
+        Jalankan update_fn() secara eksklusif terhadap build lain lalu pasang
+        snapshot yang dikembalikannya. Dipakai untuk update incremental
+        (mis. satu dokumen baru) tanpa membangun ulang seluruh index.
+        Jika update_fn melempar exception, snapshot aktif tidak berubah.
+        """
+        with self._build_lock:
+            return self._install(update_fn())
+
+    def _install(self, snapshot):
+        self.install_fn(snapshot)
+        self.builds += 1
+        return snapshot
+
+    def _build_if_stale(self):
+        with self._build_lock:
+            if self.is_current is not None and self.is_current():
+                return
+            self._install(self.build_fn())
+
+    def _run(self):
+        while self._requested.wait():
+            self._requested.clear()
+            try:
+                self._build_if_stale()
+                self.last_error = None
+            except Exception as e:
+                # Snapshot lama tetap dipakai; build dicoba lagi pada request berikutnya
+                self.last_error = e
+                print(f"Gagal membangun index baru: {e}")
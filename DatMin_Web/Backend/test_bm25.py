@@ -0,0 +1,93 @@
+"""
+Pengecekan BM25Model: pruning (MaxScore) vs scoring penuh
+=========================================================
+- top_k(prune=True) harus identik dengan prune=False (dokumen, urutan, skor)
+- skor prune=False sama dengan rumus BM25 / TF-IDF yang dihitung langsung
+
+Cara menjalankan (dari root repo):
+    python -m pytest -q DatMin_Web/Backend/test_bm25.py
+"""
+
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from bm25 import WEIGHTINGS, BM25Model
+
+
+def zipf_documents(n_docs, n_terms=300, max_length=40, seed=0):
+    # Term umum sangat sering muncul: postings panjang, banyak skor seri
+    rng = np.random.default_rng(seed)
+    return [
+        [f"t{min(i, n_terms) - 1}" for i in rng.zipf(1.3, rng.integers(1, max_length + 1))]
+        for _ in range(n_docs)
+    ]
+
+
+def query_set(seed=1):
+    rng = np.random.default_rng(seed)
+    queries = [["t0"], ["t0", "t1"], ["t299"], ["t2", "t2", "t50"], ["tidak-ada"], ["t0", "tidak-ada"]]
+    queries += [[f"t{i}" for i in rng.integers(0, 60, 3)] for _ in range(20)]
+    return queries
+
+
+def brute_force_scores(documents, query, weighting, k1=1.2, b=0.75):
+    """Skor setiap dokumen langsung dari definisi (tanpa postings)"""
+    n = len(documents)
+    df = Counter(term for doc in documents for term in set(doc))
+    avg = sum(len(doc) for doc in documents) / n
+    counts = Counter(term for term in query if term in df)
+
+    if weighting == "bm25":
+        idf = {t: math.log1p((n - df[t] + 0.5) / (df[t] + 0.5)) for t in df}
+        scores = []
+        for doc in documents:
+            tf = Counter(doc)
+            norm = k1 * (1 - b + b * len(doc) / avg)
+            scores.append(sum(
+                count * idf[t] * tf[t] * (k1 + 1) / (tf[t] + norm)
+                for t, count in counts.items() if t in tf
+            ))
+        return scores
+
+    idf = {t: math.log1p(n / df[t]) for t in df}
+    q = {t: (1 + math.log(c)) * idf[t] for t, c in counts.items()}
+    q_norm = math.sqrt(sum(w * w for w in q.values())) or 1.0
+    scores = []
+    for doc in documents:
+        d = {t: (1 + math.log(c)) * idf[t] for t, c in Counter(doc).items()}
+        d_norm = math.sqrt(sum(w * w for w in d.values()))
+        scores.append(sum(q[t] * d[t] for t in q if t in d) / (q_norm * d_norm))
+    return scores
+
+
+@pytest.mark.parametrize("weighting", WEIGHTINGS)
+@pytest.mark.parametrize("top_n", [1, 3, 10, 50])
+def test_pruned_top_k_equals_exhaustive(weighting, top_n):
+    model = BM25Model(zipf_documents(400), weighting=weighting)
+    for query in query_set():
+        pruned_ids, pruned_scores, _ = model.top_k(query, top_n)
+        ids, scores, _ = model.top_k(query, top_n, prune=False)
+        assert pruned_ids.tolist() == ids.tolist()
+        assert np.array_equal(pruned_scores, scores)
+
+
+@pytest.mark.parametrize("weighting", WEIGHTINGS)
+def test_pruning_reads_fewer_postings(weighting):
+    model = BM25Model(zipf_documents(2000), weighting=weighting)
+    _, _, pruned_read = model.top_k(["t0", "t1", "t2"], 5)
+    _, _, full_read = model.top_k(["t0", "t1", "t2"], 5, prune=False)
+    assert pruned_read < full_read
+
+
+@pytest.mark.parametrize("weighting", WEIGHTINGS)
+def test_exhaustive_scores_equal_definition(weighting):
+    documents = zipf_documents(200)
+    model = BM25Model(documents, weighting=weighting)
+    for query in query_set():
+        expected = brute_force_scores(documents, query, weighting)
+        ids, scores, _ = model.top_k(query, top_n=None)
+        assert sorted(ids.tolist()) == [i for i, s in enumerate(expected) if s > 0]
+        assert scores.tolist() == pytest.approx([expected[i] for i in ids], rel=1e-9)
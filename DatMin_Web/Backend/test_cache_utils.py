@@ -0,0 +1,118 @@
+"""
+Pengecekan DocumentStore
+========================
+- transaction(): error di dalam transaksi (termasuk bersarang) di-rollback
+- migrate_pickle(): cache pickle lama (list str / id int32) terbaca sama
+- prune_entries(): entri, steps dan term yang tidak dipakai lagi dihapus;
+  id term tidak dipakai ulang
+
+Cara menjalankan (dari root repo):
+    python -m pytest -q DatMin_Web/Backend/test_cache_utils.py
+"""
+
+import os
+import pickle
+
+import pytest
+
+from cache_utils import DocumentStore, encode_entry
+from token_corpus import Vocabulary
+
+VERSION = "test"
+
+
+def put_document(store, content_hash, tokens, name=None):
+    """Simpan satu dokumen seperti build_snapshot (term baru + entri + file)"""
+    cached_vocab = store.terms()
+    vocabulary = Vocabulary(cached_vocab)
+    entry = encode_entry(vocabulary, " ".join(tokens), tokens, {"filtered_tokens": tokens})
+    with store.transaction():
+        store.append_terms(vocabulary.terms, len(cached_vocab))
+        store.put_entry((content_hash, VERSION), entry)
+        if name is not None:
+            store.put_file(name, 0.0, content_hash)
+    return entry
+
+
+def decoded(store, content_hash):
+    return Vocabulary(store.terms()).decode(store.load_ids(VERSION)[content_hash])
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DocumentStore(str(tmp_path / "store.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_transaction_rolls_back_on_error(store):
+    put_document(store, "h1", ["data", "mining"], name="a.txt")
+
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            put_document(store, "h2", ["sistem", "baru"], name="b.txt")
+            with store.transaction():
+                store.delete_files(["a.txt"])
+            raise RuntimeError("gagal")
+
+    assert store.files() == {"a.txt": (0.0, "h1")}
+    assert set(store.load_ids(VERSION)) == {"h1"}
+    assert store.terms() == ["data", "mining"]
+
+
+def test_migrate_pickle(store, tmp_path):
+    vocabulary = Vocabulary()
+    encoded = encode_entry(vocabulary, "data mining", ["data", "mining"], {"tokens": ["data", "mining"]})
+    legacy = {
+        "files": {"a.txt": (1.0, "h1"), "b.txt": (2.0, "h2"), "c.pdf": (3.0, "h3")},
+        "vocab": vocabulary.terms,
+        "entries": {
+            ("h1", VERSION): encoded,
+            # Format lama: token sebagai list str
+            ("h2", VERSION): {"raw": "sistem data", "tokens": ["sistem", "data"],
+                              "steps": {"tokens": ["sistem", "data"]}},
+            ("h3", VERSION): None,
+        },
+    }
+    path = str(tmp_path / "preprocessing_cache.pkl")
+    with open(path, "wb") as f:
+        pickle.dump(legacy, f)
+
+    assert store.migrate_pickle(path) == 3
+    assert not os.path.exists(path) and os.path.exists(path + ".migrated")
+    assert store.files() == legacy["files"]
+    assert decoded(store, "h1") == ["data", "mining"]
+    assert decoded(store, "h2") == ["sistem", "data"]
+    assert store.entry_states(VERSION) == {"h1": True, "h2": True, "h3": False}
+    assert store.get_raw(("h2", VERSION)) == "sistem data"
+
+    # Sekali saja: store sudah berisi
+    with open(path, "wb") as f:
+        pickle.dump(legacy, f)
+    assert store.migrate_pickle(path) == 0
+
+
+def test_prune_removes_entries_and_unused_terms(store, tmp_path):
+    put_document(store, "h1", ["data", "mining", "klaster"])
+    put_document(store, "h2", ["data", "sistem"])
+    put_document(store, "h3", ["sistem", "informasi"])
+    assert store.prune_entries({("h1", VERSION), ("h2", VERSION), ("h3", VERSION)}) == 0
+
+    # "informasi" (id terakhir) hanya dipakai h3
+    assert store.prune_entries({("h1", VERSION), ("h2", VERSION)}) == 1
+    assert set(store.load_ids(VERSION)) == {"h1", "h2"}
+    assert store.get_steps(("h3", VERSION)) == {}
+    assert store.terms() == ["data", "mining", "klaster", "sistem", None]
+
+    # Id term yang dihapus tidak diberikan ke term baru, juga setelah dibuka ulang
+    store.close()
+    store = DocumentStore(str(tmp_path / "store.sqlite3"))
+    put_document(store, "h4", ["informasi", "data"])
+    assert store.terms() == ["data", "mining", "klaster", "sistem", None, "informasi"]
+    assert decoded(store, "h1") == ["data", "mining", "klaster"]
+    assert decoded(store, "h4") == ["informasi", "data"]
+
+    store.prune_entries({("h4", VERSION)})
+    assert store.terms() == ["data", None, None, None, None, "informasi"]
+    assert decoded(store, "h4") == ["informasi", "data"]
+    store.close()
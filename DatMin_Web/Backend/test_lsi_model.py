@@ -0,0 +1,118 @@
+"""
+Pengecekan LSIModel
+===================
+- add_documents (fold-in) mencatat token yang tidak dikenal vocab LSI,
+  sehingga app.py bisa menjadwalkan build ulang
+- fold_in dokumen korpus = vektor dokumennya
+- k penuh: ranking match sama dengan cosine TF-IDF langsung
+- save / load menghasilkan model yang sama, versi / k lain ditolak
+
+Cara menjalankan (dari root repo):
+    python -m pytest -q DatMin_Web/Backend/test_lsi_model.py
+"""
+
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from lsi_model import LSIModel
+
+DOCUMENTS = [
+    ["jaring", "komputer", "aman"],
+    ["jaring", "komputer", "server"],
+    ["sistem", "informasi", "basis", "data"],
+    ["basis", "data", "server"],
+    ["didik", "sekolah", "guru"],
+    ["guru", "murid", "sekolah"],
+]
+
+
+def test_add_documents_counts_unknown_terms():
+    model = LSIModel(DOCUMENTS, k=3)
+    updated = model.copy()
+
+    assert updated.add_documents([["jaring", "server"]]) == 0
+    assert updated.dropped_terms == 0
+    assert updated.add_documents([["kucing", "anggora", "jaring", "kucing"]]) == 3
+    assert updated.dropped_terms == 3
+    assert updated.doc_count == len(DOCUMENTS) + 2
+
+    # Term baru tidak bisa ditemukan sampai model dibangun ulang
+    assert updated.match(["kucing", "anggora"]) == []
+    rebuilt = LSIModel(DOCUMENTS + [["jaring", "server"], ["kucing", "anggora", "jaring", "kucing"]], k=3)
+    assert rebuilt.dropped_terms == 0
+    assert rebuilt.match(["kucing", "anggora"])[0]["doc_id"] == len(DOCUMENTS) + 1
+
+    # Model asal tidak ikut berubah
+    assert model.dropped_terms == 0
+    assert model.doc_vectors.shape[0] == len(DOCUMENTS)
+    assert np.isfinite(updated.doc_vectors).all()
+
+
+def tfidf_cosine_scores(documents, query):
+    """Cosine TF-IDF (1 + ln tf) * ln(1 + N / df) langsung, tanpa SVD"""
+    n = len(documents)
+    df = Counter(term for doc in documents for term in set(doc))
+    weight = lambda tokens: {t: (1 + math.log(c)) * math.log1p(n / df[t])
+                             for t, c in Counter(tokens).items() if t in df}
+    q = weight(query)
+    q_norm = math.sqrt(sum(w * w for w in q.values()))
+    scores = []
+    for doc in documents:
+        d = weight(doc)
+        d_norm = math.sqrt(sum(w * w for w in d.values()))
+        scores.append(sum(w * d.get(t, 0.0) for t, w in q.items()) / (q_norm * d_norm))
+    return scores
+
+
+def test_fold_in_of_document_equals_its_vector():
+    model = LSIModel(DOCUMENTS, k=3)
+    for doc_id, tokens in enumerate(DOCUMENTS):
+        vector = model.fold_in(tokens)
+        vector = vector / np.linalg.norm(vector)
+        assert np.allclose(vector, model.doc_vectors[doc_id], atol=1e-5)
+    assert model.fold_in(["tidak", "ada"]) is None
+
+
+@pytest.mark.parametrize("query", [["jaring"], ["basis", "server"], ["guru", "sekolah", "sekolah"]])
+def test_full_rank_match_ranks_like_tfidf_cosine(query):
+    # k >= rank: ruang laten memuat semua baris dokumen, sehingga cosine
+    # LSI = cosine TF-IDF dikali konstanta per query (urutan sama)
+    model = LSIModel(DOCUMENTS, k=len(DOCUMENTS))
+    expected = tfidf_cosine_scores(DOCUMENTS, query)
+    got = model.match(query, top_n=None)
+
+    scores = [r["score"] for r in got]
+    assert scores == sorted(scores, reverse=True)
+    assert {r["doc_id"] for r in got} == {i for i, s in enumerate(expected) if s > 1e-6}
+    ratios = [r["score"] / expected[r["doc_id"]] for r in got]
+    assert np.allclose(ratios, ratios[0], rtol=1e-4)
+    assert len(model.match(query, top_n=1)) == 1
+
+
+def test_save_load_round_trip(tmp_path):
+    model = LSIModel(DOCUMENTS, k=3)
+    path = str(tmp_path / "lsi_index")
+    model.save(path, version="v1")
+
+    loaded = LSIModel.load(path, version="v1", k=3)
+    assert (loaded.k, loaded.V, loaded.doc_count, loaded.vocab) == (model.k, model.V, model.doc_count, model.vocab)
+    assert loaded.dropped_terms == 0
+    for query in (["jaring", "server"], ["didik"], ["data"]):
+        assert loaded.match(query, top_n=None) == model.match(query, top_n=None)
+
+    # Model hasil load tetap bisa di-update (array memory-map read-only tidak diubah)
+    updated = loaded.copy()
+    updated.add_documents([["guru", "data"]])
+    assert updated.doc_count == len(DOCUMENTS) + 1
+
+    with pytest.raises(ValueError):
+        LSIModel.load(path, version="v2")
+    with pytest.raises(ValueError):
+        LSIModel.load(path, k=4)
+    with pytest.raises(ValueError):
+        LSIModel.load(path, documents=DOCUMENTS[:2])
+    with pytest.raises(OSError):
+        LSIModel.load(str(tmp_path / "tidak_ada"))
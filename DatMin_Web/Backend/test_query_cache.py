@@ -0,0 +1,91 @@
+"""
+Pengecekan QueryCache / LRUCache
+================================
+- versi index baru hanya membuang hasil ranking, bukan token query
+- versi pipeline baru membuang token query
+- lookup dari snapshot lama tidak membuang hasil versi baru
+- LRUCache membuang entri yang paling lama tidak dipakai
+
+Cara menjalankan (dari root repo):
+    python -m pytest -q DatMin_Web/Backend/test_query_cache.py
+"""
+
+from query_cache import LRUCache, QueryCache
+
+
+class CountingPipeline:
+    """Pipeline tiruan: menghitung berapa kali query benar-benar diproses"""
+
+    def __init__(self):
+        self.version = "p1"
+        self.calls = 0
+
+    def process_query(self, query):
+        self.calls += 1
+        return query.split()
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1          # "a" jadi yang terbaru
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+    info = cache.cache_info()
+    assert (info["hits"], info["misses"], info["size"]) == (3, 1, 2)
+
+    cache.put("a", 10)                  # update juga menjadikannya terbaru
+    cache.put("d", 4)
+    assert cache.get("c") is None and cache.get("a") == 10
+
+    disabled = LRUCache(max_size=0)
+    disabled.put("a", 1)
+    assert len(disabled) == 0
+
+
+def test_tokens_cached_per_pipeline_version():
+    pipeline = CountingPipeline()
+    cache = QueryCache(pipeline)
+    assert cache.tokens("Data  Mining") == ["data", "mining"]
+    assert cache.tokens("data mining ") == ["data", "mining"]
+    assert pipeline.calls == 1
+
+    # Index baru tidak mempengaruhi token query
+    cache.results("index-1", ["data"], 5, lambda: [{"doc_id": 0, "score": 1.0}])
+    cache.results("index-2", ["data"], 5, lambda: [])
+    cache.tokens("data mining")
+    assert pipeline.calls == 1
+
+    pipeline.version = "p2"
+    cache.tokens("data mining")
+    assert pipeline.calls == 2
+    assert len(cache.query_tokens) == 1
+
+
+def test_results_invalidated_by_index_version():
+    cache = QueryCache(CountingPipeline())
+    computed = []
+
+    def compute(value):
+        def run():
+            computed.append(value)
+            return [value]
+        return run
+
+    assert cache.results("v1", ["a", "b"], 5, compute("v1")) == ["v1"]
+    # Multiset token sama (urutan berbeda) -> entri yang sama
+    assert cache.results("v1", ["b", "a"], 5, compute("lagi")) == ["v1"]
+    assert cache.results("v1", ["a", "b"], 5, compute("model lain"), model="bm25") == ["model lain"]
+    assert cache.results("v1", ["a", "b"], 3, compute("top_n lain")) == ["top_n lain"]
+
+    assert cache.results("v2", ["a", "b"], 5, compute("v2")) == ["v2"]
+    assert cache.lookup("v2", ["a", "b"], 3) is None
+    assert len(cache.ranked_results) == 1
+
+    # Request yang masih memakai snapshot v1 tidak membuang hasil v2
+    assert cache.results("v1", ["a", "b"], 5, compute("v1 ulang")) == ["v1 ulang"]
+    assert cache.lookup("v2", ["a", "b"], 5) == ["v2"]
+    assert computed == ["v1", "model lain", "top_n lain", "v2", "v1 ulang"]
@@ -0,0 +1,74 @@
+"""
+Pengecekan pergantian snapshot (SearchIndex / SnapshotBuilder)
+==============================================================
+- snapshot dipasang lengkap dengan model ranking (dibangun sebelum swap)
+- request yang masih memegang snapshot lama tetap membaca snapshot itu,
+  dan kunci store-nya tetap dianggap hidup (tidak boleh di-prune)
+- update yang gagal tidak mengganti snapshot aktif
+
+Cara menjalankan (dari root repo):
+    python -m pytest -q DatMin_Web/Backend/test_search_index.py
+"""
+
+import gc
+
+import pytest
+
+from bm25 import BM25Model
+from search_index import IndexSnapshot, SearchIndex, SnapshotBuilder
+
+DOCUMENTS = [["data", "mining"], ["sistem", "temu", "kembali"], ["data", "sistem"]]
+
+
+def make_snapshot(index, tokens):
+    names = [f"doc{i}.txt" for i in range(len(tokens))]
+    keys = [(f"hash-{'-'.join(doc)}", "v1") for doc in tokens]
+    return IndexSnapshot(
+        version=str(len(tokens)), source=None,
+        model=index.build_model(tokens, str(len(tokens))),
+        texts=[" ".join(doc) for doc in tokens], tokens=tokens, file_names=names,
+        doc_keys=keys, rankers={"bm25": BM25Model(tokens)},
+    )
+
+
+def test_snapshot_is_installed_with_rankers():
+    index = SearchIndex()
+    builder = SnapshotBuilder(lambda: make_snapshot(index, DOCUMENTS), index.install)
+
+    snapshot = builder.build_now()
+    assert index.snapshot is snapshot
+    assert index.version == "3"
+    assert snapshot.rankers["bm25"].match(["sistem"]) == BM25Model(DOCUMENTS).match(["sistem"])
+
+
+def test_old_snapshot_stays_readable_and_live():
+    index = SearchIndex()
+    builder = SnapshotBuilder(lambda: make_snapshot(index, DOCUMENTS), index.install)
+    old = builder.build_now()
+    old_results = old.model.match(["data"])
+
+    new = builder.apply(lambda: make_snapshot(index, DOCUMENTS[1:]))
+    assert index.snapshot is new
+    # Request yang sedang berjalan masih memakai snapshot lamanya
+    assert old.model.match(["data"]) == old_results
+    assert old.texts[0] == "data mining"
+    assert index.live_doc_keys() == set(old.doc_keys) | set(new.doc_keys)
+
+    # Setelah tidak ada lagi yang memegang snapshot lama, kuncinya boleh di-prune
+    del old
+    gc.collect()
+    assert index.live_doc_keys() == set(new.doc_keys)
+
+
+def test_failed_update_keeps_active_snapshot():
+    index = SearchIndex()
+    builder = SnapshotBuilder(lambda: make_snapshot(index, DOCUMENTS), index.install)
+    snapshot = builder.build_now()
+
+    def failing_update():
+        raise ValueError("validasi gagal")
+
+    with pytest.raises(ValueError):
+        builder.apply(failing_update)
+    assert index.snapshot is snapshot
+    assert builder.builds == 1
@@ -0,0 +1,52 @@
+"""
+Checks for VectorSpaceModel.match against the dense cosine ranking
+==================================================================
+The inverted-index scoring must return exactly what scoring every
+document with vectorize() + cosine_similarity() returns: same order
+(descending score, ties in document order) and the same scores.
+
+How to run (from the repo root):
+    python -m pytest -q DatMin_Web/Backend/test_vector_space_model.py
+"""
+
+import numpy as np
+import pytest
+
+from token_corpus import TokenCorpus
+from vector_space_model import VectorSpaceModel
+
+
+def random_documents(n_docs, n_terms=30, max_length=10, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        [f"t{i}" for i in rng.integers(0, n_terms, rng.integers(1, max_length + 1))]
+        for _ in range(n_docs)
+    ]
+
+
+QUERIES = ["t0", "t1 t7", "T3 t3 t25", "t29 t12 t5 t5", "unknown", ""]
+
+
+def dense_ranking(vsm, query, top_n=None):
+    query_vec = vsm.vectorize(vsm.tokenize(query))
+    scores = [vsm.cosine_similarity(vsm.vectorize(doc), query_vec) for doc in vsm.indexed_docs]
+    ranked = sorted(enumerate(scores), key=lambda item: -item[1])
+    return ranked if top_n is None else ranked[:top_n]
+
+
+@pytest.mark.parametrize("top_n", [None, 1, 5, 100])
+def test_match_equals_dense_cosine(top_n):
+    vsm = VectorSpaceModel(random_documents(50))
+    for query in QUERIES:
+        got = vsm.match(query, top_n=top_n)
+        expected = dense_ranking(vsm, query, top_n)
+        assert [doc for doc, _ in got] == [doc for doc, _ in expected]
+        assert [score for _, score in got] == pytest.approx([score for _, score in expected], rel=1e-12)
+
+
+def test_token_corpus_equals_token_lists():
+    documents = random_documents(50)
+    from_lists = VectorSpaceModel(documents)
+    from_corpus = VectorSpaceModel(TokenCorpus.from_token_lists(documents))
+    for query in QUERIES:
+        assert from_corpus.match(query, top_n=10) == from_lists.match(query, top_n=10)
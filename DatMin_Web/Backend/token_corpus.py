@@ -0,0 +1,191 @@
+import numpy as np
+
+
+# Cara menggunakan TokenCorpus
+
+# ==========================================================
+# from token_corpus import TokenCorpus, Vocabulary
+
+# corpus = TokenCorpus.from_token_lists(doc_tokens)
+# corpus[0]              -> ['kata', 'dasar', ...]   (list str, di-decode saat diakses)
+# corpus.term_ids(0)     -> array int32 (view, tanpa salin)
+# model = GVSMModel(corpus)
+# ==========================================================
+
+
+class Vocabulary:
+    """
+    Tabel term ter-intern: term (str) <-> id (int32)
+    ------------------------------------------------
+    Setiap term unik hanya disimpan sekali. Id term tidak pernah berubah;
+    term baru selalu ditambahkan di akhir. Id yang sudah tidak dipakai
+    (term None, lihat DocumentStore.terms) tetap menempati slotnya.
+    """
+
+    def __init__(self, terms=None):
+        self.terms = list(terms) if terms is not None else []
+        self.index = {term: i for i, term in enumerate(self.terms) if term is not None}
+
+    def __len__(self):
+        return len(self.terms)
+
+    def intern(self, tokens):
+        """
+        Ubah list token menjadi array id, menambahkan term baru ke vocabulary
+
+        Args:
+            tokens (list): List token (str)
+
+        Returns:
+            numpy.ndarray: id term (int32), urutan sama dengan tokens
+        """
+        index = self.index
+        ids = np.empty(len(tokens), dtype=np.int32)
+        for i, token in enumerate(tokens):
+            tid = index.get(token)
+            if tid is None:
+                tid = len(self.terms)
+                index[token] = tid
+                self.terms.append(token)
+            ids[i] = tid
+        return ids
+
+    def decode(self, ids):
+        """Array id -> list token (str)"""
+        terms = self.terms
+        return [terms[i] for i in ids.tolist()]
+
+    def copy(self):
+        return Vocabulary(self.terms)
+
+
+class TokenCorpus:
+    """
+    Korpus token dalam layout mirip CSR
+    -----------------------------------
+    - vocabulary : Vocabulary bersama (term unik disimpan sekali)
+    - ids        : satu array int32 berisi id term semua dokumen, berurutan
+    - offsets    : array int64 (N + 1); token dokumen i adalah
+                   ids[offsets[i]:offsets[i + 1]]
+
+    Berperilaku seperti list token list (len, indexing, iterasi) sehingga
+    bisa menggantikan list of list str, tetapi hanya ~4 byte per token.
+    Objek tidak diubah setelah dibuat; operasi perubahan mengembalikan
+    TokenCorpus baru.
+    """
+
+    def __init__(self, vocabulary, ids, offsets):
+        ids = np.asarray(ids, dtype=np.int32)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(ids):
+            raise ValueError("offsets must start at 0 and end at len(ids)")
+        if np.any(np.diff(offsets) < 0):
+            raise ValueError("offsets must be non-decreasing")
+
+        self.vocabulary = vocabulary
+        self.ids = ids
+        self.offsets = offsets
+
+    @classmethod
+    def from_token_lists(cls, documents, vocabulary=None):
+        """
+        Bangun korpus dari list token list (hasil preprocessing)
+
+        Args:
+            documents (list): List token list
+            vocabulary (Vocabulary): Vocabulary yang dipakai (dan ditambah);
+                None = vocabulary baru
+        """
+        if vocabulary is None:
+            vocabulary = Vocabulary()
+        return cls.from_encoded(vocabulary, [vocabulary.intern(doc) for doc in documents])
+
+    @classmethod
+    def from_encoded(cls, vocabulary, id_arrays):
+        """Bangun korpus dari array id per dokumen (sudah di-intern ke vocabulary)"""
+        lengths = np.fromiter((len(a) for a in id_arrays), dtype=np.int64, count=len(id_arrays))
+        offsets = np.zeros(len(id_arrays) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        ids = np.concatenate(id_arrays).astype(np.int32, copy=False) if id_arrays \
+            else np.zeros(0, dtype=np.int32)
+        return cls(vocabulary, ids, offsets)
+
+    # =============================
+    # AKSES SEPERTI LIST
+    # =============================
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def term_ids(self, doc_id):
+        """Id term dokumen doc_id (view int32, tanpa salin)"""
+        if doc_id < 0:
+            doc_id += len(self)
+        if not 0 <= doc_id < len(self):
+            raise IndexError("document index out of range")
+        return self.ids[self.offsets[doc_id]:self.offsets[doc_id + 1]]
+
+    def __getitem__(self, doc_id):
+        return self.vocabulary.decode(self.term_ids(doc_id))
+
+    def __iter__(self):
+        for doc_id in range(len(self)):
+            yield self[doc_id]
+
+    def lengths(self):
+        """Jumlah token per dokumen"""
+        return np.diff(self.offsets)
+
+    @property
+    def nbytes(self):
+        """Ukuran array ids + offsets (tanpa vocabulary)"""
+        return self.ids.nbytes + self.offsets.nbytes
+
+    # =============================
+    # PERUBAHAN (MENGHASILKAN KORPUS BARU)
+    # =============================
+    def concat(self, documents):
+        """
+        Korpus baru = korpus ini + dokumen baru (list token list)
+
+        Vocabulary disalin sebelum ditambah agar korpus lama tidak ikut berubah.
+        """
+        vocabulary = self.vocabulary.copy()
+        new_ids = [vocabulary.intern(doc) for doc in documents]
+        tail = TokenCorpus.from_encoded(vocabulary, new_ids)
+        return TokenCorpus(
+            vocabulary,
+            np.concatenate([self.ids, tail.ids]),
+            np.concatenate([self.offsets, tail.offsets[1:] + self.offsets[-1]]),
+        )
+
+    def extend(self, vocabulary, id_arrays):
+        """
+        Korpus baru = korpus ini + dokumen yang sudah di-encode
+
+        Args:
+            vocabulary (Vocabulary): Vocabulary dokumen baru; harus perluasan
+                vocabulary korpus ini (id term lama sama)
+            id_arrays (list): Array id per dokumen baru
+        """
+        if len(vocabulary) < len(self.vocabulary):
+            raise ValueError("vocabulary must extend the corpus vocabulary")
+        tail = TokenCorpus.from_encoded(vocabulary, id_arrays)
+        return TokenCorpus(
+            vocabulary,
+            np.concatenate([self.ids, tail.ids]),
+            np.concatenate([self.offsets, tail.offsets[1:] + self.offsets[-1]]),
+        )
+
+    def select(self, doc_ids):
+        """Korpus baru berisi dokumen doc_ids saja (urutan mengikuti doc_ids)"""
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        return TokenCorpus.from_encoded(self.vocabulary, [self.term_ids(i) for i in doc_ids])
+
+    def clear(self, doc_ids):
+        """Korpus baru dengan dokumen doc_ids dikosongkan (jumlah dokumen tetap)"""
+        keep = np.ones(len(self), dtype=bool)
+        keep[np.asarray(doc_ids, dtype=np.int64)] = False
+        return TokenCorpus.from_encoded(
+            self.vocabulary,
+            [self.term_ids(i) if keep[i] else self.ids[:0] for i in range(len(self))],
+        )
@@ -1,4 +1,8 @@
 import math
+from collections import Counter
+
+import numpy as np
+from scipy.sparse import csr_matrix
 
 class VectorSpaceModel:
     def __init__(self, documents):
@@ -15,14 +19,72 @@ class VectorSpaceModel:
         "Retrieval and matching are core operations in IR systems"
         ]
         Each elements on the array is a String of text 
+
+        documents can also be a TokenCorpus (token_corpus.py); vectors are
+        then built straight from its int32 term ids.
+
+        Documents are stored as a sparse term-frequency matrix:
+        doc_vectors (CSR, N x V) and its inverted index postings (CSC,
+        postings.indices[indptr[t]:indptr[t+1]] are the documents that
+        contain term t), plus the precomputed document norms.
         """
         self.documents = documents
-        self.indexed_docs = self._prepare_docs(documents)
+        if hasattr(documents, "vocabulary") and hasattr(documents, "offsets"):
+            self._build_from_corpus(documents)
+        else:
+            self.indexed_docs = self._prepare_docs(documents)
+
+            self.vocab = sorted(set(term for doc in self.indexed_docs for term in doc))
+            self.term_index = {term: i for i, term in enumerate(self.vocab)}
 
-        self.vocab = sorted(set(term for doc in self.indexed_docs for term in doc))
+            self.doc_vectors = self._build_tf_matrix(self.indexed_docs)
+
+        self.postings = self.doc_vectors.tocsc()
+        # Integer sums of squared counts, so the norms are bit-identical to
+        # math.sqrt(sum(x * x for x in vec)) on the dense vectors
+        squares = self.doc_vectors.multiply(self.doc_vectors).sum(axis=1)
+        self.doc_norms = np.sqrt(np.asarray(squares, dtype=np.float64).ravel())
+
+    def _build_tf_matrix(self, docs):
+        """
+        Sparse TF matrix (len(docs) x V) from token lists.
+        """
+        rows, cols, data = [], [], []
+        for doc_idx, doc in enumerate(docs):
+            for term, count in Counter(doc).items():
+                rows.append(doc_idx)
+                cols.append(self.term_index[term])
+                data.append(count)
+        return csr_matrix(
+            (np.asarray(data, dtype=np.int64), (rows, cols)),
+            shape=(len(docs), len(self.vocab)),
+        )
+
+    def _build_from_corpus(self, corpus):
+        """
+        Build vocab, term_index and doc_vectors from a TokenCorpus without
+        creating a string per token. Same result as the token-list path.
+        """
+        # Ids no longer used by the store are None (see Vocabulary)
+        lowered = [term.lower() if term is not None else None for term in corpus.vocabulary.terms]
+        used = np.unique(corpus.ids)
+        self.vocab = sorted(set(lowered[i] for i in used.tolist()))
         self.term_index = {term: i for i, term in enumerate(self.vocab)}
-        
-        self.doc_vectors = [self.vectorize(doc) for doc in self.indexed_docs]
+
+        # corpus term id -> VSM vocab column
+        column = np.zeros(len(lowered), dtype=np.int64)
+        for i in used.tolist():
+            column[i] = self.term_index[lowered[i]]
+
+        self.indexed_docs = corpus
+        # Duplicate (doc, column) pairs are summed into term frequencies
+        ids = corpus.ids[corpus.offsets[0]:corpus.offsets[-1]]
+        rows = np.repeat(np.arange(len(corpus), dtype=np.int64), corpus.lengths())
+        self.doc_vectors = csr_matrix(
+            (np.ones(len(ids), dtype=np.int64), (rows, column[ids])),
+            shape=(len(corpus), len(self.vocab)),
+        )
+        self.doc_vectors.sum_duplicates()
 
     def _prepare_docs(self, docs):
         """
@@ -66,16 +128,49 @@ class VectorSpaceModel:
             return 0.0
         return dot / (norm1 * norm2)
 
-    def match(self, query):
-        # Tokenize & vectorize the query
-        query_tokens = self.tokenize(query)
-        query_vec = self.vectorize(query_tokens)
-        
-        # Compute similarity with each document
-        scores = [
-            (i, self.cosine_similarity(query_vec, self.doc_vectors[i]))
-            for i in range(len(self.doc_vectors))
-        ]
-        # Sort by descending similarity
-        ranked = sorted(scores, key=lambda x: x[1], reverse=True)
+    def match(self, query, top_n=None):
+        """
+        Rank documents by cosine similarity with the query.
+
+        Term-at-a-time over the inverted index: only the postings of the
+        query terms are read, so the scoring cost depends on their lengths,
+        not on N x V. The ranking is identical to the dense cosine over
+        every document: descending score, ties (including all zero scores)
+        in document order.
+
+        :param query: Query text
+        :param top_n: Number of results; None = every document (documents
+            that share no term with the query are appended with score 0.0)
+        :return: list of (doc_index, score)
+        """
+        # Query term frequencies (terms outside the vocab are ignored)
+        query_tf = Counter(
+            self.term_index[term] for term in self.tokenize(query) if term in self.term_index
+        )
+        n_docs = self.doc_vectors.shape[0]
+        limit = n_docs if top_n is None else min(top_n, n_docs)
+
+        if not query_tf:
+            return [(i, 0.0) for i in range(limit)]
+
+        # Accumulate exact integer dot products per document
+        indptr, indices, data = self.postings.indptr, self.postings.indices, self.postings.data
+        dots = np.zeros(n_docs, dtype=np.int64)
+        for term_id, q_count in query_tf.items():
+            start, end = indptr[term_id], indptr[term_id + 1]
+            dots[indices[start:end]] += q_count * data[start:end]
+
+        matched = np.flatnonzero(dots)
+        query_norm = math.sqrt(sum(count * count for count in query_tf.values()))
+        scores = dots[matched] / (query_norm * self.doc_norms[matched])
+
+        # Sort by descending similarity; stable, so ties keep document order
+        order = np.argsort(-scores, kind="stable")[:limit]
+        ranked = list(zip(matched[order].tolist(), scores[order].tolist()))
+
+        if len(ranked) < limit:
+            # Remaining documents score 0.0, in document order
+            unmatched = np.ones(n_docs, dtype=bool)
+            unmatched[matched] = False
+            ranked.extend((i, 0.0) for i in np.flatnonzero(unmatched)[:limit - len(ranked)].tolist())
         return ranked